@@ -51,6 +51,11 @@ WRAPPERS = {'tkinter', 'gtk3', 'dummy'}
 
 _wrapper = None
 
+# This is called with the name passed to _get_wrapper() and the object
+# it found, and whatever this returns is used instead of the object.
+# See bananagui.debug.
+_wrapper_hook = None
+
 
 def _load_wrapper(name):
     # Make sure the wrapper can be imported and THEN set _wrapper to it.
@@ -60,7 +65,7 @@ def _load_wrapper(name):
     _wrapper = fullname
 
 
-def load_wrapper(*args, init_mainloop=True):
+def load_wrapper(*args, init_mainloop=True, count_calls=False):
     """Initialize BananaGUI.
 
     This function must be called before using many things in BananaGUI.
@@ -76,11 +81,18 @@ def load_wrapper(*args, init_mainloop=True):
 
     For convenience, :func:`bananagui.mainloop.init` will be called if
     *init_mainloop* is True.
+
+    If *count_calls* is True, :func:`bananagui.debug.start_counting` is
+    called before loading anything, so every call to the wrapper is
+    counted from the beginning.
     """
     if not args:
         raise TypeError("no wrappers were specified")
     if _wrapper is not None:
         raise RuntimeError("don't call load_wrapper() twice")
+    if count_calls:
+        from bananagui import debug
+        debug.start_counting()
 
     if len(args) == 1:
         if args[0] not in WRAPPERS:
@@ -119,14 +131,18 @@ def _get_wrapper(name):
     modulename, attribute = name.split(':')
     try:
         wrappermodule = importlib.import_module(_wrapper + '.' + modulename)
-        return getattr(wrappermodule, attribute)
+        result = getattr(wrappermodule, attribute)
     except (ImportError, AttributeError):
         # Use a default, if any.
         try:
             defaultmodule = importlib.import_module(
                 'bananagui.wrappers.defaults.' + modulename)
-            return getattr(defaultmodule, attribute)
+            result = getattr(defaultmodule, attribute)
         except (ImportError, AttributeError) as e:
             # We don't have a default :(
             raise NotImplementedError(
                 "cannot find a wrapper for %s" % name) from e
+
+    if _wrapper_hook is not None:
+        result = _wrapper_hook(name, result)
+    return result
@@ -0,0 +1,792 @@
+"""Benchmarks for BananaGUI's hot paths.
+
+Run the benchmarks like this:
+
+.. code-block:: none
+
+   $ yourpython -m bananagui.bench --output results.json
+
+Later you can compare to the saved results to see if something got
+slower:
+
+.. code-block:: none
+
+   $ yourpython -m bananagui.bench --compare results.json
+
+By default, the benchmarks use the dummy wrapper, so they measure the
+time spent in BananaGUI itself, not in the GUI toolkit. Each benchmark
+has a setup part that is not measured and a part that is measured. The
+measured part is ran several times and the fastest time is reported,
+and then it's ran once more with :mod:`tracemalloc` to find out how much
+memory it needs at most. The wrapper calls are also counted in that
+run, and so are the calls into Tcl with the tkinter wrapper. The tkinter
+wrapper buffers Tcl commands and runs many of them with one call, and
+the number of calls saved that way is also reported.
+
+The dummy wrapper hides the real cost of the GUI toolkit, so the same
+benchmarks can be ran with other wrappers. They need an X server, but
+``--xvfb`` starts a virtual X server with Xvfb so it works without a
+screen. If multiple wrappers are given, each wrapper is benchmarked in
+a separate process and the results are shown next to each other:
+
+.. code-block:: none
+
+   $ yourpython -m bananagui.bench --xvfb -w tkinter -w gtk3 'gui_*'
+
+Some benchmarks are ran with different sizes, like 10 children in a
+:class:`bananagui.widgets.Box` and then 100 children and so on. If a
+size takes longer than the time budget, bigger sizes are skipped
+because they would probably take forever.
+"""
+
+import argparse
+import collections
+import contextlib
+import fnmatch
+import importlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import bananagui
+from bananagui import (debug, iniloader, load_wrapper, snapshot, widgets,
+                       widgettree)
+
+__all__ = ['run', 'compare', 'main']
+
+_SCALING_SIZES = (10, 100, 1000, 10000, 100000)
+
+# {name: (setupfunc, sizes), ...}
+# setupfunc is called with the size as an argument, and it should
+# return a function that will be timed.
+_benchmarks = collections.OrderedDict()
+
+
+def _benchmark(name, sizes=(None,)):
+    def inner(setupfunc):
+        _benchmarks[name] = (setupfunc, sizes)
+        return setupfunc
+
+    return inner
+
+
+# Windows need to be closed after running the benchmarks because the
+# GUI toolkits don't forget them otherwise.
+_windows = []
+
+
+def _create_window(*args, **kwargs):
+    window = widgets.Window(*args, **kwargs)
+    _windows.append(window)
+    return window
+
+
+def _close_windows():
+    while _windows:
+        _windows.pop().close()
+    _process_events()
+
+
+def _process_events():
+    """Let the GUI toolkit do the things it was told to do.
+
+    With real GUI toolkits, many things happen when the mainloop runs.
+    The benchmarks don't run the mainloop, so they call this instead.
+    """
+    wrappername = bananagui._wrapper.rsplit('.', 1)[1]
+    if wrappername == 'tkinter':
+        mainloop = _tkinter_mainloop()
+        mainloop.root.update()
+    elif wrappername in {'gtk2', 'gtk3'}:
+        from gi.repository import Gtk
+        while Gtk.events_pending():
+            Gtk.main_iteration()
+
+
+def _tkinter_mainloop():
+    return importlib.import_module('bananagui.wrappers.tkinter.mainloop')
+
+
+def _flush():
+    """Send buffered changes to the GUI toolkit.
+
+    The tkinter wrapper buffers Tcl commands until the mainloop is idle,
+    and the measured part must include running them.
+    """
+    if bananagui._wrapper == 'bananagui.wrappers.tkinter':
+        # This doesn't use _get_wrapper() because then the call would
+        # be counted as a wrapper call.
+        _tkinter_mainloop().flush()
+
+
+# Each of these is called with no arguments, so they are lambdas.
+_constructors = collections.OrderedDict([
+    ('Label', lambda: widgets.Label("Hello")),
+    ('ImageLabel', lambda: widgets.ImageLabel()),
+    ('Button', lambda: widgets.Button("Click me")),
+    ('ImageButton', lambda: widgets.ImageButton()),
+    ('Checkbox', lambda: widgets.Checkbox("Check me")),
+    ('Dummy', lambda: widgets.Dummy()),
+    ('Separator', lambda: widgets.Separator()),
+    ('Box', lambda: widgets.Box()),
+    ('Scroller', lambda: widgets.Scroller()),
+    ('Group', lambda: widgets.Group("Group")),
+    ('Progressbar', lambda: widgets.Progressbar(progress=0.5)),
+    ('BouncingProgressbar', lambda: widgets.BouncingProgressbar()),
+    ('Slider', lambda: widgets.Slider(range(10), value=5)),
+    ('Spinbox', lambda: widgets.Spinbox(range(10), value=5)),
+    ('Entry', lambda: widgets.Entry("Enter something")),
+    ('TextEdit', lambda: widgets.TextEdit("Hello\nWorld")),
+    ('Window', lambda: _create_window("Hello")),
+])
+
+
+def _add_constructor_benchmark(name, constructor):
+    def setup(size):
+        def run():
+            for i in range(1000):
+                constructor()
+        return run
+
+    _benchmark('construct_1000:' + name)(setup)
+
+
+for _name, _constructor in _constructors.items():
+    _add_constructor_benchmark(_name, _constructor)
+del _name, _constructor
+
+
+@_benchmark('property_set_10000')
+def _property_set(size):
+    label = widgets.Label()
+    texts = ['hello', 'world'] * 5000
+
+    def run():
+        for text in texts:
+            label.text = text
+    return run
+
+
+def _do_nothing(*args):
+    pass
+
+
+@_benchmark('callback_connect_1000')
+def _callback_connect(size):
+    button = widgets.Button()
+
+    def run():
+        for i in range(1000):
+            button.on_click.connect(_do_nothing)
+    return run
+
+
+@_benchmark('callback_run_1000', sizes=(1, 10, 100))
+def _callback_run(size):
+    button = widgets.Button()
+    for i in range(size):
+        button.on_click.connect(_do_nothing, i)
+
+    def run():
+        for i in range(1000):
+            button.on_click.run()
+    return run
+
+
+def _create_box(size):
+    box = widgets.Box()
+    box[:] = [widgets.Label() for i in range(size)]
+    return box
+
+
+@_benchmark('box_append_10', sizes=_SCALING_SIZES)
+def _box_append(size):
+    box = _create_box(size)
+    labels = [widgets.Label() for i in range(10)]
+
+    def run():
+        for label in labels:
+            box.append(label)
+    return run
+
+
+@_benchmark('box_insert_10', sizes=_SCALING_SIZES)
+def _box_insert(size):
+    box = _create_box(size)
+    labels = [widgets.Label() for i in range(10)]
+
+    def run():
+        for label in labels:
+            box.insert(size // 2, label)
+    return run
+
+
+@_benchmark('box_delete_10', sizes=_SCALING_SIZES)
+def _box_delete(size):
+    box = _create_box(size)
+
+    def run():
+        for i in range(10):
+            del box[len(box) // 2]
+    return run
+
+
+@_benchmark('box_slice_10', sizes=_SCALING_SIZES)
+def _box_slice(size):
+    box = _create_box(size)
+
+    def run():
+        for i in range(10):
+            box[size // 4:size // 2]
+    return run
+
+
+def _generate_ini(size):
+    lines = ["from bananagui import widgets", "",
+             "[window]", "class = widgets.Window", "",
+             "[box in window]", "class = widgets.Box", ""]
+    for i in range(size):
+        lines.extend(["[label%d in box]" % i, "class = widgets.Label",
+                      "text = 'Label %d'" % i, ""])
+    return '\n'.join(lines)
+
+
+@_benchmark('iniloader_loads', sizes=(10, 100, 1000, 10000))
+def _iniloader_loads(size):
+    source = _generate_ini(size)
+
+    def run():
+        iniloader.loads(source)
+    return run
+
+
+@_benchmark('snapshot_load', sizes=(10, 100, 1000, 10000))
+def _snapshot_load(size):
+    window = iniloader.loads(_generate_ini(size))['window']
+    data = snapshot.dump(window)
+    window.close()
+
+    def run():
+        snapshot.load(data)
+    return run
+
+
+@_benchmark('widgettree_dumps', sizes=(10, 100, 500))
+def _widgettree_dumps(size):
+    # The tree is deep, not wide. The widgettree module is recursive,
+    # so it doesn't support infinitely deep trees.
+    window = _create_window()
+    parent = widgets.Box()
+    window.add(parent)
+    for i in range(size):
+        box = widgets.Box()
+        parent.extend([widgets.Label("Label %d" % i), box])
+        parent = box
+
+    def run():
+        widgettree.dumps(window)
+    return run
+
+
+# These benchmarks do things that are expensive with real GUI toolkits.
+# Their names start with gui_ so they are easy to run with a pattern.
+
+# This is guitests/testgui.ini, but the label and the button are
+# repeated many times.
+_TESTGUI_HEADER = """\
+from bananagui import widgets
+
+[window]
+class = widgets.Window
+title = "Hello World"
+
+[box in window]
+class = widgets.Box
+"""
+_TESTGUI_REPEATED = """
+[label%(number)d in box]
+class = widgets.Label
+text = "Hello World!"
+
+[button%(number)d in box]
+class = widgets.Button
+text = "Click me!"
+tooltip = "Yes, click me."
+"""
+
+
+@_benchmark('gui_testgui_ini', sizes=(1, 100))
+def _gui_testgui_ini(size):
+    source = _TESTGUI_HEADER + ''.join(
+        _TESTGUI_REPEATED % {'number': number} for number in range(size))
+
+    def run():
+        _windows.append(iniloader.loads(source)['window'])
+        _process_events()
+    return run
+
+
+def _create_labels(size):
+    window = _create_window()
+    box = widgets.Box()
+    window.add(box)
+    labels = [widgets.Label("Label %d" % i) for i in range(size)]
+    box.extend(labels)
+    _process_events()
+    return labels
+
+
+@_benchmark('gui_label_text_updates', sizes=(100, 1000))
+def _gui_label_text_updates(size):
+    labels = _create_labels(size)
+
+    def run():
+        for i in range(10):
+            for label in labels:
+                label.text = "Update %d" % i
+            _process_events()
+    return run
+
+
+@_benchmark('gui_grayed_out_updates', sizes=(100, 1000))
+def _gui_grayed_out_updates(size):
+    labels = _create_labels(size)
+
+    def run():
+        for grayed_out in [True, False] * 5:
+            for label in labels:
+                label.grayed_out = grayed_out
+            _process_events()
+    return run
+
+
+@_benchmark('gui_resize_storm', sizes=(0, 100))
+def _gui_resize_storm(size):
+    _create_labels(size)
+    window = _windows[-1]
+
+    def run():
+        for i in range(100):
+            window.size = (300 + i % 20, 200 + i % 30)
+            _process_events()
+    return run
+
+
+@_benchmark('gui_text_insertion', sizes=(100, 1000))
+def _gui_text_insertion(size):
+    window = _create_window()
+    textedit = widgets.TextEdit()
+    window.add(textedit)
+    _process_events()
+
+    def run():
+        for i in range(size):
+            textedit.text += "This is line %d.\n" % i
+        _process_events()
+    return run
+
+
+@_benchmark('gui_entry_insertion', sizes=(100, 1000))
+def _gui_entry_insertion(size):
+    window = _create_window()
+    entry = widgets.Entry()
+    window.add(entry)
+    _process_events()
+
+    def run():
+        for i in range(size):
+            entry.text += "x"
+        _process_events()
+    return run
+
+
+def _names(patterns):
+    for name, (setupfunc, sizes) in _benchmarks.items():
+        if any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns):
+            yield name
+
+
+@contextlib.contextmanager
+def _saved_call_stats():
+    """Restore the caller's bananagui.debug counting state afterwards.
+
+    The benchmarks count wrapper calls themselves, so without this,
+    running them would throw away the counts of a program that uses
+    bananagui.debug.
+    """
+    was_counting = debug._counting
+    old_stats = debug.call_stats()
+    debug.stop_counting()
+    try:
+        yield
+    finally:
+        debug.reset_call_stats()
+        for key, stats in old_stats.items():
+            debug._stats[key] = list(stats)
+        if was_counting:
+            debug.start_counting()
+
+
+def _time(setupfunc, size, repeat):
+    times = []
+    for i in range(repeat):
+        func = setupfunc(size)
+        start = time.perf_counter()
+        try:
+            func()
+            _flush()
+            times.append(time.perf_counter() - start)
+        finally:
+            _close_windows()
+    return min(times)
+
+
+class _CountingTkapp:
+    """Count calls into Tcl.
+
+    Tkinter widgets copy the tkapp object from their master widget when
+    they are created, so this can be set to the tk attribute of the
+    root window to count calls made by widgets created after that.
+    """
+
+    def __init__(self, tkapp):
+        self._tkapp = tkapp
+        self.count = 0
+
+    def call(self, *args):
+        self.count += 1
+        return self._tkapp.call(*args)
+
+    def eval(self, script):
+        self.count += 1
+        return self._tkapp.eval(script)
+
+    def __getattr__(self, name):
+        return getattr(self._tkapp, name)
+
+
+@contextlib.contextmanager
+def _count_tcl_calls():
+    if bananagui._wrapper != 'bananagui.wrappers.tkinter':
+        yield None
+        return
+    mainloop = _tkinter_mainloop()
+    counter = _CountingTkapp(mainloop.root.tk)
+    mainloop.root.tk = counter
+    try:
+        yield counter
+    finally:
+        mainloop.root.tk = counter._tkapp
+
+
+def _measure(setupfunc, size):
+    """Run the benchmark once and return a dictionary of information."""
+    debug.reset_call_stats()
+    debug.start_counting()
+    try:
+        with _count_tcl_calls() as tcl_counter:
+            func = setupfunc(size)
+            debug.reset_call_stats()
+            if tcl_counter is None:
+                tcl_start = buffer_start = None
+            else:
+                tcl_start = tcl_counter.count
+                buffer_start = _tkinter_mainloop().buffer_stats[:]
+            tracemalloc.start()
+            try:
+                func()
+                _flush()
+                current, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            stats = debug.call_stats()
+            if tcl_counter is None:
+                tcl_calls = tcl_saved = None
+            else:
+                tcl_calls = tcl_counter.count - tcl_start
+                commands, flushes = _tkinter_mainloop().buffer_stats
+                tcl_saved = ((commands - buffer_start[0]) -
+                             (flushes - buffer_start[1]))
+            _close_windows()
+    finally:
+        debug.stop_counting()
+        debug.reset_call_stats()
+    return {'peak_memory': peak, 'tcl_calls': tcl_calls,
+            'tcl_calls_saved': tcl_saved,
+            'wrapper_calls': sum(stat.calls for stat in stats.values()),
+            'rss': _rss()}
+
+
+def _rss():
+    """Return the current resident set size in bytes, or None."""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            pages = int(f.read().split()[1])
+    except OSError:
+        # Not Linux.
+        return None
+    return pages * os.sysconf('SC_PAGE_SIZE')
+
+
+def run(patterns=('*',), *, repeat=3, budget=10, file=None):
+    """Run benchmarks and return a dictionary of results.
+
+    Only the benchmarks whose names match at least one of the
+    :mod:`fnmatch` *patterns* are ran. Bigger sizes of benchmarks are
+    skipped if a smaller size takes more than *budget* seconds. Progress
+    is printed to *file*, or nothing is printed if *file* is None.
+
+    The wrapper must be loaded before calling this. Calls counted with
+    :mod:`bananagui.debug` before calling this are not lost, and
+    counting continues afterwards if it was on. Each result is a
+    dictionary with these keys:
+
+    ``'seconds'``
+        The fastest time of the measured part.
+    ``'peak_memory'``
+        Peak memory allocated by Python in the measured part, in bytes.
+    ``'wrapper_calls'``
+        Number of calls to BananaGUI's wrapper.
+    ``'tcl_calls'``
+        Number of calls into Tcl, or None if the wrapper is not tkinter.
+    ``'tcl_calls_saved'``
+        Number of Tcl commands that ran together with other commands
+        instead of needing a call into Tcl of their own, or None if the
+        wrapper is not tkinter.
+    ``'rss'``
+        Resident set size of the process after the benchmark in bytes,
+        or None if it's not known.
+    """
+    with _saved_call_stats():
+        return _run(patterns, repeat, budget, file)
+
+
+def _run(patterns, repeat, budget, file):
+    results = collections.OrderedDict()
+    for name in _names(patterns):
+        setupfunc, sizes = _benchmarks[name]
+        for size in sizes:
+            fullname = name if size is None else '%s[%d]' % (name, size)
+            start = time.perf_counter()
+            result = {'seconds': _time(setupfunc, size, repeat)}
+            result.update(_measure(setupfunc, size))
+            results[fullname] = result
+            if file is not None:
+                print("%-40s %12.6f s %12d bytes %8d calls" % (
+                    fullname, result['seconds'], result['peak_memory'],
+                    result['wrapper_calls']), file=file)
+            if time.perf_counter() - start > budget:
+                if file is not None and size != sizes[-1]:
+                    print("%-40s skipping bigger sizes" % name, file=file)
+                break
+    return results
+
+
+def compare(results, baseline, *, tolerance=0.2, file=None):
+    """Compare benchmark results to older results.
+
+    Both arguments should be dictionaries returned by :func:`run`. The
+    return value is a list of names of benchmarks that are more than
+    *tolerance* times slower than in *baseline*, e.g. ``0.2`` means 20%
+    slower. The comparison is printed to *file* if it's not None.
+    """
+    slower = []
+    for name, result in results.items():
+        try:
+            old = baseline[name]
+        except KeyError:
+            continue
+        if old['seconds'] == 0:
+            continue
+        ratio = result['seconds'] / old['seconds']
+        if ratio > 1 + tolerance:
+            slower.append(name)
+            comment = "SLOWER"
+        elif ratio < 1 - tolerance:
+            comment = "faster"
+        else:
+            comment = ""
+        if file is not None:
+            print("%-40s %8.2fx time %8.2fx memory  %s" % (
+                name, ratio,
+                result['peak_memory'] / max(old['peak_memory'], 1),
+                comment), file=file)
+    return slower
+
+
+@contextlib.contextmanager
+def _xvfb():    # pragma: no cover
+    """Run a virtual X server and set DISPLAY to it temporarily."""
+    readfd, writefd = os.pipe()
+    try:
+        # Xvfb writes the display number to -displayfd when it's ready.
+        process = subprocess.Popen(
+            ['Xvfb', '-displayfd', str(writefd), '-screen', '0',
+             '1280x1024x24', '-nolisten', 'tcp'],
+            pass_fds=[writefd], stderr=subprocess.DEVNULL)
+    except FileNotFoundError:
+        os.close(readfd)
+        os.close(writefd)
+        raise RuntimeError("Xvfb is not installed") from None
+    os.close(writefd)
+
+    try:
+        with os.fdopen(readfd, 'r') as f:
+            display = f.readline().strip()
+        if not display:
+            raise RuntimeError("Xvfb didn't start")
+        old_display = os.environ.get('DISPLAY')
+        os.environ['DISPLAY'] = ':' + display
+        try:
+            yield
+        finally:
+            if old_display is None:
+                del os.environ['DISPLAY']
+            else:
+                os.environ['DISPLAY'] = old_display
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def _run_in_subprocesses(wrappers, args):     # pragma: no cover
+    """Run the benchmarks with each wrapper in a separate process.
+
+    Return a dictionary like {wrapper: results}.
+    """
+    result = collections.OrderedDict()
+    for wrapper in wrappers:
+        with tempfile.TemporaryDirectory() as tempdir:
+            outfile = os.path.join(tempdir, 'results.json')
+            command = [sys.executable, '-m', 'bananagui.bench',
+                       '--wrapper', wrapper, '--output', outfile,
+                       '--repeat', str(args.repeat),
+                       '--budget', str(args.budget)] + args.patterns
+            print("*** %s ***" % wrapper)
+            subprocess.check_call(command)
+            print()
+            with open(outfile, 'r') as f:
+                result[wrapper] = json.load(f)['results']
+    return result
+
+
+def _print_table(results_by_wrapper, file):     # pragma: no cover
+    wrappers = list(results_by_wrapper)
+    names = []
+    for results in results_by_wrapper.values():
+        names.extend(name for name in results if name not in names)
+
+    header = '%-40s' % 'benchmark'
+    for wrapper in wrappers:
+        header += ' %34s' % wrapper
+    print(header, file=file)
+    for name in names:
+        line = '%-40s' % name
+        for wrapper in wrappers:
+            result = results_by_wrapper[wrapper].get(name)
+            if result is None:
+                line += ' %34s' % '-'
+                continue
+            calls = result['tcl_calls']
+            if calls is None:
+                calls = result['wrapper_calls']
+            rss = result['rss']
+            line += ' %9.4fs %8d calls %5s MB' % (
+                result['seconds'], calls,
+                '?' if rss is None else rss // (1024 * 1024))
+        print(line, file=file)
+    print("The calls are Tcl calls with tkinter and wrapper calls with "
+          "other wrappers.", file=file)
+
+
+def main():     # pragma: no cover
+    """Run the command-line interface.
+
+    This uses :data:`sys.argv` and may use :func:`sys.exit`.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        'patterns', metavar='PATTERN', nargs='*', default=['*'],
+        help=("Run only benchmarks that match at least one of these "
+              "fnmatch patterns, e.g. 'box_*'. By default, all "
+              "benchmarks are ran."))
+    parser.add_argument(
+        '-l', '--list', action='store_true',
+        help="List the benchmarks and exit.")
+    parser.add_argument(
+        '-w', '--wrapper', action='append', choices=sorted(bananagui.WRAPPERS),
+        help=("Use this wrapper. This can be given multiple times to "
+              "compare wrappers. Defaults to dummy."))
+    parser.add_argument(
+        '--xvfb', action='store_true',
+        help="Run the wrappers in a virtual X server started with Xvfb.")
+    parser.add_argument(
+        '-r', '--repeat', type=int, default=3,
+        help="Run each benchmark this many times. Defaults to %(default)d.")
+    parser.add_argument(
+        '-b', '--budget', type=float, default=10,
+        help=("Skip bigger sizes if a size takes more than this many "
+              "seconds. Defaults to %(default)s."))
+    parser.add_argument(
+        '-o', '--output', type=argparse.FileType('w'),
+        help="Save the results to this JSON file.")
+    parser.add_argument(
+        '-c', '--compare', type=argparse.FileType('r'), metavar='BASELINE',
+        help=("Compare the results to a JSON file created with --output "
+              "and exit with status 1 if something got slower."))
+    parser.add_argument(
+        '-t', '--tolerance', type=float, default=0.2,
+        help=("With --compare, report things that got this much slower. "
+              "Defaults to %(default)s, which means 20%%."))
+    args = parser.parse_args()
+
+    if args.list:
+        for name in _names(args.patterns):
+            setupfunc, sizes = _benchmarks[name]
+            if sizes == (None,):
+                print(name)
+            else:
+                print(name, 'sizes:', ', '.join(map(str, sizes)))
+        return
+
+    wrappers = args.wrapper or ['dummy']
+    with contextlib.ExitStack() as stack:
+        if args.xvfb:
+            try:
+                stack.enter_context(_xvfb())
+            except RuntimeError as e:
+                parser.error(str(e))
+
+        if len(wrappers) > 1:
+            if args.output is not None or args.compare is not None:
+                parser.error("--output and --compare can't be used with "
+                             "multiple wrappers")
+            _print_table(_run_in_subprocesses(wrappers, args), sys.stdout)
+            return
+
+        load_wrapper(wrappers[0])
+        results = run(args.patterns, repeat=args.repeat, budget=args.budget,
+                      file=sys.stdout)
+
+    if args.output is not None:
+        with args.output as f:
+            json.dump({'version': 1, 'python': sys.version,
+                       'wrapper': wrappers[0], 'results': results},
+                      f, indent=2)
+            f.write('\n')
+
+    if args.compare is not None:
+        with args.compare as f:
+            baseline = json.load(f)['results']
+        print()
+        if compare(results, baseline, tolerance=args.tolerance,
+                   file=sys.stdout):
+            sys.exit(1)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
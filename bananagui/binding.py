@@ -0,0 +1,425 @@
+"""Keep properties of different widgets in sync.
+
+Connecting functions to ``on_something_changed`` callbacks works, but
+it gets messy when there are many widgets that depend on each other.
+This module does it for you::
+
+    from bananagui import binding
+
+    # label.text is set to str(slider.value) when the slider moves
+    binding.bind(slider, 'value', label, 'text', transform=str)
+
+    # the checkbox and the entry gray out each other
+    binding.bind(checkbox, 'checked', entry, 'grayed_out')
+    binding.bind(checkbox, 'checked', group, 'grayed_out',
+                 transform=(lambda checked: not checked))
+
+    # changing either entry changes the other entry
+    binding.bind(entry1, 'text', entry2, 'text', two_way=True)
+
+The target is updated right away when :func:`bind` is called, but after
+that, changes are collected and propagated when the GUI toolkit has
+handled its events. This way, each property that depends on a changed
+property is set at most once, no matter how many times the source
+property changed or how many paths there are to it from the changed
+properties. Properties are processed in an order that makes sure that
+everything a property depends on has been updated before it, and if a
+transform function returns the value that a property already has,
+things that depend on that property are not updated at all. Use
+:func:`flush` if you want to propagate the changes right away.
+
+If a property depends on many other properties, like a label that
+shows how many of ten checkboxes are checked, use
+``bananagui.types.computed()`` instead. It calls a function and keeps
+track of the properties that the function reads.
+"""
+
+import sys
+import threading
+import traceback
+import weakref
+
+from bananagui import mainloop
+
+__all__ = ['Binding', 'bind', 'flush']
+
+# {source widget: {property name: [Binding, ...], ...}, ...}
+# The widgets are weakly referenced, and so are the sources and targets
+# of the Binding objects, so bound widgets can be garbage collected.
+_bindings = weakref.WeakKeyDictionary()
+
+# {target widget: WeakSet of Bindings, ...} for unbinding everything
+# when a target is destroyed.
+_incoming = weakref.WeakKeyDictionary()
+
+# Worker threads can bind in bananagui.widgets.detached() while the GUI
+# thread binds, unbinds or propagates, so _bindings and _incoming must
+# be used only with this lock held.
+_bindings_lock = threading.Lock()
+
+# The properties that have changed since the last flush. This is a dict
+# because dicts remember the order that keys were added in. Like the
+# rest of BananaGUI, this must be used only in the GUI thread, and
+# changes made in bananagui.widgets.detached() don't go here.
+_dirty = {}
+_flush_scheduled = False
+
+
+class _ThreadState(threading.local):
+
+    def __init__(self):
+        # The properties that _propagate() is setting right now in this
+        # thread. Their changed callbacks must not mark them dirty
+        # again. Changes in detached() are propagated in their own
+        # thread, so this is per-thread.
+        self.being_set = set()
+
+
+_state = _ThreadState()
+
+
+class Binding:
+    """Information about a :func:`bind` call.
+
+    Two-way bindings are represented with two Binding objects, one for
+    each direction. The bindings don't keep the widgets alive, and
+    destroying the source or the target unbinds. Binding objects have
+    these attributes:
+
+    .. attribute:: source
+    .. attribute:: target
+
+        The widgets, or None if they have been garbage collected.
+
+    .. attribute:: source_property
+    .. attribute:: target_property
+    .. attribute:: transform
+
+        The function that converts source values to target values, or
+        None.
+    """
+
+    def __init__(self, source, source_property, target, target_property,
+                 transform, stack_info):
+        self._source = weakref.ref(source)
+        self.source_property = source_property
+        self._target = weakref.ref(target)
+        self.target_property = target_property
+        self.transform = transform
+        self._stack_info = stack_info
+        self._other_way = None
+
+    def __repr__(self):
+        return '<%s.%s: %s.%s -> %s.%s>' % (
+            type(self).__module__, type(self).__name__,
+            type(self.source).__name__, self.source_property,
+            type(self.target).__name__, self.target_property)
+
+    @property
+    def source(self):
+        return self._source()
+
+    @property
+    def target(self):
+        return self._target()
+
+    def unbind(self):
+        """Stop keeping the target in sync with the source.
+
+        This also unbinds the other direction of two-way bindings.
+        Unbinding a binding that has been unbound already does nothing.
+        """
+        _remove(self)
+        if self._other_way is not None:
+            _remove(self._other_way)
+            self._other_way._other_way = None
+            self._other_way = None
+
+    def _get_value(self):
+        """Return the new target value, or raise an exception."""
+        value = getattr(self.source, self.source_property)
+        if self.transform is not None:
+            value = self.transform(value)
+        return value
+
+
+def _callback_of(widget, property_name):
+    return getattr(widget, 'on_%s_changed' % property_name)
+
+
+def _check_source(widget, property_name):
+    name = 'on_%s_changed' % property_name
+    if getattr(type(widget), name, None) is None:
+        raise ValueError("%s widgets don't have an %s callback, so %r "
+                         "can't be used as a binding source"
+                         % (type(widget).__name__, name, property_name))
+
+
+def _check_target(widget, property_name):
+    value = getattr(type(widget), property_name, None)
+    if not (isinstance(value, property) and value.fset is not None):
+        raise ValueError("%s widgets don't have a settable %r property"
+                         % (type(widget).__name__, property_name))
+
+
+def _bindings_from(node):
+    """Return a list of bindings with node as the source.
+
+    The list is a copy, so it can be used without holding _bindings_lock.
+    """
+    widget, property_name = node
+    with _bindings_lock:
+        try:
+            return _bindings[widget][property_name].copy()
+        except KeyError:
+            return []
+
+
+def _target_of(binding):
+    """Return a (widget, property name) node or None if it's dead."""
+    target = binding.target
+    if target is None:
+        return None
+    return (target, binding.target_property)
+
+
+def _add(binding):
+    source = binding.source
+    with _bindings_lock:
+        properties = _bindings.setdefault(source, {})
+        try:
+            properties[binding.source_property].append(binding)
+        except KeyError:
+            properties[binding.source_property] = [binding]
+            node = (source, binding.source_property)
+            _callback_of(*node).connect(_mark_dirty, node)
+        incoming = _incoming.setdefault(binding.target, weakref.WeakSet())
+        incoming.add(binding)
+
+
+def _remove(binding):
+    source = binding.source
+    target = binding.target
+    with _bindings_lock:
+        if target is not None and target in _incoming:
+            _incoming[target].discard(binding)
+            if not _incoming[target]:
+                del _incoming[target]
+
+        if source is None:
+            # The WeakKeyDictionary has forgotten it already.
+            return
+        node = (source, binding.source_property)
+        bindings = _bindings.get(source, {}).get(binding.source_property, [])
+        if binding not in bindings:
+            # It has been unbound already.
+            return
+        bindings.remove(binding)
+        if not bindings:
+            properties = _bindings[source]
+            del properties[binding.source_property]
+            if not properties:
+                del _bindings[source]
+            _dirty.pop(node, None)
+            try:
+                _callback_of(*node).disconnect(_mark_dirty)
+            except ValueError:
+                # The widget has been destroyed, and destroying
+                # disconnected everything.
+                pass
+
+
+def _forget(widget):
+    """Unbind everything that widget is the source or target of.
+
+    bananagui.widgets.Widget.destroy() calls this.
+    """
+    if not (_bindings or _incoming):
+        return
+    with _bindings_lock:
+        found = list(_incoming.get(widget, ()))
+        for bindings in _bindings.get(widget, {}).values():
+            found.extend(bindings)
+    for binding in found:
+        binding.unbind()
+
+
+def _mark_dirty(node):
+    global _flush_scheduled
+    if node in _state.being_set:
+        return
+    if mainloop._is_detached():
+        # There's no main loop iteration to wait for, and _dirty belongs
+        # to the GUI thread. See bananagui.widgets.detached().
+        _propagate([node])
+        return
+    # Moving the node to the end makes the latest change win if two
+    # properties that are bound to each other change in the same tick.
+    _dirty.pop(node, None)
+    _dirty[node] = None
+    if not _flush_scheduled:
+        mainloop._call_soon(_flush_soon)
+        _flush_scheduled = True
+
+
+def _flush_soon():
+    global _flush_scheduled
+    _flush_scheduled = False
+    flush()
+
+
+def _sort(roots):
+    """Find the nodes that depend on roots.
+
+    The return value is a (nodes, incoming) tuple. The nodes are in
+    topological order, without the roots. incoming is a dictionary with
+    the nodes and the roots as keys and lists of bindings to them from
+    the roots and the nodes as values. Bindings to the roots don't
+    affect the order because the roots have already changed.
+    """
+    rootset = set(roots)
+    order = list(roots)
+    incoming = {}
+    for node in order:
+        for binding in _bindings_from(node):
+            target = _target_of(binding)
+            if target is None:
+                continue
+            try:
+                incoming[target].append(binding)
+            except KeyError:
+                incoming[target] = [binding]
+                if target not in rootset:
+                    order.append(target)
+    del order[:len(roots)]
+
+    # Kahn's algorithm.
+    counts = {node: len(incoming[node]) for node in order}
+    result = []
+    ready = list(roots)
+    for node in ready:
+        for binding in _bindings_from(node):
+            target = _target_of(binding)
+            if target in counts:
+                counts[target] -= 1
+                if counts[target] == 0:
+                    result.append(target)
+                    ready.append(target)
+
+    # Nodes in cycles, like two-way bindings between non-roots, are
+    # left over. They are processed in the order they were found.
+    if len(result) != len(order):
+        done = set(result)
+        result.extend(node for node in order if node not in done)
+    return result, incoming
+
+
+def _print_exception(e, binding):
+    lines = traceback.format_exception(type(e), e, e.__traceback__)
+    lines.insert(1, binding._stack_info)   # After 'Traceback (bla bla):'.
+    sys.stderr.writelines(lines)
+
+
+def flush():
+    """Propagate changes of bound properties now.
+
+    BananaGUI calls this automatically, so usually there's no need to
+    call this yourself.
+    """
+    if not _dirty:
+        return
+    # The latest change is processed first, so if two properties that
+    # are bound to each other changed, the latest change wins.
+    roots = list(reversed(_dirty))
+    _dirty.clear()
+    _propagate(roots)
+
+
+def _propagate(roots):
+    # {node: number, ...} for nodes that have changed. Bigger numbers
+    # mean newer changes. The first root is the newest change.
+    changed = {root: len(roots) - index for index, root in enumerate(roots)}
+    newest = len(roots)
+    nodes, incoming = _sort(roots)
+
+    # The roots come first, newest first, so roots bound to newer roots
+    # get their values. Then everything that a node depends on has been
+    # updated before the node.
+    for node in roots + nodes:
+        # The value comes from the source that changed last. Roots keep
+        # their own value if they changed after their sources. If
+        # nothing changed, the node doesn't need to change either.
+        winner = None
+        winner_number = changed.get(node, 0)
+        for binding in incoming.get(node, ()):
+            number = changed.get(
+                (binding.source, binding.source_property), 0)
+            if number > winner_number:
+                winner = binding
+                winner_number = number
+        if winner is None:
+            continue
+
+        try:
+            value = winner._get_value()
+        except Exception as e:
+            _print_exception(e, winner)
+            continue
+        if getattr(*node) == value:
+            continue
+
+        being_set = _state.being_set
+        being_set.add(node)
+        try:
+            setattr(*node, value)
+        except Exception as e:
+            _print_exception(e, winner)
+            continue
+        finally:
+            being_set.discard(node)
+        newest += 1
+        changed[node] = newest
+
+
+def bind(source, source_property, target, target_property, *,
+         transform=None, two_way=False, back_transform=None):
+    """Set ``target.target_property`` when ``source.source_property`` changes.
+
+    The source property must have an ``on_something_changed`` callback,
+    like the ``text`` of :class:`.Entry` widgets or the ``value`` of
+    :class:`.Slider` widgets. If *transform* is given, the target is
+    set to ``transform(source_value)`` instead of the source value.
+
+    If *two_way* is True, the source is also set when the target
+    changes. The target property must also have an
+    ``on_something_changed`` callback then, and if *transform* is given,
+    *back_transform* must convert target values back to source values.
+
+    The return value is a :class:`Binding` object.
+    """
+    _check_source(source, source_property)
+    _check_target(target, target_property)
+    if two_way:
+        _check_source(target, target_property)
+        _check_target(source, source_property)
+        if (transform is None) != (back_transform is None):
+            raise TypeError("two-way bindings need both transform and "
+                            "back_transform or neither of them")
+    elif back_transform is not None:
+        raise TypeError("back_transform can only be used with two_way=True")
+
+    stack_info = traceback.format_stack()[-2]   # The bind() call.
+    result = Binding(source, source_property, target, target_property,
+                     transform, stack_info)
+
+    # The target is set before adding the bindings because the other
+    # direction of a two-way binding would set the source back.
+    setattr(target, target_property, result._get_value())
+    _add(result)
+    if two_way:
+        result._other_way = Binding(target, target_property,
+                                    source, source_property,
+                                    back_transform, stack_info)
+        result._other_way._other_way = result
+        _add(result._other_way)
+    return result
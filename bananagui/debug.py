@@ -0,0 +1,325 @@
+"""Tools for finding out what BananaGUI does behind the scenes.
+
+All toolkit work goes through BananaGUI's wrapper objects, so counting
+the calls to them is a good way to find out how much work a piece of
+code causes. For example::
+
+    from bananagui import debug, load_wrapper, widgets
+
+    load_wrapper('tkinter', count_calls=True)
+    label = widgets.Label("Hello")
+    debug.reset_call_stats()
+    label.text = "Hello World"
+    for (wrapper, method), stats in debug.call_stats().items():
+        print(wrapper, method, stats.calls, stats.seconds)
+
+Only wrapper classes and functions that BananaGUI looks up after
+:func:`start_counting` has been called are counted, so it's
+recommended to use ``load_wrapper(..., count_calls=True)`` or call
+:func:`start_counting` before creating any widgets.
+
+The :func:`census` function is useful for finding memory leaks. It
+counts the BananaGUI objects that are still alive::
+
+    before = debug.census()
+    for i in range(1000):
+        window = widgets.Window()
+        window.add(widgets.Label("Hello"))
+        window.close()
+    del window
+    print(debug.census().diff(before))     # should print {}
+"""
+
+import collections
+import functools
+import gc
+import inspect
+import sys
+
+import bananagui
+from bananagui import mainloop, tracing, types, widgets
+
+__all__ = ['CallStats', 'start_counting', 'stop_counting',
+           'call_stats', 'reset_call_stats', 'Census', 'census']
+
+
+class CallStats(collections.namedtuple('CallStats', 'calls seconds')):
+    """Information about calls to one wrapper method or function.
+
+    *calls* is the number of calls, and *seconds* is the total time
+    spent in the calls. The time includes time spent in other wrapper
+    calls made by the method.
+    """
+
+    __slots__ = ()
+
+
+# {(wrapper name, method name): [calls, seconds], ...}
+_stats = {}
+_counting = False
+
+
+def _record(key, seconds):
+    try:
+        statlist = _stats[key]
+    except KeyError:
+        statlist = _stats[key] = [0, 0.0]
+    statlist[0] += 1
+    statlist[1] += seconds
+
+
+def _count(key, func):
+    spanname = '%s.%s' % key
+
+    @functools.wraps(func)
+    def inner(*args, **kwargs):
+        if not (_counting or tracing._enabled):
+            return func(*args, **kwargs)
+        start = tracing._clock()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if _counting:
+                _record(key, tracing._clock() - start)
+            if tracing._enabled:
+                tracing._add_span('wrapper', spanname, start)
+
+    return inner
+
+
+def _instrument_class(name, cls):
+    """Return a subclass of cls that counts and traces its method calls."""
+    namespace = {
+        '__module__': cls.__module__,
+        '__qualname__': cls.__qualname__,
+        '__doc__': cls.__doc__,
+        # The subclass must not add an instance __dict__ if the wrapper
+        # class doesn't have one.
+        '__slots__': (),
+    }
+    for klass in reversed(cls.__mro__):
+        for attribute, value in vars(klass).items():
+            # Dunder methods other than __init__ are not interesting.
+            # Classmethods and staticmethods are left alone because
+            # they aren't functions in the class dictionary.
+            if attribute.startswith('__') and attribute != '__init__':
+                continue
+            if inspect.isfunction(value):
+                namespace[attribute] = _count((name, attribute), value)
+    return type(cls.__name__, (cls,), namespace)
+
+
+def _instrument(name, value):
+    # This is set to bananagui._wrapper_hook.
+    if inspect.isclass(value):
+        return _instrument_class(name, value)
+    if inspect.isfunction(value):
+        return _count((name, value.__name__), value)
+    return value
+
+
+def _install_hook():
+    # bananagui.tracing also uses this.
+    if bananagui._wrapper_hook is not _instrument:
+        bananagui._wrapper_hook = _instrument
+        bananagui._get_wrapper.cache_clear()
+
+
+def _uninstall_hook():
+    # bananagui.tracing also uses this.
+    if not (_counting or tracing._enabled):
+        bananagui._wrapper_hook = None
+        bananagui._get_wrapper.cache_clear()
+
+
+def start_counting():
+    """Start counting calls to wrapper methods and functions.
+
+    :func:`bananagui.load_wrapper` calls this if it's called with
+    ``count_calls=True``.
+    """
+    global _counting
+    _counting = True
+    _install_hook()
+
+
+def stop_counting():
+    """Undo a :func:`start_counting` call.
+
+    The results of :func:`call_stats` are left as is.
+    """
+    global _counting
+    _counting = False
+    _uninstall_hook()
+
+
+def call_stats():
+    """Return a snapshot of the wrapper calls counted so far.
+
+    The return value is a dictionary with ``(wrapper, method)`` tuples
+    as keys and :class:`CallStats` objects as values. *wrapper* is the
+    name that BananaGUI looked up the wrapper class or function with,
+    like ``'widgets.labels:Label'``, and *method* is the name of the
+    method or function.
+    """
+    return {key: CallStats(*statlist) for key, statlist in _stats.items()}
+
+
+def reset_call_stats():
+    """Forget all calls counted so far."""
+    _stats.clear()
+
+
+class Census:
+    """Information about live BananaGUI objects.
+
+    Use :func:`census` to create these objects. They have these
+    attributes:
+
+    .. attribute:: widgets
+
+        A :class:`collections.Counter` with widget class names like
+        ``'bananagui.widgets.Label'`` as keys and the number of live
+        widgets of each class as values.
+
+    .. attribute:: wrappers
+
+        A dictionary with wrapper names like ``'tkinter'`` as keys and
+        Counters like :attr:`widgets` as values. The wrapper objects are
+        the internal objects that BananaGUI widgets use.
+
+    .. attribute:: memory
+
+        A Counter with class names as keys and the approximate number of
+        bytes used by their instances as values. This includes widgets,
+        wrapper objects and callback objects, but not the real GUI
+        toolkit's widgets or other objects referenced by them.
+
+    .. attribute:: callbacks
+
+        The number of callback objects, like ``some_button.on_click``.
+        They are created when they are used for the first time.
+
+    .. attribute:: connections
+
+        The total number of functions connected to the callbacks,
+        including functions passed to
+        :meth:`bananagui.widgets.Parent.delegate`.
+
+    .. attribute:: dead_connections
+
+        The number of ``connect(..., weak=True)`` connections whose
+        function has been garbage collected. They are removed when the
+        callback runs next time.
+
+    .. attribute:: pruned_connections
+
+        The total number of dead weak connections that have been
+        removed since the program started.
+
+    .. attribute:: stack_info_bytes
+
+        The approximate size of the stack information strings that are
+        stored for each connection. They are used for showing where the
+        function was connected when it raises an exception.
+
+    .. attribute:: timeouts
+
+        The number of :func:`bananagui.mainloop.add_timeout` callbacks
+        that haven't stopped yet.
+    """
+
+    def __init__(self):
+        self.widgets = collections.Counter()
+        self.wrappers = {}
+        self.memory = collections.Counter()
+        self.callbacks = 0
+        self.connections = 0
+        self.dead_connections = 0
+        self.pruned_connections = 0
+        self.stack_info_bytes = 0
+        self.timeouts = 0
+
+    def __repr__(self):
+        return '<%s.%s object, %d widgets, %d connections>' % (
+            type(self).__module__, type(self).__name__,
+            sum(self.widgets.values()), self.connections)
+
+    def _flatten(self):
+        result = {'callbacks': self.callbacks,
+                  'connections': self.connections,
+                  'dead_connections': self.dead_connections,
+                  'pruned_connections': self.pruned_connections,
+                  'stack_info_bytes': self.stack_info_bytes,
+                  'timeouts': self.timeouts}
+        for name, count in self.widgets.items():
+            result['widgets:' + name] = count
+        for wrappername, counter in self.wrappers.items():
+            for name, count in counter.items():
+                result['wrappers:%s:%s' % (wrappername, name)] = count
+        for name, size in self.memory.items():
+            result['memory:' + name] = size
+        return result
+
+    def diff(self, other):
+        """Compare this census to an older census.
+
+        The return value is a dictionary with strings like
+        ``'widgets:bananagui.widgets.Label'``, ``'connections'`` or
+        ``'memory:bananagui.widgets.Label'`` as keys and differences as
+        values. Only things that have changed are included, so an empty
+        dictionary means that nothing has changed.
+        """
+        new = self._flatten()
+        old = other._flatten()
+        result = {}
+        for key in new.keys() | old.keys():
+            difference = new.get(key, 0) - old.get(key, 0)
+            if difference != 0:
+                result[key] = difference
+        return result
+
+
+def _sizeof(obj):
+    size = sys.getsizeof(obj)
+    try:
+        size += sys.getsizeof(vars(obj))
+    except TypeError:
+        # It doesn't have a __dict__.
+        pass
+    return size
+
+
+def census():
+    """Count live BananaGUI objects and return a :class:`Census`.
+
+    This runs the garbage collector first, so only objects that can't
+    be garbage collected are included. This can be slow if there are
+    many objects in the program.
+    """
+    gc.collect()
+    result = Census()
+    result.timeouts = mainloop._pending_timeouts
+    result.pruned_connections = types._pruned
+    for obj in gc.get_objects():
+        cls = type(obj)
+        name = cls.__module__ + '.' + cls.__qualname__
+        if isinstance(obj, widgets.Widget):
+            result.widgets[name] += 1
+        elif cls.__module__.startswith('bananagui.wrappers.'):
+            wrappername = cls.__module__.split('.')[2]
+            counter = result.wrappers.setdefault(
+                wrappername, collections.Counter())
+            counter[cls.__qualname__] += 1
+        elif isinstance(obj, types._Callback):
+            result.callbacks += 1
+            connections = obj._callbacks + (obj._delegated or [])
+            result.connections += len(connections)
+            for func, args, stack_info in connections:
+                result.stack_info_bytes += sys.getsizeof(stack_info)
+                if types._is_dead(func):
+                    result.dead_connections += 1
+        else:
+            continue
+        result.memory[name] += _sizeof(obj)
+    return result
@@ -114,7 +114,7 @@ import keyword
 import shutil
 import sys
 
-from bananagui import load_wrapper, mainloop, widgets
+from bananagui import load_wrapper, mainloop, tracing, widgets
 
 __all__ = ['load', 'loads', 'ParsingError', 'main']
 
@@ -243,7 +243,14 @@ class _IniParser:
         # The sections method does not include the default section in
         # its return value.
         for header in parser.sections():
-            self._parse_section(header, parser[header])
+            if tracing._enabled:
+                start = tracing._clock()
+                try:
+                    self._parse_section(header, parser[header])
+                finally:
+                    tracing._add_span('iniloader', '[%s]' % header, start)
+            else:
+                self._parse_section(header, parser[header])
 
     def _check_varname(self, name, *args, must_exist=True, **kwargs):
         """Check if a variable name is valid.
@@ -299,6 +306,8 @@ class _IniParser:
                 self._filename)
         constructor = eval(class_source.lstrip(), self.namespace)
         widget = constructor(**kwargs)
+        if isinstance(widget, widgets.Widget) and widget.name is None:
+            widget.name = widgetname
         if parent is None:
             pass
         elif isinstance(parent, widgets.Bin):
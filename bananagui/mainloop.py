@@ -41,15 +41,31 @@ usually you don't need to worry about the "Not initialized" state.
 
 import math
 import sys
+import threading
 import traceback
 
 import bananagui
+from bananagui import tracing
 
 __all__ = ['init', 'run', 'quit', 'add_timeout']
 
 _initialized = False
 _running = False
 
+# The number of add_timeout() callbacks that haven't stopped yet. This
+# is used by bananagui.debug.census(). The dummy wrapper runs timeouts
+# in other threads, so the lock must be held when changing this.
+_pending_timeouts = 0
+_pending_timeouts_lock = threading.Lock()
+
+# See _call_soon().
+_soon = []
+_soon_scheduled = False
+
+# bananagui.widgets.detached() sets the depth and soon attributes of
+# this in the thread that it runs in.
+_detached = threading.local()
+
 
 def init():
     """Set up the mainloop.
@@ -57,11 +73,21 @@ def init():
     Note that :func:`bananagui.load_wrapper` runs this by default.
     """
     global _initialized
+    global _soon_scheduled
     if _initialized:
         raise RuntimeError("the mainloop is initialized already")
     bananagui._get_wrapper('mainloop:init')()
     _initialized = True
 
+    # If the previous main loop stopped before running _run_soon(), the
+    # idle callback went away with it. The functions are still waiting,
+    # and things like bananagui.binding wait for them to run before
+    # scheduling more, so they must run in the new main loop.
+    _soon_scheduled = False
+    if _soon:
+        bananagui._get_wrapper('mainloop:add_idle')(_run_soon)
+        _soon_scheduled = True
+
 
 def run():
     """Run the mainloop until :func:`~quit` is called."""
@@ -73,11 +99,15 @@ def run():
         raise RuntimeError("two mainloops cannot be ran at the same time")
     wrapperfunc = bananagui._get_wrapper('mainloop:run')
     _running = True
+    if tracing._enabled:
+        tracing._add_instant('mainloop', 'run')
     try:
         wrapperfunc()
     finally:
         _running = False
         _initialized = False
+        if tracing._enabled:
+            tracing._add_instant('mainloop', 'quit')
 
 
 def quit():
@@ -100,13 +130,25 @@ def add_timeout(seconds, callback, *args):
     for most purposes. Use something like :func:`time.time` if you need
     to measure time in the callback function.
     """
+    global _pending_timeouts
     if seconds <= 0:
         raise ValueError("non-positive timeout %s" % (seconds,))
     milliseconds = math.ceil(seconds * 1000)
 
     add_timeout_call = traceback.format_stack()[-2]
+    spanname = getattr(callback, '__qualname__', repr(callback))
 
     def real_callback():
+        if tracing._enabled:
+            start = tracing._clock()
+            try:
+                return run_callback()
+            finally:
+                tracing._add_span('timeout', spanname, start)
+        return run_callback()
+
+    def run_callback():
+        global _pending_timeouts
         try:
             result = callback(*args)
             if result not in {None, bananagui.RUN_AGAIN}:
@@ -117,8 +159,77 @@ def add_timeout(seconds, callback, *args):
             lines = traceback.format_exception(type(e), e, e.__traceback__)
             lines.insert(1, add_timeout_call)  # After 'Traceback (bla bla):'.
             sys.stderr.writelines(lines)
-            return None     # Don't run again.
+            result = None     # Don't run again.
+        if result is None:
+            with _pending_timeouts_lock:
+                _pending_timeouts -= 1
         return result
 
+    # The counter is incremented first because the dummy wrapper may run
+    # the callback in another thread before wrapperfunc() returns.
     wrapperfunc = bananagui._get_wrapper('mainloop:add_timeout')
-    wrapperfunc(milliseconds, real_callback)
+    with _pending_timeouts_lock:
+        _pending_timeouts += 1
+    try:
+        wrapperfunc(milliseconds, real_callback)
+    except Exception:
+        with _pending_timeouts_lock:
+            _pending_timeouts -= 1
+        raise
+
+
+def _call_soon(func, *args):
+    """Call func(*args) when the GUI toolkit has handled its events.
+
+    This can be used for doing something at most once per mainloop
+    iteration, after a burst of events. Exceptions are printed to
+    sys.stderr, and they don't stop other functions from running.
+
+    Functions added in bananagui.widgets.detached() run when the
+    detached() block is done, in the same thread.
+    """
+    global _soon_scheduled
+    if _is_detached():
+        _detached.soon.append((func, args))
+        return
+    _soon.append((func, args))
+    if not _soon_scheduled:
+        bananagui._get_wrapper('mainloop:add_idle')(_run_soon)
+        _soon_scheduled = True
+
+
+def _run_soon():
+    global _soon_scheduled
+    _soon_scheduled = False
+    if not _soon:
+        return
+    # Functions added while these run are ran next time, so a function
+    # that adds itself again can't make this run forever.
+    funcs = _soon[:]
+    del _soon[:]
+    if tracing._enabled:
+        start = tracing._clock()
+    for func, args in funcs:
+        _call_and_report(func, args)
+    if tracing._enabled:
+        tracing._add_span('mainloop', 'idle', start)
+
+
+def _is_detached():
+    """Check if bananagui.widgets.detached() is running in this thread."""
+    return getattr(_detached, 'depth', 0) > 0
+
+
+def _run_detached_soon():
+    # These may add more functions, and they are ran too.
+    while _detached.soon:
+        func, args = _detached.soon.pop(0)
+        _call_and_report(func, args)
+
+
+def _call_and_report(func, args):
+    try:
+        func(*args)
+    except Exception as e:
+        lines = traceback.format_exception(type(e), e, e.__traceback__)
+        sys.stderr.writelines(lines)
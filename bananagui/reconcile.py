@@ -0,0 +1,189 @@
+"""Update widgets to match a description of what they should contain.
+
+Rebuilding a part of a GUI from new data is usually done by destroying
+the old widgets and creating new widgets, or by writing code that
+figures out what has changed. This module does the latter for you. You
+describe the widgets with :class:`Node` objects, and :func:`update`
+creates, removes, moves and changes widgets as needed::
+
+    from bananagui import reconcile, widgets
+
+    def show_servers(box, servers):
+        reconcile.update(box, [
+            reconcile.Node(widgets.Label, {'text': server.name},
+                           key=server.name)
+            for server in servers
+        ])
+
+The same widgets are used as long as the nodes have the same keys,
+so their state is kept and only properties that have changed are set.
+Properties that were in the old node's props but not in the new node's
+props are set back to their default values.
+Nodes without keys are matched with the old widgets in order.
+
+Connecting to callbacks of the created widgets is not a good idea
+because they can be destroyed in any :func:`update` call. Use
+:meth:`bananagui.widgets.Parent.delegate` on the parent widget instead,
+and :func:`get_key` to find out which widget the callback belongs to::
+
+    def on_click(button):
+        print("clicked", reconcile.get_key(button))
+
+    box.delegate('on_click', on_click)
+"""
+
+import collections
+import weakref
+
+from bananagui import widgets
+
+__all__ = ['Node', 'update', 'create', 'get_key']
+
+# {widget: (key, args, property names), ...} for widgets created with
+# create(). The property names are the keys of the latest node's props.
+_created = weakref.WeakKeyDictionary()
+
+
+class Node(collections.namedtuple('Node', 'cls props children key args')):
+    """A description of a widget.
+
+    *cls* is a widget class, like :class:`bananagui.widgets.Label`,
+    and *props* is a dictionary of property values, like
+    ``{'text': 'hello'}``. *children* is a list of nodes for
+    :class:`bananagui.widgets.Box` widgets, and a list of at most one
+    node for :class:`bananagui.widgets.Bin` widgets.
+
+    Children with the same *key* are always represented with the same
+    widget, so keys are useful when the children can be reordered. The
+    keys of children of the same parent must be different. *args* are
+    passed to *cls* when the widget is created, and the widget is
+    created again if they change.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, widgetclass, props=None, children=(), *,
+                key=None, args=()):
+        if props is None:
+            props = {}
+        return super().__new__(cls, widgetclass, props, tuple(children),
+                               key, tuple(args))
+
+
+def get_key(widget):
+    """Return the key of the node that *widget* was created from.
+
+    None is returned if the node didn't have a key or the widget was
+    not created from a node.
+    """
+    return _created.get(widget, (None, (), ()))[0]
+
+
+def _set_props(widget, props):
+    for name, value in props.items():
+        # The property setters check this too, but skipping the setter
+        # is faster.
+        if getattr(widget, name) != value:
+            setattr(widget, name, value)
+
+
+def create(node):
+    """Create a widget and its children from a :class:`Node`.
+
+    :func:`update` calls this for nodes that don't match an existing
+    widget.
+    """
+    widget = node.cls(*node.args)
+    _created[widget] = (node.key, node.args, tuple(node.props))
+    _set_props(widget, node.props)
+    if node.children:
+        _set_children(widget, [create(child) for child in node.children])
+    return widget
+
+
+def _set_children(parent, children):
+    if isinstance(parent, widgets.Box):
+        if parent[:] != children:
+            parent[:] = children
+    elif isinstance(parent, widgets.Bin):
+        if len(children) > 1:
+            raise ValueError("%s widgets can't contain more than one child"
+                             % type(parent).__name__)
+        new = children[0] if children else None
+        if parent.child is not new:
+            if parent.child is not None:
+                parent.remove(parent.child)
+            if new is not None:
+                parent.add(new)
+    else:
+        raise TypeError("don't know how to add children to %r" % (parent,))
+
+
+def _update(widget, node):
+    # Widgets that were not created from nodes can match unkeyed nodes.
+    key, args, old_names = _created.get(widget, (None, (), ()))
+    for name in old_names:
+        if name not in node.props:
+            try:
+                default = widget._get_default(name)
+            except KeyError:
+                # There's nothing sensible to reset it to.
+                continue
+            if getattr(widget, name) != default:
+                setattr(widget, name, default)
+    _created[widget] = (key, args, tuple(node.props))
+    _set_props(widget, node.props)
+    if isinstance(widget, widgets.Parent):
+        update(widget, node.children)
+
+
+def update(parent, nodes):
+    """Make the children of *parent* match a list of :class:`Node` objects.
+
+    Old children that don't match any node are removed and destroyed,
+    and new widgets are created for nodes that don't match any old
+    child. The matching children are updated recursively, and then the
+    children are added, removed and moved in the parent widget. Boxes
+    keep the longest common beginning of the old and new children as
+    is.
+    """
+    old = list(parent.children())
+    keyed = {}
+    unkeyed = {}    # {(widget class, args): deque of widgets, ...}
+    for child in old:
+        key, args, names = _created.get(child, (None, (), ()))
+        if key is None:
+            unkeyed.setdefault((type(child), args),
+                               collections.deque()).append(child)
+        else:
+            keyed[key] = child
+
+    new = []
+    used_keys = set()
+    for node in nodes:
+        child = None
+        if node.key is None:
+            queue = unkeyed.get((node.cls, node.args))
+            if queue:
+                child = queue.popleft()
+        else:
+            if node.key in used_keys:
+                raise ValueError("duplicate key %r" % (node.key,))
+            used_keys.add(node.key)
+            child = keyed.get(node.key)
+            if child is not None and not (
+                    type(child) is node.cls and
+                    _created[child][1] == node.args):
+                child = None
+
+        if child is None:
+            new.append(create(node))
+        else:
+            _update(child, node)
+            new.append(child)
+
+    _set_children(parent, new)
+    kept = set(new)
+    for child in old:
+        if child not in kept:
+            child.destroy()
@@ -0,0 +1,332 @@
+"""Save a tree of widgets and create it again quickly.
+
+Creating thousands of widgets with Python code or
+:mod:`bananagui.iniloader` runs a lot of code for each widget, including
+checking every property value. This module can save the widgets once
+and create them again later without doing all that::
+
+    from bananagui import snapshot
+
+    data = snapshot.dump(window)
+    with open('mainwindow.snapshot', 'wb') as f:
+        f.write(data)
+
+    ...
+
+    with open('mainwindow.snapshot', 'rb') as f:
+        window = snapshot.load(f.read())
+
+The snapshot contains the classes of the widgets, their property values,
+their :attr:`~bananagui.widgets.Widget.name` and the children of parent
+widgets. Connected callbacks are not saved, so use
+:meth:`bananagui.widgets.Window.find` to find the widgets and connect
+to their callbacks after loading them. Images can't be saved, so
+widgets with images must get them after loading.
+
+Snapshots are loaded without checking the property values, so they must
+come from a trusted source, like a file that your program created. The
+format doesn't use :mod:`pickle` or :mod:`marshal`, but it's still
+possible to create invalid widgets with a bad snapshot. If a snapshot
+was created with another version of BananaGUI or your program's widget
+classes have changed, loading it raises :exc:`ValueError`.
+"""
+
+import enum
+import importlib
+
+from bananagui import widgets
+from bananagui.widgets.basewidgets import _get_clone_template
+
+__all__ = ['dump', 'load']
+
+_MAGIC = b'BGUISNAP'
+_VERSION = 1
+
+# Record types.
+_CLASS = b'C'[0]
+_WIDGET = b'W'[0]
+_WINDOW = b'O'[0]
+
+# Value types.
+_NONE = b'N'[0]
+_TRUE = b'T'[0]
+_FALSE = b'F'[0]
+_INT = b'i'[0]
+_STR = b's'[0]
+_TUPLE = b't'[0]
+_RANGE = b'r'[0]
+_ENUM = b'e'[0]
+
+
+def _classpath(cls):
+    return '%s:%s' % (cls.__module__, cls.__qualname__)
+
+
+class _Writer:
+
+    def __init__(self):
+        self.data = bytearray(_MAGIC)
+        self.data.append(_VERSION)
+        self.strings = {}   # {string: index, ...}
+        self.classes = {}   # {class: index, ...}
+
+    def uint(self, number):
+        # Variable-length encoding, 7 bits per byte.
+        while number >= 0x80:
+            self.data.append((number & 0x7f) | 0x80)
+            number >>= 7
+        self.data.append(number)
+
+    def int(self, number):
+        # Zigzag encoding makes small negative numbers small.
+        self.uint(number * 2 if number >= 0 else -number * 2 - 1)
+
+    def string(self, string):
+        # Each string is written once, and then referred to by index.
+        try:
+            self.uint(self.strings[string] + 1)
+        except KeyError:
+            self.strings[string] = len(self.strings)
+            encoded = string.encode('utf-8')
+            self.uint(0)
+            self.uint(len(encoded))
+            self.data += encoded
+
+    def value(self, value):
+        if value is None:
+            self.data.append(_NONE)
+        elif value is True:
+            self.data.append(_TRUE)
+        elif value is False:
+            self.data.append(_FALSE)
+        elif type(value) is int:
+            self.data.append(_INT)
+            self.int(value)
+        elif type(value) is str:
+            self.data.append(_STR)
+            self.string(value)
+        elif type(value) is tuple:
+            self.data.append(_TUPLE)
+            self.uint(len(value))
+            for item in value:
+                self.value(item)
+        elif type(value) is range:
+            self.data.append(_RANGE)
+            self.int(value.start)
+            self.int(value.stop)
+            self.int(value.step)
+        elif isinstance(value, enum.Enum):
+            self.data.append(_ENUM)
+            self.string(_classpath(type(value)))
+            self.value(value.value)
+        else:
+            raise TypeError("cannot save %r in a snapshot" % (value,))
+
+    def widget(self, widget):
+        cls = type(widget)
+        slots, properties = _get_clone_template(cls)
+        if cls not in self.classes:
+            self.classes[cls] = len(self.classes)
+            self.data.append(_CLASS)
+            self.string(_classpath(cls))
+            self.uint(len(slots))
+            for name in slots:
+                self.string(name)
+
+        self.data.append(_WIDGET)
+        self.uint(self.classes[cls])
+        for name in slots:
+            self.value(getattr(widget, name))
+
+    def window(self, window):
+        cls = type(window)
+        slots, properties = _get_clone_template(cls)
+        self.data.append(_WINDOW)
+        self.string(_classpath(cls))
+        self.value(window.name)
+        self.uint(len(properties))
+        for name in properties:
+            self.string(name)
+            self.value(getattr(window, name))
+
+
+def dump(widget):
+    """Create a snapshot of a widget and its children.
+
+    The widget can be a :class:`bananagui.widgets.Window` or any
+    :class:`bananagui.widgets.Child` widget. Dialogs are not supported
+    because they need a parent window. The return value is a bytes
+    object.
+    """
+    if isinstance(widget, widgets.Dialog):
+        raise TypeError("cannot create snapshots of dialogs")
+
+    writer = _Writer()
+    # This doesn't use recursion for the same reason as
+    # widgets.Parent.destroy(). The widgets are written in preorder.
+    stack = [widget]
+    while stack:
+        widget = stack.pop()
+        if isinstance(widget, widgets.Window):
+            writer.window(widget)
+        else:
+            writer.widget(widget)
+        if isinstance(widget, widgets.Parent):
+            children = list(widget.children())
+            writer.uint(len(children))
+            stack.extend(reversed(children))
+        else:
+            writer.uint(0)
+    return bytes(writer.data)
+
+
+def _import(classpath):
+    modulename, qualname = classpath.split(':')
+    result = importlib.import_module(modulename)
+    for name in qualname.split('.'):
+        result = getattr(result, name)
+    return result
+
+
+class _Reader:
+
+    def __init__(self, data):
+        if not data.startswith(_MAGIC):
+            raise ValueError("not a BananaGUI snapshot")
+        version = data[len(_MAGIC)]
+        if version != _VERSION:
+            raise ValueError("unsupported snapshot version %d" % version)
+        self.data = data
+        self.pos = len(_MAGIC) + 1
+        self.strings = []
+        self.classes = []
+        self.enums = {}
+
+    def byte(self):
+        result = self.data[self.pos]
+        self.pos += 1
+        return result
+
+    def uint(self):
+        result = self.data[self.pos]
+        self.pos += 1
+        if result < 0x80:
+            return result
+
+        result &= 0x7f
+        shift = 7
+        while True:
+            byte = self.data[self.pos]
+            self.pos += 1
+            result |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+
+    def int(self):
+        number = self.uint()
+        return number >> 1 if number % 2 == 0 else -(number >> 1) - 1
+
+    def string(self):
+        index = self.uint()
+        if index != 0:
+            return self.strings[index - 1]
+        length = self.uint()
+        result = self.data[self.pos:self.pos+length].decode('utf-8')
+        self.pos += length
+        self.strings.append(result)
+        return result
+
+    def value(self):
+        kind = self.byte()
+        if kind == _NONE:
+            return None
+        if kind == _TRUE:
+            return True
+        if kind == _FALSE:
+            return False
+        if kind == _INT:
+            return self.int()
+        if kind == _STR:
+            return self.string()
+        if kind == _TUPLE:
+            return tuple(self.value() for i in range(self.uint()))
+        if kind == _RANGE:
+            return range(self.int(), self.int(), self.int())
+        if kind == _ENUM:
+            classpath = self.string()
+            try:
+                enumclass = self.enums[classpath]
+            except KeyError:
+                enumclass = self.enums[classpath] = _import(classpath)
+            return enumclass(self.value())
+        raise ValueError("invalid snapshot data at position %d"
+                         % (self.pos - 1))
+
+    def classdef(self):
+        classpath = self.string()
+        cls = _import(classpath)
+        if not (isinstance(cls, type) and issubclass(cls, widgets.Widget)):
+            raise ValueError("%s is not a widget class" % classpath)
+        slots = [self.string() for i in range(self.uint())]
+        if slots != _get_clone_template(cls)[0]:
+            raise ValueError("the snapshot was created with a different "
+                             "version of %s" % classpath)
+        self.classes.append((cls, len(slots)))
+
+    def widget(self):
+        """Read a widget and return it and the number of its children."""
+        kind = self.byte()
+        while kind == _CLASS:
+            self.classdef()
+            kind = self.byte()
+
+        if kind == _WIDGET:
+            cls, slotcount = self.classes[self.uint()]
+            value = self.value
+            result = cls._restore([value() for i in range(slotcount)])
+        elif kind == _WINDOW:
+            cls = _import(self.string())
+            name = self.value()
+            values = {}
+            for i in range(self.uint()):
+                key = self.string()
+                values[key] = self.value()
+            # There's only one window, so it can be created normally.
+            result = cls(values.pop('title'), name=name)
+            for key, value in values.items():
+                setattr(result, key, value)
+        else:
+            raise ValueError("invalid snapshot data at position %d"
+                             % (self.pos - 1))
+        return result, self.uint()
+
+
+def load(data):
+    """Create widgets from a :func:`dump` return value.
+
+    The return value is the widget that was passed to :func:`dump`.
+    Each widget's children are added to it after creating the children,
+    so everything is added to the window at once.
+    """
+    reader = _Reader(data)
+    root, childcount = reader.widget()
+    # [[parent, number of children, children created so far], ...]
+    stack = [[root, childcount, []]]
+    while True:
+        parent, childcount, children = stack[-1]
+        if len(children) < childcount:
+            widget, childcount = reader.widget()
+            stack.append([widget, childcount, []])
+            continue
+
+        stack.pop()
+        if children:
+            parent._add_clones(children)
+        if not stack:
+            break
+        stack[-1][2].append(parent)
+
+    if reader.pos != len(data):
+        raise ValueError("junk after the snapshot data")
+    return root
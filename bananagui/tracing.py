@@ -0,0 +1,153 @@
+"""Record a timeline of what BananaGUI does.
+
+Counting calls with :mod:`bananagui.debug` tells how much work
+something causes, but it doesn't tell when the work happens. This
+module records timestamped spans of these things:
+
+* Timeout callbacks added with :func:`bananagui.mainloop.add_timeout`.
+* Running callbacks, like ``on_click`` or ``on_text_changed``.
+* Setting properties, like ``label.text = "hello"``.
+* Calls to wrapper objects and functions.
+* Parsing sections with :mod:`bananagui.iniloader`.
+
+The spans are kept in a fixed-size in-memory buffer. When the buffer is
+full, the oldest spans are thrown away. This means that recording can
+be left on in long-running programs, and the buffer can be written to a
+file when something weird happens::
+
+    from bananagui import tracing
+
+    tracing.start()
+    tracing.dump_on_signal('bananagui-trace.json')
+
+Now ``kill -USR1 <pid>`` writes the most recent spans to
+``bananagui-trace.json`` in the `Chrome Trace Event format`_. The file
+can be opened in https://ui.perfetto.dev/ or ``chrome://tracing``.
+
+.. _Chrome Trace Event format: https://docs.google.com/document/d/
+   1CvAClvFfyA5R-PhYUmn5OOQtYMH4h6I0nSsKchNAySU/
+"""
+
+import collections
+import json
+import os
+import signal
+import threading
+import time
+
+__all__ = ['start', 'stop', 'is_running', 'clear', 'dump', 'dumps',
+           'dump_on_signal']
+
+_enabled = False
+_events = collections.deque(maxlen=100000)
+_clock = time.perf_counter
+
+
+def _add_span(category, name, start):
+    """Record a span that started at ``start`` and ends now.
+
+    *start* must be a return value of _clock().
+    """
+    end = _clock()
+    # deque.append() is thread-safe, so this works with the dummy
+    # wrapper that runs timeouts in threads.
+    _events.append({
+        'ph': 'X',
+        'cat': category,
+        'name': name,
+        'ts': start * 1000000,
+        'dur': (end - start) * 1000000,
+        'pid': os.getpid(),
+        'tid': threading.get_ident(),
+    })
+
+
+def _add_instant(category, name):
+    """Record something that doesn't take any time."""
+    _events.append({
+        'ph': 'i',
+        's': 't',
+        'cat': category,
+        'name': name,
+        'ts': _clock() * 1000000,
+        'pid': os.getpid(),
+        'tid': threading.get_ident(),
+    })
+
+
+def start(maxlen=100000, *, wrapper_calls=True):
+    """Start recording.
+
+    At most *maxlen* spans are kept in memory. If *wrapper_calls* is
+    True, calls to wrapper classes and functions are also recorded, but
+    only wrapper classes and functions that BananaGUI looks up after
+    calling this are recorded, just like with
+    :func:`bananagui.debug.start_counting`.
+
+    If recording is already running, the old spans are kept if
+    *maxlen* is not changed.
+    """
+    global _enabled
+    global _events
+    if maxlen != _events.maxlen:
+        _events = collections.deque(_events, maxlen=maxlen)
+    if wrapper_calls:
+        # The import is here to avoid a circular import.
+        from bananagui import debug
+        debug._install_hook()
+    _enabled = True
+
+
+def stop():
+    """Stop recording.
+
+    The spans recorded so far are kept, so they can be dumped after
+    stopping.
+    """
+    global _enabled
+    _enabled = False
+    # The import is here to avoid a circular import.
+    from bananagui import debug
+    debug._uninstall_hook()
+
+
+def is_running():
+    """Return True if :func:`start` has been called after :func:`stop`."""
+    return _enabled
+
+
+def clear():
+    """Throw away all spans recorded so far."""
+    _events.clear()
+
+
+def dumps():
+    """Return the recorded spans as a Chrome Trace Event JSON string."""
+    # list() makes sure that the events don't change while they are
+    # being converted to JSON.
+    events = list(_events)
+    events.append({'ph': 'M', 'name': 'process_name', 'pid': os.getpid(),
+                   'args': {'name': 'BananaGUI'}})
+    return json.dumps({'traceEvents': events, 'displayTimeUnit': 'ms'})
+
+
+def dump(file):
+    """Like :func:`dumps`, but write the JSON to a file object."""
+    file.write(dumps())
+
+
+def dump_on_signal(path, signum=None):
+    """Write the spans to *path* when a signal is received.
+
+    *signum* defaults to :data:`signal.SIGUSR1`. Python runs signal
+    handlers only between Python bytecode instructions, so with some GUI
+    toolkits the file is written after the next timeout or callback.
+    """
+    if signum is None:
+        signum = signal.SIGUSR1
+
+    def handler(signum, frame):
+        with open(path, 'w') as f:
+            dump(f)
+
+    signal.signal(signum, handler)
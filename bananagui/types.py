@@ -2,10 +2,15 @@
 
 import collections.abc
 import contextlib
+import inspect
 import sys
+import threading
 import traceback
+import weakref
 
-__all__ = ['add_property', 'add_callback']
+from bananagui import mainloop, tracing
+
+__all__ = ['add_property', 'add_callback', 'computed']
 
 
 class _Callback:
@@ -15,6 +20,9 @@ class _Callback:
     and they will be called when BananaGUI runs the callback.
     """
 
+    __slots__ = ('_object', '_name', '_blocklevel', '_callbacks',
+                 '_delegated')
+
     def __init__(self, obj, name):
         self._object = obj
         self._name = name
@@ -27,20 +35,44 @@ class _Callback:
         # function connected at most once. Simple is better than
         # complex.
         self._callbacks = []
+        # Functions passed to Parent.delegate(), or None.
+        self._delegated = None
 
     def __repr__(self):
         cls = type(self._object)
         return '<BananaGUI callback %r of %s.%s object>' % (
             self._name, cls.__module__, cls.__name__)
 
-    def connect(self, func, *args):
+    def connect(self, func, *args, weak=False, coalesce=False):
         """Schedule func(*args) to be called when the callback is ran.
 
         Passing arguments to this function is a handy way to pass
         information to the callback function. There's no need to use
         lambda or functools.partial().
+
+        If *weak* is True, the callback doesn't prevent *func* from
+        being garbage collected. This is useful with methods of objects
+        that don't live as long as the widget, because connecting a
+        method keeps the object alive. When the function or the
+        method's object is garbage collected, it's disconnected
+        automatically the next time the callback runs. The arguments
+        are not weakly referenced, and weak connections don't work
+        with lambdas because nothing else refers to them.
+
+        If *coalesce* is True, the function is not called right away
+        when the callback runs. Instead, it's called after the GUI
+        toolkit has handled the events that are currently waiting, and
+        only once even if the callback ran many times. This is useful
+        with things like ``on_size_changed`` that may run many times
+        in a row when the user does something, especially if the
+        function does something slow. Use the property in the function
+        to get the latest value.
         """
         stack_info = traceback.format_stack()[-2]  # The connect() call.
+        if weak:
+            func = _WeakFunction(func)
+        if coalesce:
+            func = _CoalescedFunction(func)
         self._callbacks.append((func, args, stack_info))
 
     def is_connected(self, func):
@@ -92,15 +124,273 @@ class _Callback:
         if self._blocklevel != 0:
             # It's blocked.
             return
-        for func, args, stack_info in self._callbacks:
+        if tracing._enabled:
+            start = tracing._clock()
             try:
-                func(*args)
-            except Exception as e:
-                # We can magically show where this callback was connected.
-                lines = traceback.format_exception(
-                    type(e), e, e.__traceback__)
-                lines.insert(1, stack_info)  # After 'Traceback (bla bla):'.
-                sys.stderr.writelines(lines)
+                self._run()
+            finally:
+                cls = type(self._object)
+                tracing._add_span('callback', '%s.%s' % (
+                    cls.__name__, self._name), start)
+        else:
+            self._run()
+
+    def _run(self):
+        found_dead = False
+        for infotuple in self._callbacks:
+            func, args, stack_info = infotuple
+            if type(func) is _CoalescedFunction:
+                if not func.pending:
+                    func.pending = True
+                    mainloop._call_soon(self._run_coalesced, infotuple)
+                continue
+            if type(func) is _WeakFunction:
+                func = func.ref()
+                if func is None:
+                    found_dead = True
+                    continue
+            _call(func, args, stack_info)
+        if found_dead:
+            self._prune()
+        if _delegations != 0:
+            _run_delegated(self._object, self._name)
+
+    def _run_coalesced(self, infotuple):
+        coalesced, args, stack_info = infotuple
+        coalesced.pending = False
+        if not any(other is infotuple for other in self._callbacks):
+            # It was disconnected after running the callback.
+            return
+        func = coalesced.func
+        if type(func) is _WeakFunction:
+            func = func.ref()
+            if func is None:
+                self._prune()
+                return
+        _call(func, args, stack_info)
+
+    def _prune(self):
+        """Remove weak connections to functions that no longer exist."""
+        global _pruned
+        alive = [infotuple for infotuple in self._callbacks
+                 if not _is_dead(infotuple[0])]
+        _pruned += len(self._callbacks) - len(alive)
+        self._callbacks[:] = alive
+
+    def _clear(self):
+        """Disconnect everything, including delegated functions."""
+        global _delegations
+        self._callbacks.clear()
+        if self._delegated is not None:
+            _delegations -= len(self._delegated)
+            self._delegated = None
+
+    def _delegate(self, func, args, stack_info):
+        global _delegations
+        if self._delegated is None:
+            self._delegated = []
+        self._delegated.append((func, args, stack_info))
+        _delegations += 1
+
+    def _undelegate(self, func):
+        global _delegations
+        for index, infotuple in enumerate(self._delegated or ()):
+            if infotuple[0] == func:
+                del self._delegated[index]
+                _delegations -= 1
+                return
+        raise ValueError("function is not delegated")
+
+
+class _WeakFunction:
+    """A weak reference to a function or a bound method.
+
+    These compare equal to the function, so is_connected() and
+    disconnect() work with weak connections.
+    """
+
+    __slots__ = ('ref',)
+
+    def __init__(self, func):
+        if inspect.ismethod(func):
+            # weakref.ref(func) would die right away because bound
+            # method objects are created when they are needed.
+            self.ref = weakref.WeakMethod(func)
+        else:
+            self.ref = weakref.ref(func)
+
+    def __eq__(self, other):
+        if isinstance(other, _WeakFunction):
+            return self.ref == other.ref
+        func = self.ref()
+        return func is not None and func == other
+
+    __hash__ = None
+
+
+class _CoalescedFunction:
+    """A function connected with coalesce=True.
+
+    The func attribute can be a _WeakFunction.
+    """
+
+    __slots__ = ('func', 'pending')
+
+    def __init__(self, func):
+        self.func = func
+        self.pending = False    # True if it will be called soon.
+
+    def __eq__(self, other):
+        if isinstance(other, _CoalescedFunction):
+            return self.func == other.func
+        return self.func == other
+
+    __hash__ = None
+
+
+def _is_dead(func):
+    if type(func) is _CoalescedFunction:
+        func = func.func
+    return type(func) is _WeakFunction and func.ref() is None
+
+
+# The number of dead weak connections that have been removed. This is
+# used by bananagui.debug.census().
+_pruned = 0
+
+# The number of functions connected with connect_all() or
+# Parent.delegate(). Running callbacks is fast when this is zero.
+_delegations = 0
+
+
+def _call(func, args, stack_info):
+    try:
+        func(*args)
+    except Exception as e:
+        # We can magically show where this callback was connected.
+        lines = traceback.format_exception(type(e), e, e.__traceback__)
+        lines.insert(1, stack_info)  # After 'Traceback (bla bla):'.
+        sys.stderr.writelines(lines)
+
+
+def _run_delegated(obj, name):
+    """Run the connect_all() and delegate() functions for obj's callback."""
+    descriptor = getattr(type(obj), name, None)
+    for func, args, stack_info in getattr(descriptor, '_all', ()):
+        _call(func, (obj,) + args, stack_info)
+
+    # Widgets have a _parent attribute, and it's left as is when the
+    # widget is removed from the parent, so _attached must be checked.
+    widget = obj
+    while getattr(widget, '_attached', False):
+        widget = widget._parent
+        try:
+            callback = widget._callbacks[name]
+        except (AttributeError, KeyError):
+            continue
+        if callback._delegated is not None:
+            for func, args, stack_info in callback._delegated:
+                _call(func, (obj,) + args, stack_info)
+
+
+def _get_callback(obj, name):
+    """Return obj's callback object, creating it if needed."""
+    # The callback objects are created when they are needed for the
+    # first time. They are stored in a dictionary that is also created
+    # when it's needed, so classes with __slots__ need to have a
+    # _callbacks slot.
+    try:
+        callbacks = obj._callbacks
+    except AttributeError:
+        callbacks = obj._callbacks = {}
+    try:
+        return callbacks[name]
+    except KeyError:
+        callback = callbacks[name] = _Callback(obj, name)
+        return callback
+
+
+def _copy_callbacks(old, new):
+    """Connect everything connected to old's callbacks to new's callbacks."""
+    try:
+        callbacks = old._callbacks
+    except AttributeError:
+        return
+    for name, callback in callbacks.items():
+        copy = _get_callback(new, name)
+        for func, args, stack_info in callback._callbacks:
+            if type(func) is _CoalescedFunction:
+                # The pending flag must not be shared.
+                func = _CoalescedFunction(func.func)
+            copy._callbacks.append((func, args, stack_info))
+        for func, args, stack_info in callback._delegated or ():
+            copy._delegate(func, args, stack_info)
+
+
+def _run_callback(obj, name):
+    """Like obj.<name>.run(), but doesn't create useless callback objects.
+
+    The callback object doesn't need to be created if nothing has been
+    connected to it. Functions passed to connect_all() or delegate() are
+    still called.
+    """
+    try:
+        callback = obj._callbacks[name]
+    except (AttributeError, KeyError):
+        if _delegations != 0:
+            _run_delegated(obj, name)
+        return
+    callback.run()
+
+
+class _CallbackDescriptor:
+    """The class attributes that add_callback() creates.
+
+    Accessing the attribute from an instance returns a callback object,
+    and accessing it from the class returns the descriptor itself.
+    """
+
+    def __init__(self, name, doc):
+        self._name = name
+        self._all = []      # Functions passed to connect_all().
+        self.__doc__ = doc
+
+    def __get__(self, obj, cls=None):
+        if obj is None:
+            return self
+        return _get_callback(obj, self._name)
+
+    # This makes the descriptor read-only, just like a property.
+    def __set__(self, obj, value):
+        raise AttributeError("can't set attribute")
+
+    def connect_all(self, func, *args):
+        """Call func(obj, *args) when this callback of any object runs.
+
+        The function is called with the object that the callback belongs
+        to, like the button that was clicked. For example::
+
+            widgets.Button.on_click.connect_all(print)
+
+        This is much cheaper than connecting to the callback of each
+        object separately when there are many objects. Subclasses of
+        the class inherit the function, so the function also runs for
+        instances of subclasses.
+        """
+        global _delegations
+        stack_info = traceback.format_stack()[-2]
+        self._all.append((func, args, stack_info))
+        _delegations += 1
+
+    def disconnect_all(self, func):
+        """Undo a connect_all() call."""
+        global _delegations
+        for index, infotuple in enumerate(self._all):
+            if infotuple[0] == func:
+                del self._all[index]
+                _delegations -= 1
+                return
+        raise ValueError("function is not connected")
 
 
 def add_property(name, *, add_changed=False, allow_none=False,
@@ -154,13 +444,31 @@ def add_property(name, *, add_changed=False, allow_none=False,
     A _wrapper.set_NAME method will be called with the new value as an
     argument after checking the value and possibly calling extra_setter.
     """
+    attribute = '_prop_' + name
+    changed_name = 'on_%s_changed' % name
+
     def getter(self):
-        return getattr(self, '_prop_' + name)
+        tracking = _state.tracking
+        if tracking:
+            # A computed value is being calculated in this thread.
+            tracking[-1].add((weakref.ref(self), name))
+        return getattr(self, attribute)
 
     def setter(self, new_value):
-        if getattr(self, '_prop_' + name) == new_value:
+        if tracing._enabled:
+            start = tracing._clock()
+            try:
+                real_setter(self, new_value)
+            finally:
+                tracing._add_span('property', '%s.%s' % (
+                    self.__class__.__name__, name), start)
+        else:
+            real_setter(self, new_value)
+
+    def real_setter(self, new_value):
+        if getattr(self, attribute) == new_value:
             # Skip a bunch of things.
-            setattr(self, '_prop_' + name, new_value)
+            setattr(self, attribute, new_value)
             return
 
         # This needs to be before the setattr() to make sure that
@@ -204,17 +512,19 @@ def add_property(name, *, add_changed=False, allow_none=False,
         # The setter can run this again, so we need to just
         # return and do nothing if it happens. That's why the
         # setattr is here first.
-        setattr(self, '_prop_' + name, new_value)
+        setattr(self, attribute, new_value)
         getattr(self._wrapper, 'set_' + name)(new_value)
 
+        if _dependents:
+            _invalidate(self, name)
         if add_changed:
-            getattr(self, 'on_%s_changed' % name).run()
+            _run_callback(self, changed_name)
 
     def inner(cls):
         setattr(cls, name, property(getter, setter, doc=doc))
         if add_changed:
             adder = add_callback(
-                'on_%s_changed' % name,
+                changed_name,
                 doc="This callback is ran when :attr:`%s` changes." % name,
             )
             adder(cls)
@@ -238,15 +548,234 @@ def add_callback(name, *, doc=None):
     arg1 arg2 arg3
     >>>
     """
-    def getter(self):
-        try:
-            return getattr(self, '__callback_' + name)
-        except AttributeError:
-            setattr(self, '__callback_' + name, _Callback(self, name))
-            return getattr(self, '__callback_' + name)
-
     def inner(cls):
-        setattr(cls, name, property(getter, doc=doc))
+        setattr(cls, name, _CallbackDescriptor(name, doc))
         return cls
 
     return inner
+
+
+class _ThreadState(threading.local):
+
+    def __init__(self):
+        # The dependency sets of the computed values that are being
+        # calculated right now in this thread. The last set belongs to
+        # the innermost computed value. The sets contain (weakref to
+        # object, property name) tuples. This is per-thread because
+        # properties read in other threads, e.g. in
+        # bananagui.widgets.detached(), are not dependencies.
+        self.tracking = []
+
+
+_state = _ThreadState()
+
+# {object: {property name: [computed value, ...], ...}, ...}
+# The objects are weakly referenced, and computed values refer to their
+# dependencies weakly too, so they don't keep the objects alive.
+_dependents = weakref.WeakKeyDictionary()
+
+# Computed values can be calculated in bananagui.widgets.detached() in
+# worker threads while the GUI thread uses _dependents, so it must be
+# used only with this lock held. The _dependencies sets of the computed
+# values are changed with this lock held too.
+_dependents_lock = threading.Lock()
+
+
+def _invalidate(obj, name):
+    with _dependents_lock:
+        try:
+            computed_values = _dependents[obj][name].copy()
+        except KeyError:
+            return
+    for computed_value in computed_values:
+        computed_value._invalidate()
+
+
+def _forget_dependents(obj):
+    """Stop tracking obj's properties in all computed values.
+
+    bananagui.widgets.Widget.destroy() calls this.
+    """
+    if not _dependents:
+        return
+    ref = weakref.ref(obj)
+    with _dependents_lock:
+        try:
+            properties = _dependents.pop(obj)
+        except KeyError:
+            return
+        for name, computed_values in properties.items():
+            for computed_value in computed_values:
+                computed_value._dependencies.discard((ref, name))
+
+
+class _Computed:
+    """The objects that computed() returns."""
+
+    __slots__ = ('_func', '_value', '_valid', '_dependencies', '_targets',
+                 '_scheduled', '_stack_info', 'computations')
+
+    def __init__(self, func, stack_info):
+        self._func = func
+        self._value = None
+        self._valid = False
+        self._dependencies = set()
+        self._targets = []      # [(object, property name), ...]
+        self._scheduled = False
+        self._stack_info = stack_info
+        # The number of times func has been called. This is useful for
+        # checking that things aren't calculated too often.
+        self.computations = 0
+
+    def __repr__(self):
+        return '<BananaGUI computed value of %r, %d dependencies>' % (
+            self._func, len(self._dependencies))
+
+    @property
+    def value(self):
+        """The return value of the function.
+
+        The function is called only if one of the properties it read
+        last time has changed after that.
+        """
+        if not self._valid:
+            self._compute()
+        tracking = _state.tracking
+        if tracking:
+            # Another computed value is being calculated, and it
+            # depends on everything that this depends on.
+            with _dependents_lock:
+                tracking[-1].update(self._dependencies)
+        return self._value
+
+    def bind(self, obj, property_name):
+        """Set ``obj.property_name`` to the value when it changes.
+
+        The property is set right away, and after that, it's set when
+        the GUI toolkit has handled the events that are currently
+        waiting. It's set only once even if many dependencies changed.
+        """
+        setattr(obj, property_name, self.value)
+        self._targets.append((obj, property_name))
+
+    def unbind(self, obj, property_name):
+        """Undo a bind() call."""
+        for index, (target, name) in enumerate(self._targets):
+            if target is obj and name == property_name:
+                del self._targets[index]
+                return
+        raise ValueError("%r is not bound to %r" % (self, property_name))
+
+    def stop(self):
+        """Stop tracking the properties that the function reads.
+
+        Computed values are stored with the objects that they depend on,
+        so they stay alive until this is called, or the objects are
+        destroyed or garbage collected. The objects are not kept alive
+        by the computed values. This also undoes all bind() calls, and
+        the function is called again when the value is needed.
+        """
+        self._forget_dependencies()
+        self._targets.clear()
+        self._valid = False
+
+    def _forget_dependencies(self):
+        with _dependents_lock:
+            for ref, name in self._dependencies:
+                obj = ref()
+                if obj is None:
+                    # The WeakKeyDictionary has forgotten it already.
+                    continue
+                properties = _dependents[obj]
+                computed_values = properties[name]
+                computed_values.remove(self)
+                if not computed_values:
+                    del properties[name]
+                    if not properties:
+                        del _dependents[obj]
+            self._dependencies = set()
+
+    def _compute(self):
+        self._forget_dependencies()
+        dependencies = set()
+        _state.tracking.append(dependencies)
+        try:
+            self.computations += 1
+            self._value = self._func()
+            self._valid = True
+        finally:
+            _state.tracking.pop()
+            # The dependencies are tracked even if the function raised
+            # an exception, so it's called again when they change.
+            with _dependents_lock:
+                self._dependencies = dependencies
+                for ref, name in dependencies:
+                    obj = ref()
+                    if obj is not None:
+                        properties = _dependents.setdefault(obj, {})
+                        properties.setdefault(name, []).append(self)
+
+    def _invalidate(self):
+        self._valid = False
+        if self._targets and not self._scheduled:
+            self._scheduled = True
+            mainloop._call_soon(self._push)
+
+    def _push(self):
+        self._scheduled = False
+        if self._targets:
+            # If someone used the value before this ran, it's not
+            # calculated again.
+            _call(self._set_targets, (), self._stack_info)
+
+    def _set_targets(self):
+        value = self.value
+        for obj, property_name in self._targets.copy():
+            setattr(obj, property_name, value)
+
+
+def computed(func):
+    """Create a value that is calculated from properties.
+
+    The function is called without arguments, and BananaGUI keeps track
+    of the properties that it reads. The return value is cached, and the
+    function is called again only when one of those properties has
+    changed and the value is needed. It can be used as a decorator.
+
+    >>> class Wrapper:
+    ...     def set_number(self, number):
+    ...         pass
+    ...
+    >>> @add_property('number', type=int)
+    ... class Thing:
+    ...     def __init__(self, number):
+    ...         self._wrapper = Wrapper()
+    ...         self._prop_number = number
+    ...
+    >>> things = [Thing(1), Thing(2), Thing(3)]
+    >>> @computed
+    ... def total():
+    ...     print("calculating")
+    ...     return sum(thing.number for thing in things)
+    ...
+    >>> total.value
+    calculating
+    6
+    >>> total.value
+    6
+    >>> things[0].number = 10
+    >>> total.value
+    calculating
+    15
+    >>>
+
+    Use the ``bind(obj, property_name)`` method of the returned object
+    to set another property to the value when it changes, e.g.
+    ``total.bind(some_label, 'text')`` if the function returns a
+    string. The value is calculated only once per main loop iteration,
+    no matter how many properties change. Exceptions raised by the
+    function are printed to sys.stderr when setting bound properties,
+    and the properties are left as is.
+    """
+    stack_info = traceback.format_stack()[-2]
+    return _Computed(func, stack_info)
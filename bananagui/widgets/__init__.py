@@ -16,11 +16,12 @@ def _fix_modulenames():
     return result
 
 
-from .basewidgets import Widget, Child
+from .basewidgets import Widget, Child, detached
 from .buttons import Button, ImageButton
 from .labels import Label, ImageLabel
 from .misc import Checkbox, Dummy, Separator
 from .parents import Parent, Bin, Box, Scroller, Group
+from .pool import Pool
 from .progress import Progressbar, BouncingProgressbar
 from .ranged import Slider, Spinbox
 from .textwidgets import TextBase, Entry, TextEdit
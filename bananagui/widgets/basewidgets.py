@@ -1,4 +1,133 @@
-from bananagui import mainloop, types
+import contextlib
+
+from bananagui import _get_wrapper, binding, mainloop, types
+
+
+# Slots that clone() doesn't copy. The children of Bin and Box are
+# handled separately.
+_not_cloned = {'_wrapper', '_callbacks', '_parent', '_attached',
+               '_allocation', '_Bin__child', '_Box__children',
+               '__weakref__'}
+
+# {widget class: (slots to copy, settable property names), ...}
+# bananagui.snapshot also uses these.
+_clone_templates = {}
+
+# {widget class: {property name: default value, ...}, ...}
+# These are recorded when the first widget of each class is created.
+# Cloned widgets don't need to pass default values to their wrappers
+# because the wrappers have them already.
+_defaults = {}
+
+
+def _do_nothing(*args, **kwargs):
+    pass
+
+
+class _Detached:
+    """The _wrapper of widgets created in detached().
+
+    All methods of this do nothing. The real wrapper is created when
+    the widget is added to a widget that isn't detached.
+    """
+
+    __slots__ = ()
+    widget = None
+
+    def __getattr__(self, name):
+        return _do_nothing
+
+
+_DETACHED = _Detached()
+
+
+@contextlib.contextmanager
+def detached():
+    """A context manager for creating widgets without the GUI toolkit.
+
+    Widgets created in a ``with detached():`` block are *detached*.
+    BananaGUI keeps track of their properties and children as usual,
+    but the GUI toolkit's widgets are created later, all at once, when
+    the detached widget is added to a parent widget that is not
+    detached. Most GUI toolkits can't be used from other threads, but
+    this can be used in a worker thread for building big widget trees
+    without blocking the GUI::
+
+        def build_panel(data):
+            # this runs in a worker thread
+            with widgets.detached():
+                box = widgets.Box()
+                for item in data:
+                    box.append(widgets.Label(item))
+            return box
+
+        # and this runs in the GUI thread when build_panel() is done
+        window.add(box)
+
+    :mod:`bananagui.iniloader` and :mod:`bananagui.binding` can also be
+    used in the block. Bound properties are updated right away when a
+    detached widget changes, because there's no main loop iteration to
+    wait for.
+
+    Windows, dialogs and images can't be created in the block, and
+    widgets that are not detached must not be used in it, except that
+    they can be added to detached widgets. Detached widgets can't be
+    added to widgets that aren't detached in the block. Widgets created
+    in other threads must not be used in the GUI thread before the
+    ``with`` block is done.
+    """
+    state = mainloop._detached
+    depth = getattr(state, 'depth', 0)
+    if depth == 0:
+        state.soon = []
+    state.depth = depth + 1
+    try:
+        yield
+    finally:
+        try:
+            if depth == 0:
+                mainloop._run_detached_soon()
+        finally:
+            state.depth = depth
+
+
+def _get_clone_template(cls):
+    try:
+        return _clone_templates[cls]
+    except KeyError:
+        pass
+
+    slots = []
+    properties = []
+    for klass in reversed(cls.__mro__):
+        for name in klass.__dict__.get('__slots__', ()):
+            if name.startswith('__') and not name.endswith('__'):
+                # Python mangles private names.
+                name = '_%s%s' % (klass.__name__.lstrip('_'), name)
+            if name in _not_cloned:
+                continue
+            slots.append(name)
+            if name.startswith('_prop_'):
+                prop = getattr(cls, name[len('_prop_'):], None)
+                if isinstance(prop, property) and prop.fset is not None:
+                    properties.append(name[len('_prop_'):])
+
+    result = _clone_templates[cls] = (slots, properties)
+    return result
+
+
+def _record_defaults(widget):
+    # This runs in Widget.__init__, before subclasses have set any
+    # properties.
+    cls = type(widget)
+    slots, properties = _get_clone_template(cls)
+    defaults = _defaults[cls] = {}
+    for name in properties:
+        if name not in cls._varying_defaults:
+            try:
+                defaults[name] = getattr(widget, '_prop_' + name)
+            except AttributeError:
+                pass
 
 
 class Widget:
@@ -8,8 +137,24 @@ class Widget:
     that this class has.
     """
 
+    # Widgets don't have a __dict__ because there may be lots of them.
+    # Subclasses must define __slots__ too, or their instances get a
+    # __dict__ anyway. The attributes of Child are here because some
+    # widgets inherit from both Bin and Child, and Python doesn't allow
+    # inheriting from two classes that both add slots.
+    __slots__ = ('_wrapper', '_callbacks', '_parent', '_attached',
+                 '_allocation', '_name', '_prop_tooltip',
+                 '_prop_grayed_out', '_prop_expand', '__weakref__')
+
     can_focus = False
 
+    # Window sets this to True. See _prepare_add in parents.py.
+    _has_index = False
+
+    # Names of properties that don't have the same default value in
+    # all instances of the class.
+    _varying_defaults = ()
+
     # This is in __new__ because it runs before __init__.
     def __new__(cls, *args, **kwargs):
         if not mainloop._initialized:
@@ -17,8 +162,12 @@ class Widget:
                              "the main loop")
         return super(Widget, cls).__new__(cls)
 
-    def __init__(self):
+    def __init__(self, *, name=None):
         """Initialize the widget."""
+        self._name = None
+        self.name = name
+        if type(self) not in _defaults:
+            _record_defaults(self)
         if not hasattr(self, '_wrapper'):
             # A subclass didn't override this and define a _wrapper.
             cls = type(self)
@@ -49,9 +198,78 @@ class Widget:
         """
         return []
 
+    @property
+    def name(self):
+        """A string for finding the widget with :meth:`.Window.find`, or None.
+
+        Names don't need to be unique. :mod:`bananagui.iniloader` sets
+        the names of the widgets it creates to their section names.
+        """
+        return self._name
+
+    @name.setter
+    def name(self, name):
+        if name is not None and not isinstance(name, str):
+            raise TypeError("name needs to be a string or None, not %r"
+                            % (name,))
+        if name == self._name:
+            return
+        root = self.root_window()
+        if root is not None and root is not self:
+            root._unindex(self)
+            self._name = name
+            root._index(self)
+        else:
+            self._name = name
+
+    def ancestors(self):
+        """Return an iterator of the widgets that this widget is in.
+
+        The iterator yields the parent widget first, then its parent
+        and so on. It's empty if this widget is not in a parent widget.
+        """
+        widget = self
+        # Only Child widgets have an _attached attribute, and _parent
+        # is left as is when the child is removed from it.
+        while getattr(widget, '_attached', False):
+            widget = widget._parent
+            yield widget
+
+    def root_window(self):
+        """Return the :class:`.Window` that this widget is in, or None.
+
+        Calling this on a Window returns the Window itself.
+        """
+        root = self
+        for root in self.ancestors():
+            pass
+        # The import is here to avoid a circular import.
+        from .window import Window
+        if isinstance(root, Window):
+            return root
+        return None
+
+    @property
+    def depth(self):
+        """The number of widgets that this widget is in.
+
+        This is 0 for windows and widgets that are not in a parent
+        widget, 1 for widgets in them and so on.
+        """
+        result = 0
+        for ancestor in self.ancestors():
+            result += 1
+        return result
+
     @property
     def real_widget(self):
-        """This is the real GUI toolkit's widget that BananaGUI uses."""
+        """This is the real GUI toolkit's widget that BananaGUI uses.
+
+        Some wrappers send changes to the GUI toolkit later in bigger
+        batches, but the changes are sent before this returns, so the
+        real widget is always up to date.
+        """
+        _get_wrapper('mainloop:flush')()
         return self._wrapper.widget
 
     def focus(self):
@@ -72,6 +290,149 @@ class Widget:
                             % (cls.__module__, cls.__name__))
         self._wrapper.focus()
 
+    def clone(self, *, callbacks=False):
+        """Create a new widget that looks like this widget.
+
+        The new widget has the same property values as this widget, but
+        it's not in a parent widget. This is faster than creating a new
+        widget and setting the properties because the values have been
+        checked already and the widget's ``__init__`` doesn't run.
+
+        If *callbacks* is True, functions connected to this widget's
+        callbacks are also connected to the new widget's callbacks.
+
+        .. seealso:: :meth:`.Parent.clone`
+        """
+        return self._clone(callbacks)
+
+    def _clone(self, callbacks):
+        """Clone this widget without children."""
+        slots, properties = _get_clone_template(type(self))
+        result = type(self)._restore([getattr(self, name) for name in slots])
+        if callbacks:
+            types._copy_callbacks(self, result)
+        return result
+
+    @classmethod
+    def _restore(cls, values):
+        """Create a widget from values of the slots that clone() copies.
+
+        The values are not checked, and __init__ doesn't run.
+        """
+        slots, properties = _get_clone_template(cls)
+        result = cls.__new__(cls)
+        for name, value in zip(slots, values):
+            setattr(result, name, value)
+        result._init_restored()
+        result._init_wrapper()
+        if result._wrapper is not _DETACHED:
+            result._push_properties()
+        return result
+
+    def _init_restored(self):
+        """Set the attributes that _restore() doesn't set."""
+
+    def _init_wrapper(self):
+        """Set self._wrapper in __init__ or _restore().
+
+        Subclasses that create their wrapper in another way should
+        raise an error in detached().
+        """
+        if mainloop._is_detached():
+            self._wrapper = _DETACHED
+        else:
+            self._create_wrapper()
+
+    def _create_wrapper(self):
+        wrapperclass = _get_wrapper(self._wrapper_name)
+        self._wrapper = wrapperclass(self, *self._wrapper_args())
+
+    def _push_properties(self):
+        """Give property values to a new wrapper.
+
+        Values that the wrapper has by default are not given to it.
+        """
+        cls = type(self)
+        slots, properties = _get_clone_template(cls)
+        defaults = _defaults.get(cls, {})
+        wrapper = self._wrapper
+        for name in properties:
+            value = getattr(self, '_prop_' + name)
+            # None is the default of all properties that allow None.
+            if value is None or (name in defaults and
+                                 defaults[name] == value):
+                continue
+            getattr(wrapper, 'set_' + name)(value)
+
+    def _get_default(self, name):
+        """Return the value that a property has in a new widget.
+
+        Values given to __init__ are not taken into account. KeyError is
+        raised if the default is not known.
+        """
+        if name in self._varying_defaults:
+            return self._get_varying_default(name)
+        if name == 'name':
+            # It's not a _prop_ attribute, so it's not recorded.
+            return None
+        return _defaults[type(self)][name]
+
+    def _get_varying_default(self, name):
+        """Like _get_default(), but for names in _varying_defaults."""
+        raise NotImplementedError
+
+    def _wrapper_args(self):
+        """Return the arguments that the wrapper class was called with.
+
+        The first argument, the BananaGUI widget, is not included.
+        """
+        return ()
+
+    def destroy(self):
+        """Free the GUI toolkit's resources that this widget uses.
+
+        If the widget is in a parent widget, it's removed from the
+        parent first. All callbacks of the widget are disconnected, and
+        the widget must not be used after destroying it.
+
+        Long-running programs that create and throw away lots of
+        widgets should destroy them when they are no longer needed.
+        Otherwise the GUI toolkit may keep them in memory forever, even
+        after removing them from their parent widgets.
+
+        .. seealso:: :meth:`.Parent.destroy`
+        """
+        self._detach()
+        self._release()
+
+    def _detach(self):
+        # Only Child widgets have this attribute.
+        if getattr(self, '_attached', False):
+            self._parent.remove(self)
+
+    def _release(self):
+        """Release this widget's resources, but not its children's."""
+        self._wrapper.destroy()
+        self._disconnect_all()
+
+    def _disconnect_all(self):
+        """Forget everything connected to the widget.
+
+        This disconnects callbacks, unbinds bindings and forgets the
+        widget in computed values. Pool.release() also uses this.
+        """
+        # Unbinding disconnects from the callbacks, so it must be done
+        # first.
+        binding._forget(self)
+        types._forget_dependents(self)
+        try:
+            callbacks = self._callbacks
+        except AttributeError:
+            return
+        for callback in callbacks.values():
+            callback._clear()
+        del self._callbacks
+
 
 @types.add_property(
     'tooltip', type=str, allow_none=True,
@@ -127,6 +488,14 @@ class Widget:
        |  widget  |  widget  |                          |
        `------------------------------------------------'
     """)
+@types.add_callback(
+    'on_allocation_changed',
+    doc="""This callback is ran when :attr:`~allocation` changes.
+
+    This may run many times in a row when the user resizes a window, so
+    it's recommended to connect with ``coalesce=True`` if the function
+    does something slow.
+    """)
 class Child(Widget):
     """Base class for widgets that can be added to :class:`.Parent` widgets.
 
@@ -143,19 +512,42 @@ class Child(Widget):
        box2.append(label)          # this raises an exception!
     """
 
-    # TODO: cycle handling
-    #   box1 = widgets.Box()
-    #   box2 = widgets.Box()
-    #   box1.append(box2)
-    #   box2.append(box1)   # raise an error with a descriptive message here
+    # See Widget.__slots__.
+    __slots__ = ()
 
-    def __init__(self, tooltip=None, grayed_out=False, expand=(True, True)):
+    def __init__(self, tooltip=None, grayed_out=False, expand=(True, True),
+                 *, name=None):
         """Set arguments as attributes."""
         self._parent = None     # Other files rely on this also.
+        self._attached = False  # True when the widget is in _parent.
+        self._allocation = None
         self._prop_tooltip = None
         self._prop_grayed_out = False
         self._prop_expand = (True, True)
-        super().__init__()
+        super().__init__(name=name)
         self.tooltip = tooltip
         self.grayed_out = grayed_out
         self.expand = expand
+
+    @property
+    def allocation(self):
+        """The ``(x, y, width, height)`` area that the widget is displayed in.
+
+        *x* and *y* are relative to the parent widget's top left corner.
+        This is None if the GUI toolkit hasn't displayed the widget yet.
+        The GUI toolkit tells BananaGUI when this changes, so reading
+        this is fast.
+        """
+        return self._allocation
+
+    def _set_allocation(self, allocation):
+        # The wrappers call this.
+        if allocation != self._allocation:
+            self._allocation = allocation
+            types._run_callback(self, 'on_allocation_changed')
+
+    def _init_restored(self):
+        super()._init_restored()
+        self._parent = None
+        self._attached = False
+        self._allocation = None
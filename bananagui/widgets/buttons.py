@@ -1,4 +1,4 @@
-from bananagui import _get_wrapper, images, types
+from bananagui import images, types
 from .basewidgets import Child
 
 
@@ -20,12 +20,14 @@ class Button(Child):
        `---------------'
     """
 
+    __slots__ = ('_prop_text',)
+    _wrapper_name = 'widgets.buttons:Button'
+
     can_focus = True
 
     def __init__(self, text='', **kwargs):
         self._prop_text = ''
-        wrapperclass = _get_wrapper('widgets.buttons:Button')
-        self._wrapper = wrapperclass(self)
+        self._init_wrapper()
         super().__init__(**kwargs)
         self.text = text
 
@@ -57,12 +59,14 @@ class ImageButton(Child):
        `---------------'
     """
 
+    __slots__ = ('_prop_image',)
+    _wrapper_name = 'widgets.buttons:ImageButton'
+
     can_focus = True
 
     def __init__(self, image=None, **kwargs):
         self._prop_image = None
-        wrapperclass = _get_wrapper('widgets.buttons:ImageButton')
-        self._wrapper = wrapperclass(self)
+        self._init_wrapper()
         super().__init__(**kwargs)
         self.image = image
 
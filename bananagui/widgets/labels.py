@@ -1,4 +1,4 @@
-from bananagui import _get_wrapper, Align, images, types
+from bananagui import Align, images, types
 from .basewidgets import Child
 
 
@@ -22,6 +22,9 @@ class Label(Child):
     """
     # TODO: Add fonts and colors?
 
+    __slots__ = ('_prop_text', '_prop_align')
+    _wrapper_name = 'widgets.labels:Label'
+
     def __init__(self, text='', *, align=Align.CENTER, **kwargs):
         """Initialize the label.
 
@@ -29,8 +32,7 @@ class Label(Child):
         """
         self._prop_text = ''
         self._prop_align = Align.CENTER
-        wrapperclass = _get_wrapper('widgets.labels:Label')
-        self._wrapper = wrapperclass(self)
+        self._init_wrapper()
         super().__init__(**kwargs)
         self.text = text
         self.align = Align(align)
@@ -60,11 +62,13 @@ class ImageLabel(Child):
        `---------------'
     """
 
+    __slots__ = ('_prop_image',)
+    _wrapper_name = 'widgets.labels:ImageLabel'
+
     def __init__(self, image=None, **kwargs):
         """Initialize the image label."""
         self._prop_image = None
-        wrapperclass = _get_wrapper('widgets.labels:ImageLabel')
-        self._wrapper = wrapperclass(self)
+        self._init_wrapper()
         super().__init__(**kwargs)
         self.image = image
 
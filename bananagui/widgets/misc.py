@@ -1,4 +1,4 @@
-from bananagui import _get_wrapper, Orient, types
+from bananagui import Orient, types
 from .basewidgets import Child
 
 # TODO: A RadioButton, or _RadioButton and RadioButtonManager.
@@ -24,14 +24,16 @@ class Checkbox(Child):
     The Checkbox widget has nothing to do with the :class:`.Box` widget.
     """
 
+    __slots__ = ('_prop_text', '_prop_checked')
+    _wrapper_name = 'widgets.misc:Checkbox'
+
     can_focus = True
 
     def __init__(self, text='', *, checked=False, **kwargs):
         """Initialize the checkbox and set arguments as attributes."""
         self._prop_text = ''
         self._prop_checked = False
-        wrapperclass = _get_wrapper('widgets.misc:Checkbox')
-        self._wrapper = wrapperclass(self)
+        self._init_wrapper()
         super().__init__(**kwargs)
         self.text = text
         self.checked = checked
@@ -55,10 +57,12 @@ class Dummy(Child):
     filled with something. See :attr:`.Child.expand` for more info.
     """
 
+    __slots__ = ()
+    _wrapper_name = 'widgets.misc:Dummy'
+
     def __init__(self, **kwargs):
         """Set up the dummy."""
-        wrapperclass = _get_wrapper('widgets.misc:Dummy')
-        self._wrapper = wrapperclass(self)
+        self._init_wrapper()
         super().__init__(**kwargs)
 
 
@@ -77,6 +81,9 @@ class Separator(Child):
     are sometimes useful.
     """
 
+    __slots__ = ('__orient',)
+    _wrapper_name = 'widgets.misc:Separator'
+
     def __init__(self, orient=Orient.HORIZONTAL, **kwargs):
         """Initialize the separator.
 
@@ -88,10 +95,12 @@ class Separator(Child):
             kwargs.setdefault('expand', (True, False))
         if self.__orient == Orient.VERTICAL:
             kwargs.setdefault('expand', (False, True))
-        wrapperclass = _get_wrapper('widgets.misc:Separator')
-        self._wrapper = wrapperclass(self, self.__orient)
+        self._init_wrapper()
         super().__init__(**kwargs)
 
+    def _wrapper_args(self):
+        return (self.__orient,)
+
     def _repr_parts(self):
         parts = super()._repr_parts()
         if self.orient == Orient.VERTICAL:
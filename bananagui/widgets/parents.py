@@ -2,15 +2,38 @@
 
 import collections.abc
 import functools
-
-from bananagui import _get_wrapper, Orient, types, utils
-from .basewidgets import Child, Widget
+import traceback
+
+from bananagui import Orient, mainloop, types, utils
+from .basewidgets import _DETACHED, Child, Widget
+
+
+def _realize(root):
+    """Create the wrappers of a detached widget and its children."""
+    # Widgets that aren't detached can't contain detached widgets, so
+    # there's no need to look inside them. This doesn't use recursion
+    # for the same reason as Parent.destroy().
+    widgets = [root]
+    for widget in widgets:
+        if isinstance(widget, Parent):
+            widgets.extend(child for child in widget.children()
+                           if child._wrapper is _DETACHED)
+    for widget in widgets:
+        widget._create_wrapper()
+        widget._push_properties()
+    # The children are added to their parents before the parents are
+    # added to anything, like in bananagui.snapshot.
+    for widget in reversed(widgets):
+        if isinstance(widget, Parent):
+            widget._add_to_wrapper()
 
 
 # This and Bin aren't based on Child because Window is based on Bin.
 class Parent(Widget):
     """A base class for widgets that contain other widgets."""
 
+    __slots__ = ()
+
     def children(self):
         """Return an iterator of this widget's children.
 
@@ -27,8 +50,16 @@ class Parent(Widget):
 
     def _prepare_add(self, child):
         """Make sure child can be added to self and make it ready for it."""
-        if child in self.children():
+        # This needs to be fast because it runs for each child added to
+        # a Box, so this must not loop over children or descendants.
+        if child._attached and child._parent is self:
             raise ValueError("cannot add the same child twice")
+        root = self
+        for root in self.ancestors():
+            if root is child:
+                break
+        if child is self or root is child:
+            raise ValueError("cannot add %r into itself" % (child,))
         if child._parent is None:
             child._parent = self
         elif child._parent is not self:
@@ -36,11 +67,110 @@ class Parent(Widget):
                 "the child widget has already been in another widget, "
                 "it can't be added to this widget anymore. See "
                 "help('bananagui.widgets.Child').")
+        if child._wrapper is _DETACHED and self._wrapper is not _DETACHED:
+            if mainloop._is_detached():
+                raise RuntimeError(
+                    "detached widgets can't be added to widgets that "
+                    "aren't detached in detached()")
+            _realize(child)
+        child._attached = True
+        if root._has_index:
+            # It's a Window.
+            root._index_tree(child)
 
     def _prepare_remove(self, child):
         """Make sure that a child can be removed from self."""
-        if child not in self.children():
+        if not (child._attached and child._parent is self):
             raise ValueError("cannot remove %r, hasn't been added" % (child,))
+        root = self
+        for root in self.ancestors():
+            pass
+        if root._has_index:
+            root._unindex_tree(child)
+        child._attached = False
+
+    def destroy(self, recursive=True):
+        """Like :meth:`.Widget.destroy`, but also destroy the children.
+
+        The children are destroyed before their parent widgets. If
+        *recursive* is False, the widget must not contain any children.
+        Children that have been removed from this widget can't be used
+        after destroying it because they can't be added to other parent
+        widgets anyway.
+        """
+        if not recursive and any(True for child in self.children()):
+            raise ValueError("cannot destroy %r non-recursively, it "
+                             "contains children" % (self,))
+        self._detach()
+
+        # This doesn't use recursion because recursion would fail with
+        # very deep widget trees. Each child comes after its parent in
+        # this list.
+        widgets = [self]
+        for widget in widgets:
+            if isinstance(widget, Parent):
+                widgets.extend(widget.children())
+        for widget in reversed(widgets):
+            widget._release()
+
+    def clone(self, deep=True, *, callbacks=False):
+        """Like :meth:`.Widget.clone`, but also clone the children.
+
+        If *deep* is False, the new widget doesn't have any children.
+        Otherwise children of children and so on are also cloned.
+        """
+        result = self._clone(callbacks)
+        if deep:
+            # This doesn't use recursion for the same reason as destroy().
+            # Each widget's children are cloned and added in one go.
+            todo = [(self, result)]
+            for old, new in todo:
+                children = []
+                for child in old.children():
+                    new_child = child._clone(callbacks)
+                    children.append(new_child)
+                    if isinstance(child, Parent):
+                        todo.append((child, new_child))
+                new._add_clones(children)
+        return result
+
+    def _descendants(self):
+        """Return a list of the children, their children and so on."""
+        # This doesn't use recursion for the same reason as destroy().
+        result = list(self.children())
+        for widget in result:
+            if isinstance(widget, Parent):
+                result.extend(widget.children())
+        return result
+
+    def _add_clones(self, children):
+        """Add cloned children to a new, empty widget."""
+        raise NotImplementedError("_add_clones() wasn't overrided")
+
+    def _add_to_wrapper(self):
+        """Add the wrappers of all children to a new wrapper."""
+        raise NotImplementedError("_add_to_wrapper() wasn't overrided")
+
+    def delegate(self, callbackname, func, *args):
+        """Call func(widget, *args) when a callback of a child runs.
+
+        This works with children of children and so on, and *widget* is
+        the widget that the callback belongs to. For example, this
+        prints the buttons in a box when they are clicked::
+
+            box.delegate('on_click', print)
+
+        Unlike connecting to each button's ``on_click``, this doesn't
+        need any memory for each button, and it also works with buttons
+        that are added to the box later.
+        """
+        stack_info = traceback.format_stack()[-2]
+        types._get_callback(self, callbackname)._delegate(
+            func, args, stack_info)
+
+    def undelegate(self, callbackname, func):
+        """Undo a :meth:`delegate` call."""
+        types._get_callback(self, callbackname)._undelegate(func)
 
     def _repr_parts(self):
         parts = super()._repr_parts()
@@ -66,6 +196,8 @@ class Bin(Parent):
     more complicated without separate Bin widgets and layout widgets.
     """
 
+    __slots__ = ('__child',)
+
     def __init__(self, child=None, **kwargs):
         """Initialize the widget and add the child if it's given."""
         self.__child = None
@@ -111,6 +243,18 @@ class Bin(Parent):
         self._wrapper.remove(child._wrapper)
         # child._parent is left as is here.
 
+    def _init_restored(self):
+        super()._init_restored()
+        self.__child = None
+
+    def _add_clones(self, children):
+        for child in children:
+            self.add(child)
+
+    def _add_to_wrapper(self):
+        if self.__child is not None:
+            self._wrapper.add(self.__child._wrapper)
+
 
 class Box(collections.abc.MutableSequence, Parent, Child):
     """A widget that contains other widgets next to or above each other.
@@ -149,12 +293,14 @@ class Box(collections.abc.MutableSequence, Parent, Child):
     """
     # The wrapper should define append and remove methods.
 
+    __slots__ = ('__orient', '__children')
+    _wrapper_name = 'widgets.parents:Box'
+
     def __init__(self, orient=Orient.VERTICAL, **kwargs):
         """Initialize the Box."""
         self.__orient = Orient(orient)
         self.__children = []
-        wrapperclass = _get_wrapper('widgets.parents:Box')
-        self._wrapper = wrapperclass(self, self.__orient)
+        self._init_wrapper()
         super().__init__(**kwargs)
 
     @property
@@ -169,6 +315,21 @@ class Box(collections.abc.MutableSequence, Parent, Child):
     def children(self):
         yield from self
 
+    def _init_restored(self):
+        super()._init_restored()
+        self.__children = []
+
+    def _wrapper_args(self):
+        return (self.__orient,)
+
+    def _add_clones(self, children):
+        # This adds all children with one __set_children() call.
+        self[:] = children
+
+    def _add_to_wrapper(self):
+        for child in self.__children:
+            self._wrapper.append(child._wrapper)
+
     def _repr_parts(self):
         parts = super()._repr_parts()
         if self.orient == Orient.HORIZONTAL:
@@ -177,14 +338,39 @@ class Box(collections.abc.MutableSequence, Parent, Child):
         return parts
 
     def __set_children(self, new):
-        # TODO: Maybe the old and new children have something else in
-        # common than the beginning? Optimize this.
-        common = utils.common_beginning(self.__children, new)
-        for child in self.__children[common:]:
-            self._prepare_remove(child)
-            self._wrapper.remove(child._wrapper)
-        del self.__children[common:]
-        for child in new[common:]:
+        # The wrappers can only append and remove children, so the
+        # children that stay in the box must be in the same order in the
+        # beginning of the new children. Everything else is removed and
+        # the rest of the new children are appended. The beginning is
+        # made as long as possible, so e.g. removing a child from the
+        # middle or moving a child to the end doesn't touch the other
+        # children.
+        if new[:len(self.__children)] == self.__children:
+            # Children are only added to the end. This is a lot faster
+            # than common_beginning() because list comparisons are
+            # implemented in C.
+            keep = len(self.__children)
+        else:
+            keep = utils.common_beginning(self.__children, new)
+        if keep < len(self.__children):
+            indexes = {child: index for index, child
+                       in enumerate(self.__children)}
+            previous_index = keep - 1
+            for child in new[keep:]:
+                index = indexes.get(child, -1)
+                if index <= previous_index:
+                    break
+                previous_index = index
+                keep += 1
+
+            kept = set(new[:keep])
+            for child in self.__children:
+                if child not in kept:
+                    self._prepare_remove(child)
+                    self._wrapper.remove(child._wrapper)
+            self.__children = new[:keep]
+
+        for child in new[keep:]:
             self._prepare_add(child)
             self._wrapper.append(child._wrapper)
             self.__children.append(child)
@@ -239,10 +425,12 @@ class Scroller(Bin, Child):
     .. note:: This widget is currently not available on Tkinter.
     """
 
+    __slots__ = ()
+    _wrapper_name = 'widgets.parents:Scroller'
+
     def __init__(self, child=None, **kwargs):
         """Initialize the scroller."""
-        wrapperclass = _get_wrapper('widgets.parents:Scroller')
-        self._wrapper = wrapperclass(self)
+        self._init_wrapper()
         super().__init__(child, **kwargs)
 
 
@@ -261,10 +449,12 @@ class Group(Bin, Child):
        `-------------------'
     """
 
+    __slots__ = ('_prop_text',)
+    _wrapper_name = 'widgets.parents:Group'
+
     def __init__(self, text='', child=None, **kwargs):
         """Initialize the Group widget."""
-        wrapperclass = _get_wrapper('widgets.parents:Group')
-        self._wrapper = wrapperclass(self)
+        self._init_wrapper()
         self._prop_text = ''
         super().__init__(child, **kwargs)
         self.text = text
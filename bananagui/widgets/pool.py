@@ -0,0 +1,150 @@
+from .basewidgets import Child
+from .parents import Parent
+
+
+class Pool:
+    """Reuse widgets instead of creating new widgets all the time.
+
+    Creating widgets is slow with some GUI toolkits, so programs that
+    throw away lots of widgets and create similar widgets again can use
+    a pool. The pool keeps widgets that are no longer needed, and gives
+    them out again when new widgets are needed. For example::
+
+        pool = widgets.Pool(box, widgets.Label)
+
+        def show_lines(lines):
+            old_labels = box[:]
+            del box[:]
+            for label in old_labels:
+                pool.release(label)
+            for line in lines:
+                box.append(pool.acquire(text=line))
+
+    The widgets are created with ``widgetclass(*args)``. A child widget
+    can't be added to different parent widgets, so the widgets must be
+    added to *parent*. Parent widgets can't be pooled.
+
+    At most *maxsize* widgets are kept in the pool, and :meth:`release`
+    destroys the widget if the pool is full. None means no limit.
+
+    The pool has these attributes for finding out how well it works:
+
+    .. attribute:: hits
+
+        The number of times :meth:`acquire` reused a widget.
+
+    .. attribute:: misses
+
+        The number of times :meth:`acquire` created a new widget.
+
+    .. attribute:: discarded
+
+        The number of widgets that :meth:`release` destroyed because
+        the pool was full.
+    """
+
+    def __init__(self, parent: Parent, widgetclass, *args, maxsize=None):
+        if not issubclass(widgetclass, Child):
+            raise TypeError("cannot pool %s widgets, only Child widgets "
+                            "can be pooled" % widgetclass.__name__)
+        if issubclass(widgetclass, Parent):
+            raise TypeError("cannot pool %s widgets because they are "
+                            "Parent widgets" % widgetclass.__name__)
+        self.parent = parent
+        self.widgetclass = widgetclass
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.discarded = 0
+        self._args = args
+        # A dictionary is a set that pops the last added item like a
+        # stack, and doesn't reorder the widgets.
+        self._widgets = {}
+
+        self._properties = set()
+        for name in dir(widgetclass):
+            value = getattr(widgetclass, name)
+            if isinstance(value, property) and value.fset is not None:
+                self._properties.add(name)
+        self._defaults = None   # Set when the first widget is created.
+
+    def __repr__(self):
+        return '<%s.%s of %s widgets, %d pooled>' % (
+            type(self).__module__, type(self).__name__,
+            self.widgetclass.__name__, len(self))
+
+    def __len__(self):
+        """Return the number of widgets in the pool."""
+        return len(self._widgets)
+
+    @property
+    def hit_rate(self):
+        """The fraction of :meth:`acquire` calls that reused a widget.
+
+        This is between 0 and 1, or 0 if acquire() hasn't been called.
+        """
+        calls = self.hits + self.misses
+        if calls == 0:
+            return 0.0
+        return self.hits / calls
+
+    def acquire(self, **properties):
+        """Return a widget from the pool or create a new widget.
+
+        The properties of the widget are set from the keyword arguments.
+        Properties that are not given are set to the same values as in
+        a new widget.
+        """
+        for name in properties:
+            if name not in self._properties:
+                raise TypeError("%s widgets don't have a settable %r "
+                                "property" % (self.widgetclass.__name__, name))
+
+        if self._widgets:
+            widget, junk = self._widgets.popitem()
+            self.hits += 1
+            for name, default in self._defaults.items():
+                setattr(widget, name, properties.get(name, default))
+            return widget
+
+        widget = self.widgetclass(*self._args)
+        self.misses += 1
+        if self._defaults is None:
+            self._defaults = {name: getattr(widget, name)
+                              for name in self._properties}
+        for name, value in properties.items():
+            setattr(widget, name, value)
+        return widget
+
+    def release(self, widget):
+        """Put a widget back to the pool.
+
+        The widget is removed from its parent widget if needed, all
+        functions connected to its callbacks are disconnected, it's
+        unbound from :mod:`bananagui.binding` bindings and computed
+        values forget it. Functions passed to
+        :meth:`~.Parent.delegate` or ``connect_all()`` are not
+        affected, so they are handy with pooled widgets.
+        """
+        if type(widget) is not self.widgetclass:
+            raise TypeError("expected a %s widget, got %r"
+                            % (self.widgetclass.__name__, widget))
+        if widget._parent not in (None, self.parent):
+            raise ValueError("%r has been added to a different parent "
+                             "widget" % (widget,))
+        if widget in self._widgets:
+            raise ValueError("%r has already been released" % (widget,))
+
+        widget._detach()
+        widget._disconnect_all()
+        if self.maxsize is not None and len(self._widgets) >= self.maxsize:
+            widget.destroy()
+            self.discarded += 1
+        else:
+            self._widgets[widget] = None
+
+    def clear(self):
+        """Destroy all widgets in the pool."""
+        while self._widgets:
+            widget, junk = self._widgets.popitem()
+            widget.destroy()
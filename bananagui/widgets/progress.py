@@ -1,4 +1,4 @@
-from bananagui import _get_wrapper, types
+from bananagui import types
 from .basewidgets import Child
 
 
@@ -21,11 +21,13 @@ class Progressbar(Child):
     vertical progress bar and I'll implement it.
     """
 
+    __slots__ = ('_prop_progress',)
+    _wrapper_name = 'widgets.progress:Progressbar'
+
     def __init__(self, *, progress=0, **kwargs):
         """Initialize the progress bar."""
         self._prop_progress = 0
-        wrapperclass = _get_wrapper('widgets.progress:Progressbar')
-        self._wrapper = wrapperclass(self)
+        self._init_wrapper()
         super().__init__(**kwargs)
         self.progress = progress
 
@@ -48,11 +50,13 @@ class BouncingProgressbar(Child):
     True to make it bounce.
     """
 
+    __slots__ = ('_prop_bouncing',)
+    _wrapper_name = 'widgets.progress:BouncingProgressbar'
+
     def __init__(self, *, bouncing=False, **kwargs):
         """Initialize the widget."""
         self._prop_bouncing = False
-        wrapperclass = _get_wrapper('widgets.progress:BouncingProgressbar')
-        self._wrapper = wrapperclass(self)
+        self._init_wrapper()
         super().__init__(**kwargs)
         self.bouncing = bouncing
 
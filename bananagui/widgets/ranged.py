@@ -1,4 +1,4 @@
-from bananagui import _get_wrapper, Orient, types
+from bananagui import Orient, types
 from .basewidgets import Child
 
 
@@ -21,6 +21,11 @@ class _Ranged:
     # set the _valuerange attribute to it and set the _value attribute
     # to min() of that range.
 
+    __slots__ = ()
+
+    # The default value is min(valuerange).
+    _varying_defaults = ('value',)
+
     def __init__(self, *args, **kwargs):
         if len(self.valuerange) < 2:
             raise ValueError("valuerange %r contains too little values"
@@ -34,6 +39,10 @@ class _Ranged:
         """The range of allowed values set on initialization."""
         return self._prop_valuerange
 
+    def _get_varying_default(self, name):
+        assert name == 'value'
+        return min(self.valuerange)
+
     def _repr_parts(self):
         return [
             'value=' + repr(self.value),
@@ -58,18 +67,23 @@ class Spinbox(_Ranged, Child):
     you want to use floats.
     """
 
+    __slots__ = ('_prop_valuerange', '_prop_value')
+    _wrapper_name = 'widgets.ranged:Spinbox'
+
     can_focus = True
 
     def __init__(self, valuerange: range, *, value=None, **kwargs):
         """Initialize the spinbox."""
         self._prop_valuerange = valuerange
         self._prop_value = min(valuerange)
-        wrapperclass = _get_wrapper('widgets.ranged:Spinbox')
-        self._wrapper = wrapperclass(self, valuerange)
+        self._init_wrapper()
         super().__init__(**kwargs)
         if value is not None:
             self.value = value
 
+    def _wrapper_args(self):
+        return (self._prop_valuerange,)
+
 
 class Slider(_Ranged, Child):
     """A slider for selecting a number.
@@ -86,18 +100,23 @@ class Slider(_Ranged, Child):
     me know and I'll implement it.
     """
 
+    __slots__ = ('_prop_valuerange', '_prop_value', '__orient')
+    _wrapper_name = 'widgets.ranged:Slider'
+
     def __init__(self, valuerange: range, orient=Orient.HORIZONTAL, *,
                  value=None, **kwargs):
         """Initialize the slider."""
         self.__orient = Orient(orient)
         self._prop_valuerange = valuerange
         self._prop_value = min(valuerange)
-        wrapperclass = _get_wrapper('widgets.ranged:Slider')
-        self._wrapper = wrapperclass(self, self.__orient, valuerange)
+        self._init_wrapper()
         super().__init__(**kwargs)
         if value is not None:
             self.value = value
 
+    def _wrapper_args(self):
+        return (self.__orient, self._prop_valuerange)
+
     @property
     def orient(self):
         """The orientation of the slider.
@@ -1,4 +1,4 @@
-from bananagui import _get_wrapper, types
+from bananagui import types
 from .basewidgets import Child
 
 
@@ -13,6 +13,8 @@ class TextBase(Child):
     """
     # TODO: Add fonts and colors.
 
+    __slots__ = ('_prop_text',)
+
     can_focus = True
 
     def __init__(self, text='', **kwargs):
@@ -44,11 +46,13 @@ class Entry(TextBase):
     .. seealso:: `Number selecting widgets`_.
     """
 
+    __slots__ = ('_prop_secret',)
+    _wrapper_name = 'widgets.textwidgets:Entry'
+
     def __init__(self, text='', *, secret=False, **kwargs):
         """Initialize the entry."""
         self._prop_secret = False
-        wrapperclass = _get_wrapper('widgets.textwidgets:Entry')
-        self._wrapper = wrapperclass(self)
+        self._init_wrapper()
         super().__init__(text=text, **kwargs)
         self.secret = secret
 
@@ -82,11 +86,13 @@ class TextEdit(TextBase):
               have a different API, so don't rely on this widget.
     """
 
+    __slots__ = ('_prop_tab',)
+    _wrapper_name = 'widgets.textwidgets:TextEdit'
+
     def __init__(self, text='', *, tab='\t', **kwargs):
         """Initialize the TextEdit."""
         self._prop_tab = '\t'
-        wrapperclass = _get_wrapper('widgets.textwidgets:TextEdit')
-        self._wrapper = wrapperclass(self)
+        self._init_wrapper()
         super().__init__(text=text, **kwargs)
         self.tab = tab
 
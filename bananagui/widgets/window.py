@@ -1,5 +1,5 @@
-from bananagui import _get_wrapper, types
-from .parents import Bin
+from bananagui import _get_wrapper, mainloop, types
+from .parents import Bin, Parent
 
 
 def _closecheck(window, junk=None):
@@ -98,21 +98,33 @@ class Window(Bin):
 
     # TODO: window icon?
 
+    __slots__ = ('_prop_title', '_prop_resizable', '_prop_size',
+                 '_prop_minimum_size', '_prop_hidden', '__closed',
+                 '__names', '__classes')
+    _wrapper_name = 'widgets.window:Window'
+
     can_focus = True
+    _has_index = True
 
     def __init__(self, title="BananaGUI Window", *, child=None,
                  resizable=True, minimum_size=(0, 0), hidden=False,
                  **kwargs):
+        if mainloop._is_detached():
+            raise RuntimeError("windows can't be created in detached()")
         self._prop_title = title
         self._prop_resizable = True
         self._prop_size = (200, 200)
         self._prop_minimum_size = (0, 0)
         self._prop_hidden = False
         self.__closed = False
+        # These are {name or class: {widget: None, ...}, ...} dicts. The
+        # inner dicts are used as ordered sets.
+        self.__names = {}
+        self.__classes = {}
         if not isinstance(self, Dialog):
             # Dialogs have a separate wrapper class, so we don't want to
             # add the non-Dialog wrapper here.
-            wrapperclass = _get_wrapper('widgets.window:Window')
+            wrapperclass = _get_wrapper(self._wrapper_name)
             self._wrapper = wrapperclass(self, title)
         super().__init__(child, **kwargs)
         self.resizable = resizable
@@ -132,6 +144,13 @@ class Window(Bin):
             self._wrapper.close()
             self.__closed = True
 
+    def _release(self):
+        self.close()
+        super()._release()
+
+    def _clone(self, callbacks):
+        raise TypeError("cannot clone %s widgets" % type(self).__name__)
+
     @property
     def closed(self):
         """True if :meth:`close` has been called."""
@@ -152,6 +171,70 @@ class Window(Bin):
         _closecheck(self)
         self._wrapper.wait()
 
+    # The parent widgets call these when widgets are added and removed,
+    # so finding widgets doesn't need to look at every widget in the
+    # window.
+    def _index(self, widget):
+        if widget._name is not None:
+            self.__names.setdefault(widget._name, {})[widget] = None
+        self.__classes.setdefault(type(widget), {})[widget] = None
+
+    def _unindex(self, widget):
+        if widget._name is not None:
+            widgetset = self.__names[widget._name]
+            del widgetset[widget]
+            if not widgetset:
+                del self.__names[widget._name]
+        widgetset = self.__classes[type(widget)]
+        del widgetset[widget]
+        if not widgetset:
+            del self.__classes[type(widget)]
+
+    def _index_tree(self, child):
+        self._index(child)
+        if isinstance(child, Parent):
+            for widget in child._descendants():
+                self._index(widget)
+
+    def _unindex_tree(self, child):
+        self._unindex(child)
+        if isinstance(child, Parent):
+            for widget in child._descendants():
+                self._unindex(widget)
+
+    def find_all(self, query, *, within=None):
+        """Return a list of widgets in this window that match a query.
+
+        The *query* can be a :attr:`~.Widget.name` string, a widget
+        class or a tuple of widget classes. For example,
+        ``window.find_all(widgets.Entry)`` returns all Entry widgets in
+        the window, including widgets in other widgets in the window.
+        If *within* is given, only widgets in it are returned.
+
+        This doesn't look at every widget in the window because the
+        window keeps track of the names and classes of its widgets, so
+        this is fast even with big windows.
+        """
+        return list(self._find(query, within))
+
+    def find(self, query, *, within=None):
+        """Like :meth:`find_all`, but return one widget or None.
+
+        If many widgets match the query, any one of them is returned.
+        """
+        return next(self._find(query, within), None)
+
+    def _find(self, query, within):
+        if isinstance(query, str):
+            matches = self.__names.get(query, ())
+        else:
+            matches = (widget for cls, widgetset in self.__classes.items()
+                       if issubclass(cls, query) for widget in widgetset)
+        for widget in matches:
+            if within is None or any(ancestor is within
+                                     for ancestor in widget.ancestors()):
+                yield widget
+
 
 class Dialog(Window):
     """A window that has a parent window.
@@ -181,12 +264,17 @@ class Dialog(Window):
     *parentwindow*'s title.
     """
 
+    __slots__ = ('__parentwindow',)
+    _wrapper_name = 'widgets.window:Dialog'
+
     def __init__(self, parentwindow: Window, title=None, *,
                  resizable=False, **kwargs):
         """Initialize the dialog."""
+        if mainloop._is_detached():
+            raise RuntimeError("dialogs can't be created in detached()")
         if title is None:
             title = parentwindow.title
-        wrapperclass = _get_wrapper('widgets.window:Dialog')
+        wrapperclass = _get_wrapper(self._wrapper_name)
         self._wrapper = wrapperclass(self, parentwindow._wrapper, title)
         self.__parentwindow = parentwindow
         super().__init__(title, resizable=resizable, **kwargs)
@@ -2,6 +2,7 @@ import threading
 import time
 
 _running = False
+_idle = []
 
 
 def init():
@@ -11,9 +12,11 @@ def init():
 def run():
     global _running
     _running = True
+    _run_idle()
     while _running and len(threading.enumerate()) > 1:
         # There's more threads than just the main thread.
         time.sleep(0.2)
+        _run_idle()
 
 
 def quit():
@@ -28,8 +31,21 @@ def _run_callback(sleeptime, func):
             break
 
 
+def _run_idle():
+    while _idle:
+        _idle.pop(0)()
+
+
+def add_idle(callback):
+    _idle.append(callback)
+
+
 def add_timeout(milliseconds, callback):
     thread = threading.Thread(
         target=_run_callback,
         args=[milliseconds / 1000, callback])
     thread.start()
+
+
+def flush():
+    pass
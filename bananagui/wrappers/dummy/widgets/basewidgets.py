@@ -1,15 +1,22 @@
 class Widget:
 
+    __slots__ = ('bananawidget',)
+    widget = None
+
     def __init__(self, bananawidget):
-        self.real_widget = None
         self.bananawidget = bananawidget
 
     def focus(self):
         pass
 
+    def destroy(self):
+        pass
+
 
 class Child(Widget):
 
+    __slots__ = ()
+
     def set_expand(self, expand):
         pass
 
@@ -3,6 +3,8 @@ from .basewidgets import Child
 
 class Button(Child):
 
+    __slots__ = ()
+
     def set_text(self, text):
         pass
 
@@ -3,6 +3,8 @@ from .basewidgets import Child
 
 class Label(Child):
 
+    __slots__ = ()
+
     def set_text(self, text):
         pass
 
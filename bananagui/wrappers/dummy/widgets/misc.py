@@ -3,6 +3,8 @@ from .basewidgets import Child
 
 class Checkbox(Child):
 
+    __slots__ = ()
+
     def set_text(self, text):
         pass
 
@@ -11,11 +13,14 @@ class Checkbox(Child):
 
 
 class Dummy(Child):
-    pass
+
+    __slots__ = ()
 
 
 class Separator(Child):
 
+    __slots__ = ('orientation',)
+
     def __init__(self, bananawidget, orientation):
         self.orientation = orientation
         super().__init__(bananawidget)
@@ -3,6 +3,8 @@ from .basewidgets import Child, Widget
 
 class Bin(Widget):
 
+    __slots__ = ()
+
     def add(self, child):
         pass
 
@@ -12,6 +14,8 @@ class Bin(Widget):
 
 class Box(Child):
 
+    __slots__ = ('orientation',)
+
     def __init__(self, bananawidget, orientation):
         self.orientation = orientation
         super().__init__(bananawidget)
@@ -24,10 +28,13 @@ class Box(Child):
 
 
 class Scroller(Bin, Child):
-    pass
+
+    __slots__ = ()
 
 
 class Group(Bin, Child):
 
+    __slots__ = ()
+
     def set_text(self, text):
         pass
@@ -3,6 +3,8 @@ from .basewidgets import Child
 
 class Progressbar(Child):
 
+    __slots__ = ()
+
     def set_bouncing(self, bouncing):
         pass
 
@@ -3,6 +3,8 @@ from .basewidgets import Child
 
 class Slider(Child):
 
+    __slots__ = ()
+
     def __init__(self, bananawidget, orientation, valuerange):
         super().__init__(bananawidget)
 
@@ -12,6 +14,8 @@ class Slider(Child):
 
 class Spinbox(Child):
 
+    __slots__ = ()
+
     def __init__(self, bananawidget, valuerange):
         super().__init__(bananawidget)
 
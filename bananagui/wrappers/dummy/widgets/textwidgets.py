@@ -3,6 +3,8 @@ from .basewidgets import Child
 
 class Entry(Child):
 
+    __slots__ = ()
+
     def set_text(self, text):
         pass
 
@@ -15,6 +17,8 @@ class Entry(Child):
 
 class TextEdit(Child):
 
+    __slots__ = ()
+
     def set_text(self, text):
         pass
 
@@ -3,6 +3,8 @@ from .parents import Bin
 
 class Window(Bin):
 
+    __slots__ = ()
+
     def __init__(self, bananawidget, title):
         super().__init__(bananawidget)
 
@@ -36,5 +38,7 @@ class Window(Bin):
 
 class Dialog(Window):
 
+    __slots__ = ()
+
     def __init__(self, bananawidget, parentwindow, title):
         super().__init__(bananawidget, title)
@@ -25,3 +25,15 @@ def add_timeout(milliseconds, callback):
         return callback() == bananagui.RUN_AGAIN
 
     GLib.timeout_add(milliseconds, real_callback)
+
+
+def add_idle(callback):
+    def real_callback():
+        callback()
+        return False    # Don't run again.
+
+    GLib.idle_add(real_callback)
+
+
+def flush():
+    pass
@@ -28,15 +28,41 @@ class Widget:
     #        self.__css['background-color'] = color.rgbstring
     #    self.__update_css()
 
+    __slots__ = ('bananawidget', 'widget')
+
     def __init__(self, bananawidget):
         self.bananawidget = bananawidget
 
     def focus(self):
         self.widget.grab_focus()
 
+    def destroy(self):
+        # This also disconnects the signal handlers.
+        self.widget.destroy()
+
 
 class Child(Widget):
 
+    __slots__ = ()
+
+    def __init__(self, bananawidget):
+        # Subclasses create self.widget before calling this.
+        self.widget.connect('size-allocate', self._do_size_allocate)
+        super().__init__(bananawidget)
+
+    def _do_size_allocate(self, widget, allocation):
+        x, y = allocation.x, allocation.y
+        parent = widget.get_parent()
+        if parent is not None and not parent.get_has_window():
+            # The allocation is relative to the nearest parent that has
+            # its own GdkWindow, so we need to make it relative to the
+            # parent.
+            parent_allocation = parent.get_allocation()
+            x -= parent_allocation.x
+            y -= parent_allocation.y
+        self.bananawidget._set_allocation(
+            (x, y, allocation.width, allocation.height))
+
     def set_expand(self, expand):
         h, v = expand
         self.widget.set_hexpand(h)
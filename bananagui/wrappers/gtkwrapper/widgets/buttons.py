@@ -5,6 +5,8 @@ from .basewidgets import Child
 
 class Button(Child):
 
+    __slots__ = ()
+
     def __init__(self, bananawidget):
         self.widget = Gtk.Button()
         self.widget.connect('clicked', self._do_click)
@@ -13,6 +13,8 @@ haligns_and_justifys = {
 
 class Label(Child):
 
+    __slots__ = ()
+
     def __init__(self, bananawidget):
         self.widget = Gtk.Label(justify=Gtk.Justification.CENTER)
         super().__init__(bananawidget)
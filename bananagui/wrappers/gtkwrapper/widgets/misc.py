@@ -6,6 +6,8 @@ from .basewidgets import Child
 
 class Checkbox(Child):
 
+    __slots__ = ()
+
     def __init__(self, bananawidget):
         self.widget = Gtk.CheckButton()
         self.widget.connect('notify::active', self._do_check)
@@ -23,6 +25,8 @@ class Checkbox(Child):
 
 class Dummy(Child):
 
+    __slots__ = ()
+
     def __init__(self, bananawidget):
         self.widget = Gtk.Label()
         super().__init__(bananawidget)
@@ -30,6 +34,8 @@ class Dummy(Child):
 
 class Separator(Child):
 
+    __slots__ = ()
+
     def __init__(self, bananawidget, orientation):
         gtk_orientation = orientations[orientation]
         self.widget = Gtk.Separator(orientation=gtk_orientation)
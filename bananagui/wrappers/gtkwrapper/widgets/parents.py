@@ -7,6 +7,8 @@ from .basewidgets import Child, Widget
 
 class Bin(Widget):
 
+    __slots__ = ()
+
     def add(self, child):
         self.widget.add(child.widget)
         # If this is a GtkScrolledWindow and child doesn't support
@@ -31,6 +33,8 @@ _expand_indexes = {
 
 class Box(Child):
 
+    __slots__ = ()
+
     def __init__(self, bananawidget, orient):
         self.widget = Gtk.Box(orientation=orientations[orient])
         super().__init__(bananawidget)
@@ -49,6 +53,8 @@ class Box(Child):
 
 class Scroller(Bin, Child):
 
+    __slots__ = ()
+
     def __init__(self, bananawidget):
         self.widget = Gtk.ScrolledWindow()
         super().__init__(bananawidget)
@@ -56,6 +62,8 @@ class Scroller(Bin, Child):
 
 class Group(Bin, Child):
 
+    __slots__ = ()
+
     def __init__(self, bananawidget):
         self.widget = Gtk.Frame()
         super().__init__(bananawidget)
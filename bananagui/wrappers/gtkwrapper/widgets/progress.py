@@ -5,6 +5,8 @@ from .basewidgets import Child
 
 class Progressbar(Child):
 
+    __slots__ = ()
+
     def __init__(self, bananawidget):
         self.widget = Gtk.ProgressBar()
         super().__init__(bananawidget)
@@ -15,6 +17,8 @@ class Progressbar(Child):
 
 class BouncingProgressbar(Child):
 
+    __slots__ = ('_bouncing',)
+
     def __init__(self, bananawidget):
         self.widget = Gtk.ProgressBar()
         super().__init__(bananawidget)
@@ -25,6 +29,10 @@ class BouncingProgressbar(Child):
         self.widget.pulse()
         return True     # Run this again.
 
+    def destroy(self):
+        self._bouncing = False    # Stop the timeout.
+        super().destroy()
+
     def set_bouncing(self, bouncing):
         self._bouncing = bouncing
         if bouncing:
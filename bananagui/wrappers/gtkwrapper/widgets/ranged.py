@@ -6,6 +6,8 @@ from .basewidgets import Child
 
 class Slider(Child):
 
+    __slots__ = ()
+
     def __init__(self, bananawidget, orientation, valuerange):
         range_args = (min(valuerange), max(valuerange), valuerange.step)
         self.widget = Gtk.Scale.new_with_range(
@@ -42,6 +44,8 @@ class Slider(Child):
 
 class Spinbox(Child):
 
+    __slots__ = ()
+
     def __init__(self, bananawidget, valuerange):
         range_args = (min(valuerange), max(valuerange), valuerange.step)
         self.widget = Gtk.SpinButton.new_with_range(*range_args)
@@ -5,6 +5,8 @@ from .basewidgets import Child
 
 class Entry(Child):
 
+    __slots__ = ()
+
     def __init__(self, bananawidget):
         self.widget = Gtk.Entry()
         self.widget.connect('changed', self._do_changed)
@@ -30,6 +32,8 @@ class Entry(Child):
 class TextEdit(Child):
     # TODO: tabchar
 
+    __slots__ = ('_textbuf', '_changed_id', '_setting_text')
+
     def __init__(self, bananawidget):
         self.widget = Gtk.TextView()
         self._textbuf = self.widget.get_buffer()
@@ -39,10 +43,15 @@ class TextEdit(Child):
 
     def _do_changed(self, buf):
         self._setting_text = True
-        self.text = buf.get_text(buf.get_start_iter(),
-                                 buf.get_end_iter(), True)
+        self.bananawidget.text = buf.get_text(buf.get_start_iter(),
+                                              buf.get_end_iter(), True)
         self._setting_text = False
 
+    def destroy(self):
+        # The buffer is not destroyed with the TextView.
+        self._textbuf.disconnect(self._changed_id)
+        super().destroy()
+
     def select_all(self):
         self._textbuf.select_range(self._textbuf.get_start_iter(),
                                    self._textbuf.get_end_iter())
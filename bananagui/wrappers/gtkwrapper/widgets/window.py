@@ -6,6 +6,8 @@ from .parents import Bin
 
 class _BaseWindow(Bin):
 
+    __slots__ = ()
+
     def __init__(self, bananawidget):
         self.widget.set_border_width(5)  # Looks nicer.
         self.widget.connect('configure-event', self._do_configure_event)
@@ -53,12 +55,19 @@ class _BaseWindow(Bin):
     def close(self):
         self.widget.destroy()
 
+    def destroy(self):
+        # The BananaGUI Window closes itself before destroying, and
+        # close() has already destroyed the widget.
+        pass
+
     def focus(self):
         self.widget.present()
 
 
 class Window(_BaseWindow):
 
+    __slots__ = ('_waitloop',)
+
     def __init__(self, bananawidget, title):
         self.widget = Gtk.Window(title=title)
         self._waitloop = None
@@ -83,6 +92,8 @@ class Window(_BaseWindow):
 
 class Dialog(_BaseWindow):
 
+    __slots__ = ()
+
     def __init__(self, bananawidget, parentwindow, title):
         self.widget = Gtk.Dialog(
             title=title, transient_for=parentwindow.widget)
@@ -1,3 +1,4 @@
+import sys
 import tkinter as tk
 
 import bananagui
@@ -5,11 +6,81 @@ from bananagui import color
 
 root = None    # Make flake8 happy.
 
+# All BananaGUI child widgets have this binding tag, so events can be
+# bound to all of them with one bind_class() call.
+BINDTAG = 'BananaGUIChild'
+
+# Only widgets that have a tooltip have this binding tag.
+TOOLTIP_BINDTAG = 'BananaGUITooltip'
+
+_TCL_SETUP = r'''
+proc bananagui_run {commands} {
+    # The commands run in the global scope, like tkinter's calls. An
+    # error doesn't stop the rest of the commands from running because
+    # they are often about unrelated widgets. This returns a list of
+    # {command error_message} pairs.
+    set errors {}
+    foreach command $commands {
+        if {[catch {uplevel #0 $command} message]} {
+            lappend errors [list $command $message]
+        }
+    }
+    return $errors
+}
+proc bananagui_add_tag {widget tag} {
+    bindtags $widget [linsert [bindtags $widget] 1 $tag]
+}
+proc bananagui_remove_tag {widget tag} {
+    set tags [bindtags $widget]
+    set index [lsearch -exact $tags $tag]
+    if {$index != -1} {
+        bindtags $widget [lreplace $tags $index $index]
+    }
+}
+'''
+
+# Tcl commands that haven't been ran yet. See _call().
+_buffer = []
+_flush_scheduled = False
+
+# [number of commands ran from the buffer, number of calls into Tcl
+# that ran them]. bananagui.bench uses these.
+buffer_stats = [0, 0]
+
+# {tkinter color string: hexadecimal color, ...}. See _convert_color().
+_colors = {}
+
+# Results of inspecting the current theme, like the checkbox colors in
+# widgets/misc.py. The keys are strings. This is cleared on ttk's
+# <<ThemeChanged>> event, so widgets don't need to inspect it again
+# every time.
+#
+# The classic tk widgets get their colors from the option database and
+# tk_setPalette, and Tk doesn't tell anyone when those change. Code that
+# changes them must call _clear_theme_caches(), but nothing in BananaGUI
+# does that.
+_theme_cache = {}
+
+
+def _clear_theme_caches(event=None):
+    _colors.clear()
+    _theme_cache.clear()
+
 
 def init():
     global root
+    global _flush_scheduled
+    # The previous root may have been destroyed before it ran the
+    # commands, and they are for its widgets anyway.
+    del _buffer[:]
+    _flush_scheduled = False
     root = tk.Tk()
     root.withdraw()
+    root.tk.eval(_TCL_SETUP)
+    _clear_theme_caches()
+    # Color names like 'SystemButtonFace' may mean different colors
+    # after this.
+    root.bind('<<ThemeChanged>>', _clear_theme_caches, add=True)
 
 
 def run():
@@ -17,6 +88,7 @@ def run():
 
 
 def quit():
+    flush()
     root.destroy()
 
 
@@ -30,13 +102,73 @@ def add_timeout(milliseconds, callback):
     after(milliseconds, real_callback)
 
 
+def add_idle(callback):
+    root.after_idle(callback)
+
+
+def _call(*args):
+    """Run a Tcl command soon.
+
+    Use this for commands that only change things. The commands run in
+    the order they were added when the main loop is done with whatever
+    it's doing, or when flush() is called. Most of the time, many
+    commands run with one call into Tcl.
+    """
+    global _flush_scheduled
+    _buffer.append(args)
+    if not _flush_scheduled:
+        root.after_idle(_flush_soon)
+        _flush_scheduled = True
+
+
+def _flush_soon():
+    global _flush_scheduled
+    _flush_scheduled = False
+    flush()
+
+
+def flush():
+    """Run the commands added with _call() now.
+
+    This must be called before reading anything that the commands may
+    change, like sizes of widgets, and before doing something that
+    must happen after the commands.
+
+    Errors are printed to sys.stderr, and the other commands run
+    anyway.
+    """
+    if not _buffer:
+        return
+    commands = tuple(_buffer)
+    # The commands may run Python callbacks that call _call().
+    del _buffer[:]
+    buffer_stats[0] += len(commands)
+    buffer_stats[1] += 1
+    # Tkinter converts tuples to Tcl lists, so there's no need to quote
+    # anything.
+    errors = root.tk.call('bananagui_run', commands)
+    splitlist = root.tk.splitlist
+    for error in splitlist(errors):
+        command, message = splitlist(error)
+        sys.stderr.write("Error in buffered Tcl command: %s\n"
+                         "tkinter.TclError: %s\n" % (
+                             ' '.join(map(str, splitlist(command))),
+                             message))
+
+
 def _convert_color(colorstring):
     """Convert a tkinter color string to a hexadecimal color.
 
     Tkinter colors are usually hexadecimal, but this function also
-    handles color names like 'red' or 'SystemDefault'.
+    handles color names like 'red' or 'SystemDefault'. The results are
+    cached until the theme changes.
     """
+    try:
+        return _colors[colorstring]
+    except KeyError:
+        pass
     # Tkinter uses 65535 as the maximum value. We need to divide the
     # values by 65535//255=257.
     rgb = (value // 257 for value in root.winfo_rgb(colorstring))
-    return color.rgb2hex(rgb)
+    result = _colors[colorstring] = color.rgb2hex(rgb)
+    return result
@@ -1,13 +1,73 @@
 import functools
 import tkinter as tk
+from tkinter import ttk
 
 from bananagui import Orient
 from . import tkinter_fills
+from .. import mainloop
 
 
-class _Tooltip:
+# The root window that _setup_bindings() has ran for.
+_setup_root = None
+
+# {tkinter widget class: Tcl command that creates it, ...}
+_tcl_commands = {
+    tk.Button: 'button',
+    tk.Checkbutton: 'checkbutton',
+    tk.Entry: 'entry',
+    tk.Frame: 'frame',
+    tk.Label: 'label',
+    tk.LabelFrame: 'labelframe',
+    tk.Scale: 'scale',
+    tk.Spinbox: 'spinbox',
+    tk.Text: 'text',
+    ttk.Progressbar: 'ttk::progressbar',
+}
+
+
+def _setup_bindings():
+    global _setup_root
+    if _setup_root is not mainloop.root:
+        mainloop.root.bind_class(mainloop.BINDTAG, '<Configure>',
+                                 _do_configure)
+        _tooltips.setup(mainloop.root)
+        _setup_root = mainloop.root
+
+
+# These are like the tkinter methods, but they use mainloop._call().
+# Setters should use these, and other code that uses the tkinter widgets
+# should call mainloop.flush() first.
+
+def _configure(widget, **options):
+    mainloop._call(widget._w, 'configure', *widget._options(options))
+
+
+def _pack(widget, **options):
+    mainloop._call('pack', 'configure', widget._w,
+                   *widget._options(options))
+
+
+def _pack_forget(widget):
+    mainloop._call('pack', 'forget', widget._w)
+
+
+def _do_configure(event):
+    # See Child.create().
+    wrapper = getattr(event.widget, '_bananagui_wrapper', None)
+    if wrapper is not None:
+        # The x and y of configure events are relative to the parent.
+        wrapper.bananawidget._set_allocation(
+            (event.x, event.y, event.width, event.height))
+
+
+class _TooltipManager:
     """Tooltips for tkinter.
 
+    There's only one mouse pointer, so one manager and one tip window
+    are enough for all widgets. Widgets that have a tooltip get
+    mainloop.TOOLTIP_BINDTAG, so other widgets don't run any tooltip
+    code when the mouse moves on them.
+
     License notice: This class has nothing to do with idlelib.ToolTip. I
     didn't copy-paste this from idlelib and I didn't read idlelib's
     tooltip.py when I wrote this. I wrote my own tooltip manager mainly
@@ -15,63 +75,105 @@ class _Tooltip:
     idlelib's code.
     """
 
-    # This needs to be shared by all instances because there's only one
-    # mouse pointer.
-    tipwindow = None
+    def __init__(self):
+        self._reset()
 
-    def __init__(self, widget):
-        widget.bind('<Enter>', self.enter)
-        widget.bind('<Leave>', self.leave)
-        widget.bind('<Motion>', self.motion)
-        self.widget = widget
-        self.got_mouse = False
-        self.content = None
+    def _reset(self):
+        self.texts = {}         # {widget path: tooltip text, ...}
+        self.tipwindow = None
+        self.label = None
+        self.current = None     # Path of the widget that has the mouse.
+        self.after_id = None
 
-    @classmethod
-    def destroy_tipwindow(cls, event=None):
-        if cls.tipwindow is not None:
-            cls.tipwindow.destroy()
-            cls.tipwindow = None
+    def setup(self, root):
+        # The old tip window died with the old root.
+        self._reset()
+        root.bind_class(mainloop.TOOLTIP_BINDTAG, '<Enter>', self.enter)
+        root.bind_class(mainloop.TOOLTIP_BINDTAG, '<Leave>', self.leave)
 
-    def enter(self, event):
-        if event.widget is not self.widget:
-            # For some reason, toplevels get also notified of their
-            # childrens' events.
+    def set_text(self, widget, text):
+        path = widget._w
+        if text is None:
+            if self.texts.pop(path, None) is not None:
+                mainloop._call('bananagui_remove_tag', path,
+                               mainloop.TOOLTIP_BINDTAG)
+                if self.current == path:
+                    self.hide()
             return
-        self.destroy_tipwindow()
-        self.got_mouse = True
-        event.widget.after(1000, self.show)
+
+        if path not in self.texts:
+            mainloop._call('bananagui_add_tag', path,
+                           mainloop.TOOLTIP_BINDTAG)
+        self.texts[path] = text
+        if self.current == path and self.label is not None:
+            self.label['text'] = text
+
+    def forget(self, widget):
+        path = widget._w
+        self.texts.pop(path, None)
+        if self.current == path:
+            self.hide()
+
+    def forget_children(self, widget):
+        # Closing a window destroys the children's tkinter widgets
+        # without destroying their wrappers.
+        prefix = widget._w + '.'
+        for path in [path for path in self.texts if path.startswith(prefix)]:
+            del self.texts[path]
+        if self.current is not None and self.current.startswith(prefix):
+            self.hide()
+
+    def enter(self, event):
+        self.hide()
+        self.current = str(event.widget)
+        self.after_id = mainloop.root.after(1000, self.show)
 
     def leave(self, event):
-        if event.widget is not self.widget:
-            return
-        self.destroy_tipwindow()
-        self.got_mouse = False
+        self.hide()
 
-    def motion(self, event):
-        self.mousex = event.x_root
-        self.mousey = event.y_root
+    def hide(self, event=None):
+        self.current = None
+        if self.after_id is not None:
+            mainloop.root.after_cancel(self.after_id)
+            self.after_id = None
+        if self.tipwindow is not None:
+            self.tipwindow.withdraw()
 
     def show(self):
-        if not self.got_mouse:
+        self.after_id = None
+        text = self.texts.get(self.current)
+        if text is None:
             return
-        self.destroy_tipwindow()
-        if self.content is not None:
-            tipwindow = type(self).tipwindow = tk.Toplevel()
-            tipwindow.geometry('+%d+%d' % (self.mousex+10, self.mousey-10))
-            tipwindow.bind('<Motion>', self.destroy_tipwindow)
-            tipwindow.overrideredirect(True)
 
+        if self.tipwindow is None:
+            self.tipwindow = tk.Toplevel(mainloop.root)
+            self.tipwindow.withdraw()
+            self.tipwindow.overrideredirect(True)
+            self.tipwindow.bind('<Motion>', self.hide)
             # If you modify this, make sure to always define either no
             # colors at all or both foreground and background. Otherwise
             # the label will have light text on a light background or
             # dark text on a dark background on some systems.
-            label = tk.Label(tipwindow, text=self.content, border=3,
-                             fg='black', bg='white')
-            label.pack()
+            self.label = tk.Label(self.tipwindow, border=3,
+                                  fg='black', bg='white')
+            self.label.pack()
+
+        mousex, mousey = mainloop.root.winfo_pointerxy()
+        self.label['text'] = text
+        self.tipwindow.geometry('+%d+%d' % (mousex+10, mousey-10))
+        self.tipwindow.deiconify()
+        self.tipwindow.lift()
+
+
+_tooltips = _TooltipManager()
 
 
 def run_when_ready(method):
+    # Setters only need to run with the latest value, so setting a
+    # property many times before the widget is created doesn't make
+    # create() slow. Other methods like Box.append run every time.
+    is_setter = method.__name__.startswith('set_')
+
     @functools.wraps(method)
     def inner(self, *args, **kwargs):
         if (not isinstance(self, Child)) or self.todo is None:
@@ -80,7 +182,16 @@ def run_when_ready(method):
         # We need to do this later. Unfortunately we don't get a return
         # value this way, which might be a problem in some cases...
         partial = functools.partial(method, self, *args, **kwargs)
-        self.todo.append(partial)
+        if is_setter:
+            # The setter is moved to the end, so it runs after
+            # everything that was called before it like it would
+            # without the todo dict.
+            self.todo.pop(method.__name__, None)
+            self.todo[method.__name__] = partial
+        else:
+            # Partials are compared by identity, so they work as
+            # unique keys.
+            self.todo[partial] = partial
         return None
 
     return inner
@@ -88,11 +199,27 @@ def run_when_ready(method):
 
 class Widget:
 
+    # Child's attributes are here because Python doesn't allow
+    # inheriting from Parent and Child if they both add slots.
+    __slots__ = ('bananawidget', 'widget', 'parent',
+                 'todo', '_packed')
+
     def __init__(self, bananawidget):
         self.bananawidget = bananawidget
 
+    def _child_wrappers(self):
+        return []
+
     def focus(self):
-        self.widget.focus()
+        mainloop._call('focus', self.widget._w)
+
+    def destroy(self):
+        # Tkinter's destroy() also deletes the Tcl commands that were
+        # created for bindings and options like command=some_function.
+        if self.widget is not None:
+            # The buffered commands may use the widget.
+            mainloop.flush()
+            self.widget.destroy()
 
 
 _expand_indexes = {
@@ -105,33 +232,85 @@ class Child(Widget):
     # This is a bit tricky because tkinter widgets need to know their
     # parent when they are created. There's a create method that
     # creates the widgets when their parents are known all the way to
-    # the top window. It calls everything in the todo list with no
-    # arguments. The run_when_ready decorator can be used for
-    # automatically adding a partial to the todo list instead of trying
-    # to run the function. The todo list is set to None when the widget
-    # has been created.
+    # the top window. It calls everything in the todo dict with no
+    # arguments, in the order they were added. The run_when_ready
+    # decorator can be used for automatically adding a partial to the
+    # todo dict instead of trying to run the function. The todo dict is
+    # set to None when the widget has been created.
+    #
+    # Subclasses should set widget_class and override widget_options()
+    # and setup_widget() if needed. Then their widgets are created
+    # together with other widgets using as few Tcl calls as possible.
+    # Subclasses can also override create_widget(), but then their
+    # widgets are created one by one.
+
+    __slots__ = ()
+
+    widget_class = None
 
     def __init__(self, bananawidget):
-        self.todo = []
+        self.todo = {}
         self.parent = None
         self._packed = False  # See also parents.py.
         self.widget = None
         super().__init__(bananawidget)
 
+    def widget_options(self):
+        """Return the options that the widget is created with."""
+        return {}
+
+    def create_widget(self, parent):
+        return self.widget_class(parent.widget, **self.widget_options())
+
+    def setup_widget(self):
+        """This is called after creating self.widget."""
+
+    def _new_widget(self):
+        """Create a tkinter widget object without running Tcl yet.
+
+        The Tcl command that creates the widget is ran with
+        mainloop._call(). This returns None if the widget can't be
+        created this way.
+        """
+        try:
+            tclcommand = _tcl_commands[self.widget_class]
+        except KeyError:
+            return None
+        if type(self).create_widget is not Child.create_widget:
+            return None
+
+        # This does the same things as tkinter.BaseWidget.__init__,
+        # except the Tcl call. Tkinter has no public way to create a
+        # widget object without running Tcl right away, and the whole
+        # point of this is to run the creation command in a batch with
+        # other commands. BaseWidget._setup() is what __init__ uses for
+        # choosing the widget's name and registering it in its master.
+        # It's private, so if it's gone, the widgets are created one by
+        # one with the public constructor instead.
+        if not hasattr(self.widget_class, '_setup'):
+            return None
+        widget = self.widget_class.__new__(self.widget_class)
+        widget.widgetName = tclcommand
+        widget._setup(self.parent.widget, {})
+        widget._tclCommands = []
+        mainloop._call(tclcommand, widget._w,
+                       *widget._options(self.widget_options()))
+        return widget
+
     def create(self, parent):
-        # Subclasses should provide a create_widget method.
         if self.todo is None:
             # It has been created already.
             return
         self.parent = parent
-        self.widget = self.create_widget(self.parent)
-        self._tooltip = _Tooltip(self.widget)
-        for thing in self.todo:
-            thing()
+        _realize(self)
+
+    def destroy(self):
+        # This makes create() do nothing, and functools.partial objects
+        # in the todo dict are not needed anymore.
         self.todo = None
-        if hasattr(super(), 'create'):
-            # Run Parent.create. See its documentation for more info.
-            super().create(parent)
+        if self.widget is not None:
+            _tooltips.forget(self.widget)
+        super().destroy()
 
     @run_when_ready
     def set_expand(self, expand):
@@ -147,14 +326,54 @@ class Child(Widget):
             except AttributeError:
                 # It's not a box. We need a default value.
                 pack_kwargs['expand'] = (expand == (True, True))
-            self.widget.pack(**pack_kwargs)
+            _pack(self.widget, **pack_kwargs)
 
     @run_when_ready
     def set_tooltip(self, tooltip):
-        self._tooltip.content = tooltip
+        _tooltips.set_text(self.widget, tooltip)
 
     @run_when_ready
     def set_grayed_out(self, grayed_out):
-        self.widget['state'] = 'disable' if grayed_out else 'normal'
+        _configure(self.widget, state=('disable' if grayed_out else 'normal'))
 
     focus = run_when_ready(Widget.focus)
+
+
+def _realize(root):
+    """Create the tkinter widgets of a Child wrapper and its children."""
+    _setup_bindings()
+
+    # This doesn't use recursion because the widgets can be nested more
+    # deeply than Python's recursion limit allows. Each wrapper is after
+    # its parent in this list.
+    wrappers = [root]
+    for wrapper in wrappers:
+        for child in wrapper._child_wrappers():
+            if child.todo is not None:
+                child.parent = wrapper
+                wrappers.append(child)
+
+    for wrapper in wrappers:
+        widget = wrapper._new_widget()
+        if widget is None:
+            # The parent widget must exist before this runs.
+            mainloop.flush()
+            widget = wrapper.create_widget(wrapper.parent)
+        # This is used in _do_configure().
+        widget._bananagui_wrapper = wrapper
+        wrapper.widget = widget
+        mainloop._call('bananagui_add_tag', widget._w, mainloop.BINDTAG)
+
+    # The setup_widget() methods may need the widgets.
+    mainloop.flush()
+    for wrapper in wrappers:
+        wrapper.setup_widget()
+
+    # Things done in the todo dicts, like packing children and setting
+    # options, go to mainloop's command buffer. The parents are handled
+    # before their children, like they would be without the buffer.
+    for wrapper in wrappers:
+        todo = wrapper.todo
+        wrapper.todo = None
+        for thing in todo.values():
+            thing()
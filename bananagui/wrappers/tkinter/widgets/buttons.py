@@ -1,28 +1,33 @@
 import tkinter as tk
 
-from .basewidgets import Child, run_when_ready
+from .basewidgets import Child, run_when_ready, _configure
 
 
 class Button(Child):
 
-    def create_widget(self, parent):
-        widget = tk.Button(parent.widget, command=self._do_click)
-        widget.bind('<Return>', self._do_click)
-        return widget
+    __slots__ = ()
+
+    widget_class = tk.Button
+
+    def widget_options(self):
+        return {'command': self._do_click}
+
+    def setup_widget(self):
+        self.widget.bind('<Return>', self._do_click)
 
     def _do_click(self, event=None):
         self.bananawidget.on_click.run()
 
     @run_when_ready
     def set_text(self, text):
-        self.widget['text'] = text
+        _configure(self.widget, text=text)
 
     @run_when_ready
     def set_image(self, image):
         if image is None:
-            self.widget['image'] = ''
+            _configure(self.widget, image='')
         else:
-            self.widget['image'] = image.real_image
+            _configure(self.widget, image=image.real_image)
 
 
 ImageButton = Button
@@ -1,7 +1,7 @@
 import tkinter as tk
 
 from bananagui import Align
-from .basewidgets import Child, run_when_ready
+from .basewidgets import Child, run_when_ready, _configure
 
 
 anchors = {Align.LEFT: 'w',
@@ -11,24 +11,25 @@ anchors = {Align.LEFT: 'w',
 
 class Label(Child):
 
-    def create_widget(self, parent):
-        return tk.Label(parent.widget)
+    __slots__ = ()
+
+    widget_class = tk.Label
 
     @run_when_ready
     def set_text(self, text):
-        self.widget['text'] = text
+        _configure(self.widget, text=text)
 
     @run_when_ready
     def set_align(self, align):
-        self.widget['justify'] = align.name.lower()
-        self.widget['anchor'] = anchors[align]
+        _configure(self.widget, justify=align.name.lower(),
+                   anchor=anchors[align])
 
     @run_when_ready
     def set_image(self, image):
         if image is None:
-            self.widget['image'] = ''
+            _configure(self.widget, image='')
         else:
-            self.widget['image'] = image.real_image
+            _configure(self.widget, image=image.real_image)
 
 
 ImageLabel = Label
@@ -2,35 +2,59 @@ import tkinter as tk
 
 from bananagui import Orient, color
 
-from .basewidgets import Child, run_when_ready
+from .basewidgets import Child, run_when_ready, _configure
 from .. import mainloop
 
 
 class Checkbox(Child):
 
+    __slots__ = ('_var', '_trace')
+
     def __init__(self, bananawidget):
         self._var = tk.IntVar()
-        self._var.trace('w', self._var_changed)
+        self._trace = self._var.trace('w', self._var_changed)
         super().__init__(bananawidget)
 
-    def create_widget(self, parent):
-        widget = tk.Checkbutton(parent.widget, variable=self._var)
+    def destroy(self):
+        # Tcl refers to the trace function, so it keeps this object and
+        # the variable alive until the trace is deleted.
+        self._var.trace_vdelete('w', self._trace)
+        super().destroy()
+
+    widget_class = tk.Checkbutton
+
+    def widget_options(self):
+        return {'variable': self._var}
+
+    def setup_widget(self):
+        # All checkboxes get the same colors from the theme, so they are
+        # inspected only for the first checkbox. Then creating more
+        # checkboxes doesn't need any calls into Tcl here.
+        try:
+            fg = mainloop._theme_cache['checkbox_fg']
+        except KeyError:
+            fg = mainloop._theme_cache['checkbox_fg'] = self._get_fg()
+        if fg is not None:
+            _configure(self.widget, fg=fg)
+
+    def _get_fg(self):
+        """Return a better foreground color or None if it's fine."""
+        widget = self.widget
 
         # The checkboxes have white foreground on a white background by
         # default with my dark GTK+ theme.
         box_bg = mainloop._convert_color(widget['selectcolor'])
         checkmark = mainloop._convert_color(widget['fg'])
-        if box_bg == checkmark:
-            if color.brightness(box_bg) > 0.8:
-                # It's really light, make it black.
-                widget['fg'] = color.BLACK
-            elif color.brightness(box_bg) < 0.2:
-                # It's really dark, make it white.
-                widget['fg'] = color.WHITE
-            else:
-                # Fall back to the background and hope it's different
-                # enough...
-                widget['fg'] = widget['bg']
+        if box_bg != checkmark:
+            return None
+        if color.brightness(box_bg) > 0.8:
+            # It's really light, make it black.
+            return color.BLACK
+        if color.brightness(box_bg) < 0.2:
+            # It's really dark, make it white.
+            return color.WHITE
+        # Fall back to the background and hope it's different enough...
+        return widget['bg']
 #        if brightness(box_bg) < 0.5 and brightness(checkmark) < 0.5:
 #            # Make the background of the actual box where the checkmark
 #            # goes white, and leave the checkmark dark.
@@ -39,14 +63,13 @@ class Checkbox(Child):
 #            # Make the background black and leave the checkmark light.
 #            # This runs with my GTK+ theme.
 #            widget['selectcolor'] = '#000000'
-        return widget
 
     def _var_changed(self, name, empty_string, mode):
         self.bananawidget.checked = (self._var.get() != 0)
 
     @run_when_ready
     def set_text(self, text):
-        self.widget['text'] = text
+        _configure(self.widget, text=text)
 
     # The variable was created in __init__, so we don't need
     # @run_when_ready.
@@ -56,20 +79,25 @@ class Checkbox(Child):
 
 class Dummy(Child):
 
-    def create_widget(self, parent):
-        return tk.Label(parent.widget)
+    __slots__ = ()
+
+    widget_class = tk.Label
 
 
 class Separator(Child):
 
+    __slots__ = ('orientation',)
+
     def __init__(self, bananawidget, orientation):
         self.orientation = orientation
         super().__init__(bananawidget)
 
-    def create_widget(self, parent):
-        widget = tk.Frame(parent.widget, border=1, relief='sunken')
+    widget_class = tk.Frame
+
+    def widget_options(self):
+        options = {'border': 1, 'relief': 'sunken'}
         if self.orientation == Orient.HORIZONTAL:
-            widget['height'] = 3
+            options['height'] = 3
         if self.orientation == Orient.VERTICAL:
-            widget['width'] = 3
-        return widget
+            options['width'] = 3
+        return options
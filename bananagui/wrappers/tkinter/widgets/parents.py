@@ -2,27 +2,23 @@ import tkinter as tk
 
 from bananagui import Orient
 from . import tkinter_fills
-from .basewidgets import Child, Widget, run_when_ready
+from .basewidgets import (Child, Widget, run_when_ready, _configure, _pack,
+                          _pack_forget)
 
 
 class Parent(Widget):
 
+    __slots__ = ()
+
     def __init__(self, bananawidget):
         # This is for compatibility with run_when_ready().
         if not hasattr(self, 'parent'):
             self.parent = None
         super().__init__(bananawidget)
 
-    def create(self, parent):
-        # self can be a Child, and there's no guarantees about which
-        # order Parent and Child appear in the mro. Window and Dialog
-        # objects also have this method, but it's never called.
-        if hasattr(super(), 'create'):
-            # It's a Child, not a Window or Dialog.
-            assert parent is not None
-            super().create(parent)
-        for child in self.bananawidget.children():
-            child._wrapper.create(self)
+    def _child_wrappers(self):
+        # See _realize() in basewidgets.py.
+        return [child._wrapper for child in self.bananawidget.children()]
 
     def _prepare_add(self, child):
         """Prepare a child for being added to this widget."""
@@ -37,10 +33,12 @@ class Parent(Widget):
 
 class Bin(Parent):
 
+    __slots__ = ()
+
     # The _real_add is used in window.py.
     def _real_add(self, child):
         self._prepare_add(child)
-        child.widget.pack()
+        _pack(child.widget)
         child.set_expand(child.bananawidget.expand)  # Update the packing.
 
     add = run_when_ready(_real_add)
@@ -48,7 +46,7 @@ class Bin(Parent):
     @run_when_ready
     def remove(self, child):
         self._prepare_remove(child)
-        child.widget.pack_forget()
+        _pack_forget(child.widget)
 
 
 # TODO: Scroller.
@@ -65,17 +63,19 @@ _appendsides = {
 
 class Box(Parent, Child):
 
+    __slots__ = ('orient',)
+
     def __init__(self, bananawidget, orient):
         self.orient = orient
         super().__init__(bananawidget)
 
-    def create_widget(self, parent):
-        return tk.Frame(parent.widget)
+    widget_class = tk.Frame
 
     @run_when_ready
     def append(self, child):
         self._prepare_add(child)
-        child.widget.pack(
+        _pack(
+            child.widget,
             side=_appendsides[self.bananawidget.orient],
             fill=tkinter_fills[child.bananawidget.expand],
         )
@@ -85,14 +85,15 @@ class Box(Parent, Child):
     @run_when_ready
     def remove(self, child):
         self._prepare_remove(child)
-        child.widget.pack_forget()
+        _pack_forget(child.widget)
 
 
 class Group(Bin, Child):
 
-    def create_widget(self, parent):
-        return tk.LabelFrame(parent.widget)
+    __slots__ = ()
+
+    widget_class = tk.LabelFrame
 
     @run_when_ready
     def set_text(self, text):
-        self.widget['text'] = text
+        _configure(self.widget, text=text)
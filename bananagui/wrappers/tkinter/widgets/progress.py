@@ -1,33 +1,36 @@
 from tkinter import ttk
 
-from .basewidgets import Child, run_when_ready
+from .basewidgets import Child, run_when_ready, _configure
+from .. import mainloop
 
 
 class Progressbar(Child):
 
-    def create_widget(self, parent):
-        return ttk.Progressbar(parent.widget)
+    __slots__ = ()
+
+    widget_class = ttk.Progressbar
 
     @run_when_ready
     def set_bouncing(self, bouncing):
         if bouncing:
-            self.widget['mode'] = 'indeterminate'
-            self.widget.start(20)  # Move every 20 milliseconds.
+            _configure(self.widget, mode='indeterminate')
+            # Move every 20 milliseconds.
+            mainloop._call(self.widget._w, 'start', 20)
         else:
             # Unfortunately there's no better way to hide the moving
             # part of the bar when we don't want it to bounce.
-            self.widget['mode'] = 'determinate'
-            self.widget.stop()
+            _configure(self.widget, mode='determinate')
+            mainloop._call(self.widget._w, 'stop')
 
     @run_when_ready
     def set_progress(self, progress):
-        self.widget.stop()  # Reset it.
+        mainloop._call(self.widget._w, 'stop')  # Reset it.
         step = progress * 100
         if step > 99.99:
             # The widget would go back to zero if we stepped it this
             # much.
             step = 99.99
-        self.widget.step(step)
+        mainloop._call(self.widget._w, 'step', step)
 
 
 BouncingProgressbar = Progressbar
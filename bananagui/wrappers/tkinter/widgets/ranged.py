@@ -1,10 +1,13 @@
 import tkinter as tk
 
 from .basewidgets import Child, run_when_ready
+from .. import mainloop
 
 
 class Slider(Child):
 
+    __slots__ = ('_minimum', '_maximum', '_step', '_orient')
+
     def __init__(self, bananawidget, orient, valuerange):
         self._minimum = min(valuerange)
         self._maximum = max(valuerange)
@@ -12,19 +15,21 @@ class Slider(Child):
         self._orient = orient.name.lower()
         super().__init__(bananawidget)
 
-    def create_widget(self, parent):
+    widget_class = tk.Scale
+
+    def widget_options(self):
         # The command is way better than binding anything manually. I
         # found it from the scale(3tk) man page.
-        return tk.Scale(parent.widget, from_=self._minimum,
-                        to=self._maximum, resolution=self._step,
-                        orient=self._orient, command=self._do_changed)
+        return {'from_': self._minimum, 'to': self._maximum,
+                'resolution': self._step, 'orient': self._orient,
+                'command': self._do_changed}
 
     def _do_changed(self, new_value):
         self.bananawidget.value = int(new_value)
 
     @run_when_ready
     def set_value(self, value):
-        self.widget.set(value)
+        mainloop._call(self.widget._w, 'set', value)
 
 
 def _select_all(event):
@@ -40,21 +45,29 @@ def _select_all(event):
 
 class Spinbox(Child):
 
+    __slots__ = ('_valuerange', '_var', '_trace')
+
     def __init__(self, bananawidget, valuerange):
         self._valuerange = valuerange
         self._var = tk.StringVar(value=str(min(valuerange)))
-        self._var.trace('w', self._var_changed)
+        self._trace = self._var.trace('w', self._var_changed)
         super().__init__(bananawidget)
 
-    def create_widget(self, parent):
-        widget = tk.Spinbox(
-            parent.widget,
-            # Tkinter doesn't know how to handle ranges.
-            values=tuple(self._valuerange))
-        widget.bind('<Control-A>', _select_all)
-        widget.bind('<Control-a>', _select_all)
-        widget['textvariable'] = self._var
-        return widget
+    def destroy(self):
+        # See Checkbox.destroy in misc.py.
+        self._var.trace_vdelete('w', self._trace)
+        super().destroy()
+
+    widget_class = tk.Spinbox
+
+    def widget_options(self):
+        # Tkinter doesn't know how to handle ranges.
+        return {'values': tuple(self._valuerange)}
+
+    def setup_widget(self):
+        self.widget.bind('<Control-A>', _select_all)
+        self.widget.bind('<Control-a>', _select_all)
+        self.widget['textvariable'] = self._var
 
     def _var_changed(self, tkname, empty_string, mode):
         try:
@@ -1,6 +1,7 @@
 import tkinter as tk
 
-from .basewidgets import Child, run_when_ready
+from .basewidgets import Child, run_when_ready, _configure
+from .. import mainloop
 
 
 def _setup_bindings(bananawidget, tkinterwidget):
@@ -14,12 +15,25 @@ def _setup_bindings(bananawidget, tkinterwidget):
 
 class Entry(Child):
 
-    def create_widget(self, parent):
+    __slots__ = ('_var', '_trace')
+
+    widget_class = tk.Entry
+
+    def __init__(self, bananawidget):
         self._var = tk.StringVar()
-        self._var.trace('w', self._var_changed)
-        widget = tk.Entry(parent.widget, textvariable=self._var)
-        _setup_bindings(self.bananawidget, widget)
-        return widget
+        self._trace = self._var.trace('w', self._var_changed)
+        super().__init__(bananawidget)
+
+    def widget_options(self):
+        return {'textvariable': self._var}
+
+    def setup_widget(self):
+        _setup_bindings(self.bananawidget, self.widget)
+
+    def destroy(self):
+        # See Checkbox.destroy in misc.py.
+        self._var.trace_vdelete('w', self._trace)
+        super().destroy()
 
     def _var_changed(self, tkname, empty_string, mode):
         self.bananawidget.text = self._var.get()
@@ -31,26 +45,32 @@ class Entry(Child):
     # This overrides the set_grayed_out defined in basewidgets.py.
     @run_when_ready
     def set_grayed_out(self, grayed_out):
-        self.widget['state'] = 'readonly' if grayed_out else 'normal'
+        _configure(self.widget,
+                   state=('readonly' if grayed_out else 'normal'))
 
     @run_when_ready
     def set_secret(self, secret):
-        self.widget['show'] = '*' if secret else ''
+        _configure(self.widget, show=('*' if secret else ''))
 
     @run_when_ready
     def select_all(self):
-        self.widget.selection_range(0, 'end')
+        mainloop._call(self.widget._w, 'selection', 'range', 0, 'end')
 
 
 class TextEdit(Child):
 
-    def create_widget(self, parent):
+    __slots__ = ()
+
+    widget_class = tk.Text
+
+    def widget_options(self):
         # A larger width or height would prevent the widget from
         # shrinking when needed.
-        widget = tk.Text(parent.widget, width=1, height=1)
-        widget.bind('<<Modified>>', self._on_modified)
-        _setup_bindings(self.bananawidget, widget)
-        return widget
+        return {'width': 1, 'height': 1}
+
+    def setup_widget(self):
+        self.widget.bind('<<Modified>>', self._on_modified)
+        _setup_bindings(self.bananawidget, self.widget)
 
     # TODO: the cursor likes to jump to the end of the widget and
     # "modified" prints too often...
@@ -63,6 +83,7 @@ class TextEdit(Child):
     @run_when_ready
     def set_text(self, text):
         print('setting text')
+        mainloop.flush()
         self.widget.unbind('<<Modified>>')
         self.widget.delete(0.0, 'end-1c')
         self.widget.edit_modified(False)
@@ -71,10 +92,11 @@ class TextEdit(Child):
 
     @run_when_ready
     def set_grayed_out(self, grayed_out):
-        self.widget['state'] = 'disable' if grayed_out else 'normal'
+        _configure(self.widget, state=('disable' if grayed_out else 'normal'))
 
     @run_when_ready
     def select_all(self):
         # The end-1c doesn't get what tkinter thinks of as the last
         # character, which is a hidden newline.
-        self.widget.tag_add('sel', 0.0, 'end-1c')
+        mainloop._call(self.widget._w, 'tag', 'add', 'sel', 0.0,
+                       'end-1c')
@@ -1,10 +1,14 @@
 import tkinter as tk
 
+from .basewidgets import _tooltips
 from .parents import Bin
+from .. import mainloop
 
 
 class _BaseWindow(Bin):
 
+    __slots__ = ('_can_set_size',)
+
     def __init__(self, bananawidget, title):
         super().__init__(bananawidget)
         self.widget.title(title)
@@ -49,6 +53,8 @@ class _BaseWindow(Bin):
 
     def set_minimum_size(self, size):
         # Tkinter's windows don't avoid becoming too small by default.
+        # The sizes of the children depend on buffered commands.
+        mainloop.flush()
         minwidth = max(size[0], self.widget.winfo_reqwidth())
         minheight = max(size[1], self.widget.winfo_reqheight())
         self.widget.minsize(minwidth, minheight)
@@ -60,6 +66,8 @@ class _BaseWindow(Bin):
             self.widget.deiconify()
 
     def close(self):
+        mainloop.flush()
+        _tooltips.forget_children(self.widget)
         try:
             self.widget.destroy()
         except tk.TclError:
@@ -77,6 +85,8 @@ class _BaseWindow(Bin):
 
 class Window(_BaseWindow):
 
+    __slots__ = ()
+
     def __init__(self, bananawidget, title):
         # This will default to mainloop's root.
         self.widget = tk.Toplevel()
@@ -85,6 +95,8 @@ class Window(_BaseWindow):
 
 class Dialog(_BaseWindow):
 
+    __slots__ = ()
+
     def __init__(self, bananawidget, parentwindow, title):
         self.widget = tk.Toplevel(parentwindow.widget)
         super().__init__(bananawidget, title)
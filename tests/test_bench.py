@@ -0,0 +1,44 @@
+import io
+
+import bananagui
+from bananagui import bench, debug, widgets
+
+
+def test_run_and_compare(dummywrapper):
+    output = io.StringIO()
+    results = bench.run(['property_set_*', 'box_slice_*'], repeat=1,
+                        budget=0, file=output)
+    # The budget is 0 seconds, so only the smallest box is used.
+    assert list(results) == ['property_set_10000', 'box_slice_10[10]']
+    for result in results.values():
+        assert result['seconds'] > 0
+        assert result['peak_memory'] >= 0
+        assert result['tcl_calls'] is None   # not tkinter
+        assert result['tcl_calls_saved'] is None
+    assert results['property_set_10000']['wrapper_calls'] == 10000
+    assert 'skipping bigger sizes' in output.getvalue()
+
+    baseline = {name: {'seconds': result['seconds'] / 2,
+                       'peak_memory': result['peak_memory']}
+                for name, result in results.items()}
+    del baseline['box_slice_10[10]']
+    assert bench.compare(results, baseline) == ['property_set_10000']
+    assert bench.compare(results, results) == []
+
+
+def test_keeps_call_stats(dummywrapper):
+    debug.start_counting()
+    try:
+        widgets.Label("hello")
+        before = debug.call_stats()
+        bench.run(['property_set_*'], repeat=1, budget=0,
+                  file=io.StringIO())
+        assert debug.call_stats() == before
+        assert bananagui._wrapper_hook is not None
+    finally:
+        debug.stop_counting()
+        debug.reset_call_stats()
+
+    bench.run(['property_set_*'], repeat=1, budget=0, file=io.StringIO())
+    assert bananagui._wrapper_hook is None
+    assert debug.call_stats() == {}
@@ -0,0 +1,225 @@
+import gc
+import threading
+import weakref
+
+import pytest
+
+from bananagui import binding, mainloop, widgets
+
+
+def test_one_way(dummywrapper):
+    slider = widgets.Slider(range(10))
+    label = widgets.Label()
+    result = binding.bind(slider, 'value', label, 'text', transform=str)
+    assert label.text == '0'     # bind() sets it right away
+    assert repr(result) == (
+        '<bananagui.binding.Binding: Slider.value -> Label.text>')
+
+    slider.value = 3
+    slider.value = 5
+    assert label.text == '0'
+    mainloop._run_soon()       # this is what the GUI toolkit would do
+    assert label.text == '5'
+
+    result.unbind()
+    slider.value = 7
+    binding.flush()
+    assert label.text == '5'
+
+
+def test_two_way(dummywrapper):
+    entry1 = widgets.Entry('a')
+    entry2 = widgets.Entry()
+    result = binding.bind(entry1, 'text', entry2, 'text', two_way=True)
+    assert entry2.text == 'a'
+
+    changes = []
+    entry1.on_text_changed.connect(changes.append, 1)
+    entry2.on_text_changed.connect(changes.append, 2)
+    entry1.text = 'b'
+    binding.flush()
+    assert entry2.text == 'b'
+    entry2.text = 'c'
+    binding.flush()
+    assert entry1.text == 'c'
+    assert changes == [1, 2, 2, 1]     # no ping-pong
+
+    # The latest change wins.
+    entry2.text = 'd'
+    entry1.text = 'e'
+    binding.flush()
+    assert entry1.text == entry2.text == 'e'
+
+    result.unbind()
+    entry1.text = 'f'
+    binding.flush()
+    assert entry2.text == 'e'
+
+
+def test_graph(dummywrapper):
+    # slider -> spinbox -> entry1 -> label
+    #       \____________ entry2 _/
+    slider = widgets.Slider(range(10))
+    spinbox = widgets.Spinbox(range(10))
+    entry1 = widgets.Entry()
+    entry2 = widgets.Entry()
+    label = widgets.Label()
+    binding.bind(slider, 'value', spinbox, 'value')
+    binding.bind(spinbox, 'value', entry1, 'text', transform=str)
+    binding.bind(slider, 'value', entry2, 'text',
+                 transform=(lambda value: 'big' if value > 5 else 'small'))
+    binding.bind(entry1, 'text', label, 'text')
+    binding.bind(entry2, 'text', label, 'tooltip')
+
+    sets = []
+    for widget in [entry1, entry2]:
+        widget.on_text_changed.connect(sets.append, widget)
+
+    slider.value = 3
+    binding.flush()
+    assert (spinbox.value, entry1.text, entry2.text) == (3, '3', 'small')
+    assert (label.text, label.tooltip) == ('3', 'small')
+    assert sets == [entry1]     # entry2's text was already 'small'
+
+    sets.clear()
+    slider.value = 7
+    slider.value = 8
+    binding.flush()
+    assert (label.text, label.tooltip) == ('8', 'big')
+    assert sorted(sets, key=id) == sorted([entry1, entry2], key=id)
+
+
+def test_errors(dummywrapper, capsys):
+    label = widgets.Label()
+    entry = widgets.Entry()
+    with pytest.raises(ValueError):
+        binding.bind(label, 'text', entry, 'text')     # no on_text_changed
+    with pytest.raises(ValueError):
+        binding.bind(entry, 'text', label, 'lol')
+    with pytest.raises(ValueError):
+        binding.bind(entry, 'text', label, 'text', two_way=True)
+    with pytest.raises(TypeError):
+        binding.bind(entry, 'text', widgets.Entry(), 'text', two_way=True,
+                     transform=str.upper)
+    with pytest.raises(TypeError):
+        binding.bind(entry, 'text', label, 'text', back_transform=str)
+
+    spinbox = widgets.Spinbox(range(10))
+    entry.text = '1'
+    binding.bind(entry, 'text', spinbox, 'value', transform=int)
+    entry.text = 'not a number'
+    binding.flush()
+    output, errors = capsys.readouterr()
+    assert "binding.bind(entry, 'text', spinbox, 'value', transform=int)" \
+        in errors
+    assert spinbox.value == 1
+    assert errors.endswith(
+        "ValueError: invalid literal for int() with base 10: "
+        "'not a number'\n")
+
+
+def test_destroy_and_garbage_collect(dummywrapper):
+    entry1 = widgets.Entry()
+    entry2 = widgets.Entry()
+    label = widgets.Label()
+    result = binding.bind(entry1, 'text', entry2, 'text', two_way=True)
+    binding.bind(entry2, 'text', label, 'text')
+    assert entry1 in binding._bindings
+    assert entry2 in binding._bindings
+
+    entry1.destroy()
+    assert entry1 not in binding._bindings
+    assert entry1 not in binding._incoming
+    assert list(binding._bindings[entry2]) == ['text']
+    assert binding._bindings[entry2]['text'][0].target is label
+    result.unbind()     # does nothing, destroying unbound it already
+
+    label.destroy()
+    assert entry2 not in binding._bindings
+    assert label not in binding._incoming
+    entry2.text = 'hello'
+    binding.flush()
+
+    # Bound widgets that nothing else refers to can be garbage collected.
+    entry3 = widgets.Entry()
+    entry4 = widgets.Entry()
+    binding.bind(entry3, 'text', entry4, 'text', two_way=True)
+    refs = [weakref.ref(entry3), weakref.ref(entry4)]
+    del entry3, entry4
+    gc.collect()
+    assert [ref() for ref in refs] == [None, None]
+
+
+def test_diamond(dummywrapper):
+    # a -> c and a -> b -> c, so c must get b's value after b changes
+    a = widgets.Entry()
+    b = widgets.Entry()
+    c = widgets.Entry()
+    binding.bind(a, 'text', c, 'text', transform=(lambda text: 'a:' + text))
+    binding.bind(a, 'text', b, 'text', transform=(lambda text: text + '!'))
+    binding.bind(b, 'text', c, 'text')
+
+    sets = []
+    c.on_text_changed.connect(sets.append, 'c')
+    a.text = 'hi'
+    binding.flush()
+    assert (b.text, c.text) == ('hi!', 'hi!')
+    assert sets == ['c']    # set only once
+
+    # If b doesn't change, c gets its value from a.
+    a.text = 'hi'
+    b.text = 'x'
+    binding.flush()
+    assert c.text == 'x'
+    a.text = 'yo'
+    b.text = 'yo!'
+    binding.flush()
+    assert (b.text, c.text) == ('yo!', 'yo!')
+
+
+def test_multiple_sources(dummywrapper):
+    # The source that changed last wins.
+    entry1 = widgets.Entry()
+    entry2 = widgets.Entry()
+    label = widgets.Label()
+    binding.bind(entry1, 'text', label, 'text')
+    binding.bind(entry2, 'text', label, 'text')
+
+    entry2.text = 'two'
+    entry1.text = 'one'
+    binding.flush()
+    assert label.text == 'one'
+
+    entry1.text = 'uno'
+    entry2.text = 'dos'
+    binding.flush()
+    assert label.text == 'dos'
+
+
+def test_detached_threads(dummywrapper):
+    # Worker threads can bind in detached() while the GUI thread binds.
+    built = []
+
+    def build():
+        with widgets.detached():
+            pairs = [(widgets.Entry(), widgets.Label()) for i in range(50)]
+            for entry, label in pairs:
+                binding.bind(entry, 'text', label, 'text')
+            built.extend(pairs)
+
+    threads = [threading.Thread(target=build) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    entry = widgets.Entry()
+    label = widgets.Label()
+    for i in range(200):
+        binding.bind(entry, 'text', label, 'text').unbind()
+    for thread in threads:
+        thread.join()
+
+    assert len(built) == 200
+    assert entry not in binding._bindings
+    assert label not in binding._incoming
+    for entry, label in built:
+        assert len(binding._bindings[entry]['text']) == 1
+        assert len(binding._incoming[label]) == 1
@@ -0,0 +1,122 @@
+from bananagui import debug, widgets
+
+
+def test_call_counting(dummywrapper):
+    debug.start_counting()
+    try:
+        label = widgets.Label("hello")
+        debug.reset_call_stats()
+        label.text = "hello world"
+        label.text = "hello world"      # doesn't call the wrapper
+        label.tooltip = "lol"
+        stats = debug.call_stats()
+    finally:
+        debug.stop_counting()
+
+    assert stats.keys() == {('widgets.labels:Label', 'set_text'),
+                            ('widgets.labels:Label', 'set_tooltip')}
+    assert stats['widgets.labels:Label', 'set_text'].calls == 1
+    assert stats['widgets.labels:Label', 'set_text'].seconds >= 0
+    assert isinstance(label._wrapper, type(widgets.Label()._wrapper))
+
+    # Stopping doesn't reset the stats and nothing is counted anymore.
+    label.text = "bye"
+    assert debug.call_stats() == stats
+    debug.reset_call_stats()
+    assert debug.call_stats() == {}
+
+
+def create_and_close_window():
+    window = widgets.Window()
+    box = widgets.Box()
+    window.add(box)
+    button = widgets.Button("Close")
+    button.on_click.connect(window.close)
+    box.extend([widgets.Label("Hello"), button])
+    window.on_close.connect(window.close)
+    window.close()
+
+
+def test_census(dummywrapper):
+    before = debug.census()
+    window = widgets.Window()
+    window.on_close.connect(print)
+    after = debug.census()
+    difference = after.diff(before)
+    assert difference['widgets:bananagui.widgets.Window'] == 1
+    assert difference['wrappers:dummy:Window'] == 1
+    assert difference['callbacks'] == 1
+    assert difference['connections'] == 1
+    assert difference['stack_info_bytes'] > 0
+    assert difference['memory:bananagui.widgets.Window'] > 0
+    assert after.widgets['bananagui.widgets.Window'] >= 1
+    assert repr(after).startswith('<bananagui.debug.Census object, ')
+
+    del window
+    assert debug.census().diff(before) == {}
+
+
+def test_census_weak_connections(dummywrapper):
+    class Controller:
+        def on_click(self):
+            pass
+
+    button = widgets.Button()
+    controller = Controller()
+    button.on_click.connect(controller.on_click, weak=True)
+    before = debug.census()
+
+    del controller
+    assert debug.census().diff(before) == {'dead_connections': 1}
+    button.on_click.run()
+    difference = debug.census().diff(before)
+    assert difference.keys() == {'connections', 'pruned_connections',
+                                 'stack_info_bytes'}
+    assert difference['connections'] == -1
+    assert difference['pruned_connections'] == 1
+
+
+def test_no_leaks(dummywrapper):
+    create_and_close_window()   # run everything once before the census
+    before = debug.census()
+    for i in range(1000):
+        create_and_close_window()
+    assert debug.census().diff(before) == {}
+
+
+def test_no_instance_dicts(dummywrapper):
+    window = widgets.Window()
+    box = widgets.Box()
+    window.add(box)
+    box.extend([widgets.Label("Hello"), widgets.Button("Click"),
+                widgets.Checkbox("Check"), widgets.Entry("Text"),
+                widgets.Slider(range(10)), widgets.Spinbox(range(10)),
+                widgets.Group("Group", widgets.Dummy())])
+    box[3].on_text_changed.connect(print)     # creates the callback dict
+
+    for widget in [window] + list(box):
+        assert not hasattr(widget, '__dict__')
+        assert not hasattr(widget._wrapper, '__dict__')
+    assert not hasattr(box[3].on_text_changed, '__dict__')
+    window.close()
+
+
+def rebuild_panel(window):
+    panel = widgets.Box()
+    window.add(panel)
+    for i in range(10):
+        button = widgets.Button("Button %d" % i)
+        button.on_click.connect(print, i)
+        panel.append(button)
+    panel.append(widgets.Checkbox("Check"))
+    panel.destroy()
+
+
+def test_destroy_leaks(dummywrapper):
+    window = widgets.Window()
+    rebuild_panel(window)
+    before = debug.census()
+    for i in range(100):
+        rebuild_panel(window)
+    assert debug.census().diff(before) == {}
+    window.destroy()
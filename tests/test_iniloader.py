@@ -109,3 +109,4 @@ def test_loading(dummywrapper):
         assert widgetdict['window'].child is widgetdict['box']
         assert widgetdict['box'][:] == [widgetdict['label']]
         assert widgetdict['label'].text == 'hello multiline world'
+        assert widgetdict['window'].find('label') is widgetdict['label']
@@ -27,6 +27,36 @@ def test_init_run_quit(dummywrapper):
     mainloop.init()  # for other tests
 
 
+def test_call_soon_after_restart(dummywrapper):
+    from bananagui.wrappers.dummy import mainloop as dummy_mainloop
+
+    called = []
+    mainloop._call_soon(called.append, 1)
+    # Make it look like the idle callback died with the main loop.
+    dummy_mainloop._idle.clear()
+    mainloop.run()
+    assert called == []
+
+    mainloop.init()
+    mainloop._call_soon(called.append, 2)
+    mainloop.run()
+    assert called == [1, 2]
+    mainloop.init()     # for other tests
+
+
+def test_call_soon_errors(dummywrapper, capsys):
+    called = []
+    mainloop._call_soon(broken_callback, 1, 2, 3)
+    mainloop._call_soon(called.append, 1)
+    mainloop._run_soon()
+    assert called == [1]
+
+    output, errors = capsys.readouterr()
+    assert not output
+    assert errors.startswith('Traceback')
+    assert errors.endswith('ValueError: oh shit\n')
+
+
 def good_callback(*args):
     assert args == (1, 2, 3)
     return None
@@ -1,8 +1,10 @@
 """Test bananagui.widgets.parents."""
 
+import threading
+
 import pytest
 
-from bananagui import Orient, widgets
+from bananagui import Orient, binding, debug, iniloader, types, widgets
 
 
 def test_children(dummywrapper, capsys):
@@ -79,3 +81,260 @@ def test_box_repr(dummywrapper):
     assert repr(hbox) == (
         "<bananagui.widgets.Box object, horizontal, empty>")
     assert repr(vbox) == "<bananagui.widgets.Box object, empty>"
+
+
+def test_delegate(dummywrapper):
+    window = widgets.Window()
+    outer = widgets.Box()
+    inner = widgets.Box()
+    button = widgets.Button("Click me")
+    window.add(outer)
+    outer.append(inner)
+    inner.append(button)
+
+    clicked = []
+
+    def append_arg(widget, arg):
+        clicked.append(arg)
+
+    window.delegate('on_click', clicked.append)
+    outer.delegate('on_click', append_arg, 'x')
+    button.on_click.run()
+    assert clicked == ['x', button]     # nearest parent first
+
+    # The widgets don't need to exist when delegate() is called.
+    entry = widgets.Entry()
+    inner.append(entry)
+    window.delegate('on_text_changed', clicked.append)
+    entry.text = 'hello'
+    assert clicked == ['x', button, entry]
+    # Running the delegated functions didn't create callback objects.
+    assert not hasattr(entry, '_callbacks')
+
+    # Removed widgets are not in the window anymore.
+    clicked.clear()
+    inner.remove(button)
+    button.on_click.run()
+    with button.on_click.blocked():
+        inner.append(button)
+        button.on_click.run()
+    assert clicked == []
+
+    window.undelegate('on_click', clicked.append)
+    button.on_click.run()
+    assert clicked == ['x']
+    with pytest.raises(ValueError):
+        window.undelegate('on_click', clicked.append)
+    outer.undelegate('on_click', append_arg)
+    window.undelegate('on_text_changed', clicked.append)
+    window.close()
+
+
+def test_destroy(dummywrapper):
+    window = widgets.Window()
+    box = widgets.Box()
+    window.add(box)
+    label = widgets.Label("Hello")
+    inner = widgets.Box()
+    box.extend([label, inner])
+    inner.append(widgets.Button("Click"))
+    inner[0].on_click.connect(print)
+    delegations = types._delegations
+    window.delegate('on_click', print)
+    assert types._delegations == delegations + 1
+
+    label.destroy()
+    assert list(box) == [inner]
+    with pytest.raises(ValueError):
+        inner.destroy(recursive=False)
+    inner.destroy()
+    assert list(box) == []
+
+    window.destroy()
+    assert window.closed
+    assert not hasattr(window, '_callbacks')
+    assert types._delegations == delegations
+
+
+def test_cycles(dummywrapper):
+    box1 = widgets.Box()
+    box2 = widgets.Box()
+    box3 = widgets.Box()
+    box1.append(box2)
+    box2.append(box3)
+    with pytest.raises(ValueError):
+        box1.append(box1)
+    with pytest.raises(ValueError):
+        box2.append(box1)
+    with pytest.raises(ValueError):
+        box3.append(box1)
+    assert list(box3) == []
+
+    # Removed children don't count.
+    box1.remove(box2)
+    box3.append(box1)
+    assert list(box1.ancestors()) == [box3, box2]
+    with pytest.raises(ValueError):
+        box1.append(box2)
+
+
+def test_ancestors(dummywrapper):
+    window = widgets.Window()
+    box = widgets.Box()
+    group = widgets.Group()
+    label = widgets.Label()
+    window.add(box)
+    box.append(group)
+    group.add(label)
+
+    assert list(label.ancestors()) == [group, box, window]
+    assert list(window.ancestors()) == []
+    assert [label.depth, group.depth, box.depth, window.depth] == [3, 2, 1, 0]
+    assert label.root_window() is window
+    assert window.root_window() is window
+
+    box.remove(group)
+    assert list(label.ancestors()) == [group]
+    assert label.depth == 1
+    assert label.root_window() is None
+    assert group.root_window() is None
+    window.close()
+
+
+def test_clone(dummywrapper, capsys):
+    from bananagui import mainloop
+
+    box = widgets.Box()
+    label = widgets.Label("hello", tooltip="tip", grayed_out=True)
+    slider = widgets.Slider(range(10), Orient.VERTICAL, value=3)
+    group = widgets.Group("group", widgets.Button("click"))
+    box.extend([label, slider, group])
+    group.child.on_click.connect(print, "clicked")
+    group.child.on_click.connect(print, "coalesced", coalesce=True)
+    box.delegate('on_click', print, "delegated")
+
+    label_copy = label.clone()
+    assert repr(label_copy) == repr(label)
+    assert label_copy.tooltip == "tip" and label_copy.grayed_out
+    assert list(label_copy.ancestors()) == []
+
+    box_copy = box.clone()
+    assert len(box_copy) == 3
+    assert box_copy.orient == box.orient
+    assert [type(child) for child in box_copy] == [
+        widgets.Label, widgets.Slider, widgets.Group]
+    assert all(child is not original
+               for child, original in zip(box_copy, box))
+    assert box_copy[1].value == 3
+    assert box_copy[1].orient == Orient.VERTICAL
+    assert box_copy[2].child.text == "click"
+    assert list(box_copy[2].child.ancestors()) == [box_copy[2], box_copy]
+    assert len(widgets.Box(Orient.HORIZONTAL).clone(deep=False)) == 0
+    assert len(box.clone(deep=False)) == 0
+
+    # Changing the clone doesn't change the original.
+    box_copy[1].value = 5
+    box_copy.remove(box_copy[0])
+    assert slider.value == 3
+    assert len(box) == 3
+
+    # Callbacks are copied only if asked.
+    box_copy[-1].child.on_click.run()
+    assert capsys.readouterr().out == ""
+    box_copy = box.clone(callbacks=True)
+    box_copy[-1].child.on_click.run()
+    mainloop._run_soon()
+    assert capsys.readouterr().out.splitlines() == [
+        "clicked",
+        repr(box_copy[-1].child) + " delegated",
+        "coalesced",
+    ]
+    assert not group.child.on_click._callbacks[1][0].pending
+
+    with pytest.raises(TypeError):
+        widgets.Window().clone()
+
+
+def test_allocation(dummywrapper, capsys):
+    from bananagui import mainloop
+
+    box = widgets.Box()
+    label = widgets.Label("hello")
+    box.append(label)
+    assert label.allocation is None
+    label.on_allocation_changed.connect(print, "changed")
+    label.on_allocation_changed.connect(
+        lambda: print("coalesced", label.allocation), coalesce=True)
+
+    # This is what the wrappers do when the GUI toolkit tells them.
+    label._set_allocation((0, 0, 100, 20))
+    label._set_allocation((0, 0, 100, 20))
+    label._set_allocation((0, 0, 120, 20))
+    assert label.allocation == (0, 0, 120, 20)
+    mainloop._run_soon()
+    assert capsys.readouterr().out == (
+        "changed\nchanged\ncoalesced (0, 0, 120, 20)\n")
+
+    assert label.clone().allocation is None
+
+
+def test_detached(dummywrapper):
+    window = widgets.Window()
+    attached_label = widgets.Label("attached")
+    built = []
+
+    def build():
+        with widgets.detached():
+            box = widgets.Box(name='panel')
+            entry = widgets.Entry()
+            label = widgets.Label()
+            binding.bind(entry, 'text', label, 'text')
+            group = iniloader.loads(
+                'from bananagui import widgets\n'
+                '[group]\n'
+                'class = widgets.Group\n'
+                'text = "group"\n'
+                '[checkbox in group]\n'
+                'class = widgets.Checkbox\n'
+                'checked = True\n')['group']
+            box.extend([entry, label, group, attached_label])
+            entry.text = "hello"
+            assert label.text == "hello"    # bindings update right away
+            with pytest.raises(RuntimeError):
+                widgets.Window()
+            with pytest.raises(RuntimeError):
+                window.add(widgets.Label())
+            built.append(box)
+
+    debug.start_counting()
+    try:
+        debug.reset_call_stats()
+        thread = threading.Thread(target=build)
+        thread.start()
+        thread.join()
+        assert debug.call_stats() == {}
+
+        box, = built
+        assert box.real_widget is None
+        window.add(box)
+        stats = debug.call_stats()
+    finally:
+        debug.stop_counting()
+
+    # Each wrapper is created once, and only non-default values are set.
+    assert stats['widgets.parents:Box', '__init__'].calls == 1
+    assert stats['widgets.labels:Label', '__init__'].calls == 1
+    assert stats['widgets.labels:Label', 'set_text'].calls == 1
+    assert stats['widgets.misc:Checkbox', 'set_checked'].calls == 1
+    assert stats['widgets.parents:Box', 'append'].calls == 4
+    assert stats['widgets.parents:Group', 'add'].calls == 1
+    assert ('widgets.textwidgets:Entry', 'set_secret') not in stats
+    assert window.find('panel') is box
+    assert window.find(widgets.Checkbox).checked
+    assert box[1].text == "hello"
+
+    # The widgets are like any other widgets now.
+    box[0].text = "bye"
+    binding.flush()
+    assert box[1].text == "bye"
+    box.append(widgets.Label())
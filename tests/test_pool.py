@@ -0,0 +1,117 @@
+"""Test bananagui.widgets.Pool."""
+
+import pytest
+
+from bananagui import Align, binding, types, widgets
+
+
+def test_acquire_and_release(dummywrapper):
+    box = widgets.Box()
+    pool = widgets.Pool(box, widgets.Label, maxsize=2)
+    assert pool.hit_rate == 0.0
+
+    label1 = pool.acquire(text="hello", align=Align.LEFT)
+    label2 = pool.acquire(text="hi", tooltip="lol")
+    label3 = pool.acquire()
+    box.extend([label1, label2, label3])
+    assert (pool.hits, pool.misses) == (0, 3)
+    assert len(pool) == 0
+
+    del box[:2]
+    pool.release(label1)
+    pool.release(label2)
+    pool.release(label3)      # removes it from the box
+    assert len(box) == 0
+    assert len(pool) == 2
+    assert pool.discarded == 1
+    with pytest.raises(ValueError):
+        pool.release(label2)
+
+    # The label that was released last is given out first.
+    label = pool.acquire(text="new")
+    assert label is label2
+    assert label.text == "new"
+    assert label.tooltip is None
+    assert label.align == Align.CENTER
+    assert pool.acquire() is label1
+    assert (pool.hits, pool.misses) == (2, 3)
+    assert pool.hit_rate == 0.4
+    assert repr(pool) == '<bananagui.widgets.Pool of Label widgets, 0 pooled>'
+    box.append(label)
+
+
+def test_errors(dummywrapper):
+    box = widgets.Box()
+    with pytest.raises(TypeError):
+        widgets.Pool(box, widgets.Box)
+    with pytest.raises(TypeError):
+        widgets.Pool(box, widgets.Window)
+
+    pool = widgets.Pool(box, widgets.Slider, range(10))
+    with pytest.raises(TypeError):
+        pool.acquire(valuerange=range(5))
+    with pytest.raises(TypeError):
+        pool.release(widgets.Label())
+
+    other_box = widgets.Box()
+    slider = pool.acquire(value=3)
+    other_box.append(slider)
+    with pytest.raises(ValueError):
+        pool.release(slider)
+
+
+def test_callbacks_are_disconnected(dummywrapper):
+    box = widgets.Box()
+    pool = widgets.Pool(box, widgets.Button)
+    clicked = []
+    box.delegate('on_click', clicked.append)
+
+    button = pool.acquire(text="Click")
+    button.on_click.connect(clicked.append, 'connected')
+    box.append(button)
+    pool.release(button)
+    button = pool.acquire(text="Click again")
+    box.append(button)
+    button.on_click.run()
+    assert clicked == [button]
+
+    box.undelegate('on_click', clicked.append)
+    pool.release(button)
+    pool.clear()
+    assert len(pool) == 0
+
+
+def test_bindings_are_forgotten(dummywrapper):
+    box = widgets.Box()
+    pool = widgets.Pool(box, widgets.Entry)
+    label = widgets.Label()
+
+    entry = pool.acquire()
+    binding.bind(entry, 'text', label, 'text')
+    pool.release(entry)
+    assert entry not in binding._bindings
+
+    # The reused widget can be bound again.
+    assert pool.acquire() is entry
+    binding.bind(entry, 'text', label, 'tooltip')
+    entry.text = 'hello'
+    binding.flush()
+    assert label.tooltip == 'hello'
+    assert label.text == ''
+    pool.release(entry)
+
+
+def test_computed_values_are_forgotten(dummywrapper):
+    pool = widgets.Pool(widgets.Box(), widgets.Entry)
+    entry = pool.acquire(text='old')
+    computed = types.computed(lambda: entry.text)
+    assert computed.value == 'old'
+    pool.release(entry)
+    assert entry not in types._dependents
+    assert computed._dependencies == set()
+
+    # Changing the reused widget doesn't affect the computed value.
+    assert pool.acquire(text='new') is entry
+    assert computed.value == 'old'
+    computed.stop()
+    pool.release(entry)
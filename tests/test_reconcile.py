@@ -0,0 +1,145 @@
+import pytest
+
+from bananagui import Align, Orient, debug, reconcile, widgets
+from bananagui.reconcile import Node
+
+
+def labels(*texts):
+    return [Node(widgets.Label, {'text': text}, key=text) for text in texts]
+
+
+def box_calls(func):
+    debug.start_counting()
+    try:
+        box = widgets.Box()     # must be created after start_counting()
+        reconcile.update(box, labels('a', 'b', 'c', 'd', 'e'))
+        debug.reset_call_stats()
+        func(box)
+        stats = debug.call_stats()
+    finally:
+        debug.stop_counting()
+    return {method: value.calls for (wrapper, method), value in stats.items()
+            if wrapper == 'widgets.parents:Box'}
+
+
+def test_keyed(dummywrapper):
+    box = widgets.Box()
+    reconcile.update(box, labels('a', 'b', 'c'))
+    a, b, c = box
+    assert [label.text for label in box] == ['a', 'b', 'c']
+    assert reconcile.get_key(b) == 'b'
+    assert reconcile.get_key(widgets.Label()) is None
+
+    b.tooltip = 'state is kept'
+    reconcile.update(box, labels('c', 'b', 'd'))
+    assert box[:2] == [c, b]
+    assert b.tooltip == 'state is kept'
+    assert box[2].text == 'd'
+    assert a not in box
+    assert list(a.ancestors()) == []
+
+    with pytest.raises(ValueError):
+        reconcile.update(box, labels('x', 'x'))
+
+
+def test_minimal_changes(dummywrapper):
+    def remove_middle(box):
+        reconcile.update(box, labels('a', 'b', 'd', 'e'))
+    assert box_calls(remove_middle) == {'remove': 1}
+
+    def append(box):
+        reconcile.update(box, labels('a', 'b', 'c', 'd', 'e', 'f'))
+    assert box_calls(append) == {'append': 1}
+
+    def move_last_child(box):
+        reconcile.update(box, labels('a', 'b', 'c', 'e', 'd'))
+    assert box_calls(move_last_child) == {'remove': 1, 'append': 1}
+
+    def change_text(box):
+        reconcile.update(box, labels('a', 'b', 'c', 'd') +
+                         [Node(widgets.Label, {'text': 'x'}, key='e')])
+        assert box[-1].text == 'x'
+    assert box_calls(change_text) == {}
+
+
+def test_unkeyed_and_bins(dummywrapper):
+    window = widgets.Window()
+    tree = Node(widgets.Box, children=[
+        Node(widgets.Label, {'text': 'hello'}),
+        Node(widgets.Group, {'text': 'group'}, [
+            Node(widgets.Button, {'text': 'click me'}),
+        ]),
+    ])
+    reconcile.update(window, [tree])
+    box = window.child
+    label, group = box
+    button = group.child
+    assert isinstance(button, widgets.Button)
+
+    # Nodes without keys are matched in order.
+    tree.children[0].props['text'] = 'hi'
+    tree.children[1].children[0].props['grayed_out'] = True
+    reconcile.update(window, [tree])
+    assert window.child is box
+    assert box[:] == [label, group]
+    assert group.child is button
+    assert label.text == 'hi'
+    assert button.grayed_out
+
+    # Different classes or args create new widgets.
+    reconcile.update(group, [Node(widgets.Label)])
+    assert isinstance(group.child, widgets.Label)
+    reconcile.update(window, [Node(widgets.Box, args=[Orient.HORIZONTAL])])
+    assert window.child is not box
+    assert window.child.orient == Orient.HORIZONTAL
+
+    with pytest.raises(ValueError):
+        reconcile.update(window, [Node(widgets.Label), Node(widgets.Label)])
+    reconcile.update(window, [])
+    assert window.child is None
+
+
+def test_removed_props(dummywrapper):
+    box = widgets.Box()
+    reconcile.update(box, [
+        Node(widgets.Label, {'text': 'a', 'tooltip': 'tip',
+                             'grayed_out': True}, key=1),
+        Node(widgets.Slider, {'value': 5}, key=2, args=[range(3, 10)]),
+    ])
+    label, slider = box
+    assert (label.tooltip, label.grayed_out, slider.value) == ('tip', True, 5)
+
+    reconcile.update(box, [
+        Node(widgets.Label, {'text': 'b'}, key=1),
+        Node(widgets.Slider, {}, key=2, args=[range(3, 10)]),
+    ])
+    assert box[:] == [label, slider]
+    assert label.text == 'b'
+    assert label.tooltip is None
+    assert label.grayed_out is False
+    assert slider.value == 3    # min(valuerange)
+
+    # Properties that the nodes never had are left alone.
+    label.align = Align.LEFT
+    reconcile.update(box, [Node(widgets.Label, key=1)])
+    assert label.text == ''
+    assert label.align == Align.LEFT
+
+
+def test_removed_name_and_value(dummywrapper):
+    box = widgets.Box()
+    reconcile.update(box, [
+        Node(widgets.Label, {'name': 'greeting'}, key=1),
+        Node(widgets.Spinbox, {'value': 7, 'name': 'number'}, key=2,
+             args=[range(2, 10)]),
+    ])
+    label, spinbox = box
+    assert (label.name, spinbox.name, spinbox.value) == (
+        'greeting', 'number', 7)
+
+    reconcile.update(box, [
+        Node(widgets.Label, key=1),
+        Node(widgets.Spinbox, key=2, args=[range(2, 10)]),
+    ])
+    assert box[:] == [label, spinbox]
+    assert (label.name, spinbox.name, spinbox.value) == (None, None, 2)
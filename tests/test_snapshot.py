@@ -0,0 +1,70 @@
+import pytest
+
+from bananagui import Align, Orient, images, snapshot, widgets, widgettree
+
+
+def create_window():
+    window = widgets.Window("Snapshot test", minimum_size=(10, 20))
+    box = widgets.Box(Orient.HORIZONTAL, name='box')
+    window.add(box)
+    box.append(widgets.Label("hello", align=Align.LEFT, tooltip="tip"))
+    box.append(widgets.Slider(range(-5, 5), Orient.VERTICAL, value=-3,
+                              name='slider'))
+    box.append(widgets.Group("group", widgets.Entry("text", secret=True)))
+    box.append(widgets.Checkbox("checkbox", checked=True,
+                                expand=(False, True), grayed_out=True))
+    box.append(widgets.Box())
+    return window
+
+
+def test_dump_and_load(dummywrapper):
+    window = create_window()
+    data = snapshot.dump(window)
+    assert isinstance(data, bytes)
+    assert data.startswith(b'BGUISNAP')
+
+    copy = snapshot.load(data)
+    assert isinstance(copy, widgets.Window)
+    assert widgettree.dumps(copy) == widgettree.dumps(window)
+    assert copy.minimum_size == (10, 20)
+    slider = copy.find('slider')
+    assert slider.value == -3
+    assert slider.valuerange == range(-5, 5)
+    assert slider.orient == Orient.VERTICAL
+    label, slider, group, checkbox, emptybox = copy.child
+    assert label.align == Align.LEFT
+    assert label.tooltip == "tip"
+    assert group.child.secret
+    assert checkbox.checked and checkbox.grayed_out
+    assert checkbox.expand == (False, True)
+    assert copy.child.orient == Orient.HORIZONTAL
+    assert list(group.child.ancestors()) == [group, copy.child, copy]
+
+    # The loaded widgets work like any other widgets.
+    slider.value = 4
+    with pytest.raises(ValueError):
+        slider.value = 5
+    copy.child.remove(emptybox)
+
+    # Child widgets work too.
+    group_copy = snapshot.load(snapshot.dump(group))
+    assert group_copy.child.text == "text"
+    assert list(group_copy.ancestors()) == []
+
+
+def test_errors(dummywrapper):
+    label = widgets.ImageLabel(images.Image.from_size(1, 1))
+    with pytest.raises(TypeError):
+        snapshot.dump(label)
+    with pytest.raises(TypeError):
+        snapshot.dump(widgets.Dialog(widgets.Window()))
+
+    data = snapshot.dump(widgets.Label("hello"))
+    with pytest.raises(ValueError) as error:
+        snapshot.load(b'lol' + data)
+    assert str(error.value) == "not a BananaGUI snapshot"
+    with pytest.raises(ValueError) as error:
+        snapshot.load(data[:8] + b'\xff' + data[9:])
+    assert str(error.value) == "unsupported snapshot version 255"
+    with pytest.raises(ValueError):
+        snapshot.load(data + b'lol')
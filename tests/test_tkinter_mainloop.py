@@ -0,0 +1,78 @@
+import pytest
+
+tkinter = pytest.importorskip('tkinter')
+
+from bananagui.wrappers.tkinter import mainloop     # noqa: E402
+
+real_tk = tkinter.Tk
+
+
+def fake_tk():
+    # This works without a display like tkinter.Tcl(), and it's enough
+    # for running buffered commands.
+    interp = real_tk(useTk=False)
+    interp.withdraw = lambda: None
+    interp.bind = lambda *args, **kwargs: None
+    return interp
+
+
+@pytest.fixture
+def tcl(monkeypatch):
+    monkeypatch.setattr(tkinter, 'Tk', fake_tk)
+    monkeypatch.setattr(mainloop, '_buffer', [])
+    monkeypatch.setattr(mainloop, '_flush_scheduled', False)
+    monkeypatch.setattr(mainloop, 'buffer_stats', [0, 0])
+    monkeypatch.setattr(mainloop, 'root', None)
+    mainloop.init()
+    yield mainloop.root.tk
+
+
+def test_buffering(tcl):
+    mainloop._call('set', 'a', 'hello world')
+    mainloop._call('set', 'b', '{')
+    assert mainloop._buffer
+    assert tcl.eval('info exists a') == '0'
+
+    mainloop.flush()
+    assert tcl.eval('set a') == 'hello world'
+    assert tcl.eval('set b') == '{'
+    assert mainloop.buffer_stats == [2, 1]
+
+    # The main loop flushes when it's idle.
+    mainloop._call('set', 'a', 'idle')
+    mainloop.root.update()
+    assert tcl.eval('set a') == 'idle'
+    assert not mainloop._flush_scheduled
+
+
+def test_flush_before_quit(tcl, monkeypatch):
+    values = []
+    monkeypatch.setattr(mainloop.root, 'destroy',
+                        lambda: values.append(tcl.eval('set a')))
+    mainloop._call('set', 'a', 'set before destroying')
+    mainloop.quit()
+    assert values == ['set before destroying']
+
+
+def test_errors(tcl, capsys):
+    mainloop._call('set', 'a', 1)
+    mainloop._call('nonexistent_command', 'x')
+    mainloop._call('set', 'b', 2)
+    mainloop.flush()
+    assert (tcl.eval('set a'), tcl.eval('set b')) == ('1', '2')
+    assert capsys.readouterr().err == (
+        'Error in buffered Tcl command: nonexistent_command x\n'
+        'tkinter.TclError: invalid command name "nonexistent_command"\n')
+
+
+def test_init_resets(tcl):
+    # The old root dies before it runs the idle callback.
+    mainloop._call('set', 'a', 'old')
+    assert mainloop._flush_scheduled
+    mainloop.init()
+    assert mainloop._buffer == []
+    assert not mainloop._flush_scheduled
+
+    mainloop._call('set', 'a', 'new')
+    mainloop.root.update()
+    assert mainloop.root.tk.eval('set a') == 'new'
@@ -0,0 +1,85 @@
+import io
+import json
+import os
+import signal
+
+import pytest
+
+import bananagui
+from bananagui import debug, iniloader, tracing, widgets
+
+
+@pytest.fixture
+def tracer(dummywrapper):
+    tracing.clear()
+    tracing.start()
+    yield
+    tracing.stop()
+    tracing.clear()
+
+
+def get_events():
+    events = json.loads(tracing.dumps())['traceEvents']
+    return [event for event in events if event['ph'] != 'M']
+
+
+def test_spans(tracer):
+    checkbox = widgets.Checkbox()
+    checkbox.on_checked_changed.connect(print)
+    checkbox.checked = True
+    iniloader.loads("from bananagui import widgets\n"
+                    "[label]\nclass = widgets.Label\n")
+
+    names = {(event['cat'], event['name']) for event in get_events()}
+    assert ('property', 'Checkbox.checked') in names
+    assert ('callback', 'Checkbox.on_checked_changed') in names
+    assert ('wrapper', 'widgets.misc:Checkbox.set_checked') in names
+    assert ('iniloader', '[label]') in names
+    for event in get_events():
+        if event['ph'] == 'X':
+            assert event['dur'] >= 0
+
+
+def test_ring_buffer(tracer):
+    tracing.start(maxlen=10)
+    label = widgets.Label()
+    for number in range(100):
+        label.text = str(number)
+    assert len(get_events()) == 10
+    tracing.stop()
+    label.text = 'lol'
+    assert len(get_events()) == 10
+    tracing.start()     # back to the default maxlen
+
+
+def test_dump_on_signal(tracer, tmpdir):
+    path = str(tmpdir.join('trace.json'))
+    old_handler = signal.getsignal(signal.SIGUSR1)
+    try:
+        tracing.dump_on_signal(path)
+        widgets.Label("hello")
+        os.kill(os.getpid(), signal.SIGUSR1)
+    finally:
+        signal.signal(signal.SIGUSR1, old_handler)
+    with open(path, 'r') as f:
+        assert json.load(f)['traceEvents']
+
+    fakefile = io.StringIO()
+    tracing.dump(fakefile)
+    assert json.loads(fakefile.getvalue())['traceEvents']
+
+
+def test_stop_uninstalls_hook(dummywrapper):
+    tracing.start()
+    assert bananagui._wrapper_hook is not None
+    tracing.stop()
+    assert bananagui._wrapper_hook is None
+
+    # The hook is still needed for counting.
+    debug.start_counting()
+    tracing.start()
+    tracing.stop()
+    assert bananagui._wrapper_hook is not None
+    debug.stop_counting()
+    assert bananagui._wrapper_hook is None
+    tracing.clear()
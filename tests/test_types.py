@@ -1,3 +1,7 @@
+import gc
+import threading
+import weakref
+
 import pytest
 
 from bananagui import types
@@ -187,3 +191,182 @@ def test_docs(capsys):
         output, errors = capsys.readouterr()
         assert doc in output
         assert not errors
+
+
+def test_connect_all(capsys):
+    dummy1 = CallbackDummy()
+    dummy2 = CallbackDummy()
+    dummy1.on_stuff.connect(print, 'connected')
+    CallbackDummy.on_stuff.connect_all(print, 'all')
+    try:
+        dummy1.on_stuff.run()
+        dummy2.on_stuff.run()
+        with dummy2.on_stuff.blocked():
+            dummy2.on_stuff.run()
+    finally:
+        CallbackDummy.on_stuff.disconnect_all(print)
+    dummy1.on_stuff.run()
+
+    output, errors = capsys.readouterr()
+    assert not errors
+    assert output.splitlines() == [
+        'connected', '%r all' % dummy1, '%r all' % dummy2, 'connected']
+    with pytest.raises(ValueError):
+        CallbackDummy.on_stuff.disconnect_all(print)
+    with pytest.raises(AttributeError):
+        dummy1.on_stuff = 'lol'
+
+
+def test_weak_connect(capsys):
+    class Controller:
+        def do_stuff(self, arg):
+            print("doing stuff with", arg)
+
+    dummy = CallbackDummy()
+    controller = Controller()
+    dummy.on_stuff.connect(controller.do_stuff, 'arg', weak=True)
+    assert dummy.on_stuff.is_connected(controller.do_stuff)
+    dummy.on_stuff.run()
+    assert capsys.readouterr() == ("doing stuff with arg\n", "")
+
+    pruned_before = types._pruned
+    del controller      # nothing else keeps it alive
+    assert len(dummy.on_stuff._callbacks) == 1
+    dummy.on_stuff.run()
+    assert capsys.readouterr() == ("", "")
+    assert dummy.on_stuff._callbacks == []
+    assert types._pruned == pruned_before + 1
+
+    controller = Controller()
+    dummy.on_stuff.connect(controller.do_stuff, 'arg', weak=True)
+    dummy.on_stuff.disconnect(controller.do_stuff)
+    assert not dummy.on_stuff.is_connected(controller.do_stuff)
+
+
+def test_coalesce(dummywrapper, capsys):
+    from bananagui import mainloop
+
+    def print_string():
+        print("coalesced", dummy.string)
+
+    dummy = WrapperDummy()
+    dummy.on_string_changed.connect(print_string, coalesce=True)
+    assert dummy.on_string_changed.is_connected(print_string)
+    dummy.on_string_changed.connect(print, "normal")
+    for string in ['b', 'c', 'd']:
+        dummy.string = string
+    assert capsys.readouterr().out == "normal\n" * 3
+
+    mainloop._run_soon()     # this is what the GUI toolkit would do
+    assert capsys.readouterr().out == "coalesced d\n"
+    mainloop._run_soon()
+    assert capsys.readouterr().out == ""
+
+    # Disconnected functions don't run, even if they are pending.
+    dummy.string = 'e'
+    dummy.on_string_changed.disconnect(print)
+    assert capsys.readouterr().out == "normal\n"
+    dummy.on_string_changed.disconnect(print_string)
+    mainloop._run_soon()
+    assert capsys.readouterr().out == ""
+
+
+def test_computed(dummywrapper, capsys):
+    from bananagui import mainloop, widgets
+
+    checkboxes = [widgets.Checkbox() for i in range(10)]
+    label = widgets.Label()
+
+    @types.computed
+    def summary():
+        count = sum(checkbox.checked for checkbox in checkboxes)
+        return '%d/%d checked' % (count, len(checkboxes))
+
+    summary.bind(label, 'text')
+    assert label.text == '0/10 checked'
+    assert summary.computations == 1
+
+    label.text = 'lol'      # not a dependency
+    assert summary.value == '0/10 checked'
+    assert summary.computations == 1
+
+    for checkbox in checkboxes[:5]:
+        checkbox.checked = True
+    assert label.text == 'lol'
+    mainloop._run_soon()
+    assert label.text == '5/10 checked'
+    assert summary.computations == 2
+
+    # Computed values can depend on other computed values.
+    shout = types.computed(lambda: summary.value.upper())
+    assert shout.value == '5/10 CHECKED'
+    checkboxes[-1].checked = True
+    assert shout.value == '6/10 CHECKED'
+    assert summary.computations == 3
+    mainloop._run_soon()
+    assert label.text == '6/10 checked'
+    assert summary.computations == 3
+
+    # Errors are printed when setting bound properties.
+    checkboxes.append(None)
+    checkboxes[0].checked = False
+    mainloop._run_soon()
+    assert capsys.readouterr().err.endswith(
+        "AttributeError: 'NoneType' object has no attribute 'checked'\n")
+    assert label.text == '6/10 checked'
+    checkboxes.pop()
+    checkboxes[0].checked = True
+    mainloop._run_soon()
+    assert label.text == '6/10 checked'     # still set after the error
+    assert summary.computations == 5
+
+    summary.unbind(label, 'text')
+    with pytest.raises(ValueError):
+        summary.unbind(label, 'text')
+    summary.stop()
+    shout.stop()
+    gc.collect()    # other tests may have left garbage widgets
+    assert dict(types._dependents) == {}
+
+
+def test_computed_lifetime(dummywrapper):
+    from bananagui import widgets
+
+    label1 = widgets.Label("a")
+    label2 = widgets.Label("b")
+    both = types.computed(lambda: label1.text + label2.text)
+    assert both.value == 'ab'
+    assert label1 in types._dependents
+
+    # Destroying forgets the widget.
+    label1.destroy()
+    assert label1 not in types._dependents
+    assert len(both._dependencies) == 1
+
+    # The computed value doesn't keep its dependencies alive.
+    ref = weakref.ref(label2)
+    del label2
+    gc.collect()
+    assert ref() is None
+    assert dict(types._dependents) == {}
+    both.stop()
+
+
+def test_computed_threads(dummywrapper):
+    from bananagui import widgets
+
+    label1 = widgets.Label("a")
+    label2 = widgets.Label("b")
+
+    def func():
+        # Reading a property in another thread while this runs doesn't
+        # make it a dependency.
+        thread = threading.Thread(target=lambda: label2.text)
+        thread.start()
+        thread.join()
+        return label1.text
+
+    value = types.computed(func)
+    assert value.value == 'a'
+    assert value._dependencies == {(weakref.ref(label1), 'text')}
+    value.stop()
@@ -0,0 +1,42 @@
+"""Test bananagui.widgets.window."""
+
+import pytest
+
+from bananagui import widgets
+
+
+def test_find(dummywrapper):
+    window = widgets.Window()
+    box = widgets.Box(name='box')
+    username = widgets.Entry(name='username')
+    password = widgets.Entry(name='password', secret=True)
+    group = widgets.Group(child=widgets.Entry(name='username'))
+    box.extend([username, password, group])
+    assert window.find('username') is None
+
+    window.add(box)     # indexes everything in the box
+    assert window.find('box') is box
+    assert window.find_all('username') == [username, group.child]
+    assert window.find('username', within=group) is group.child
+    assert window.find('nothing') is None
+    assert window.find_all(widgets.Entry) == [username, password,
+                                              group.child]
+    assert window.find_all(widgets.TextBase, within=group) == [group.child]
+    assert window.find_all((widgets.Group, widgets.Box)) == [box, group]
+    assert window.find(widgets.Window) is None
+
+    # Adding, removing and renaming updates the index.
+    box.remove(password)
+    assert window.find('password') is None
+    label = widgets.Label()
+    box.append(label)
+    label.name = 'label'
+    assert window.find('label') is label
+    username.name = None
+    assert window.find_all('username') == [group.child]
+    group.destroy()
+    assert window.find('username') is None
+    assert window.find_all(widgets.Entry) == [username]
+
+    with pytest.raises(TypeError):
+        label.name = 123